@@ -10,7 +10,6 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
     QHBoxLayout,
     QGroupBox,
-    QPushButton,
     QSizePolicy,
 )
 from PyQt6.QtCore import Qt
@@ -22,6 +21,7 @@ from widgets import (
     SecondaryButton,
     OutlineButton,
     GhostButton,
+    ShadcnIconButton,
     ShadcnCard,
     ShadcnLabel,
     ShadcnProgressBar,
@@ -31,6 +31,7 @@ from widgets import (
     ShadcnCheckbox,
     ShadcnRadioButton,
     ShadcnSlider,
+    ShadcnThemePicker,
 )
 
 
@@ -67,19 +68,19 @@ class CustomTitleBar(QWidget):
         controls_layout.setSpacing(0)
 
         # Minimize button
-        self.minimize_btn = QPushButton("─")
+        self.minimize_btn = ShadcnIconButton("minus")
         self.minimize_btn.setFixedSize(40, 30)
         self.minimize_btn.setObjectName("title_bar_button")
         self.minimize_btn.clicked.connect(self.minimize_window)
 
         # Maximize button
-        self.maximize_btn = QPushButton("□")
+        self.maximize_btn = ShadcnIconButton("square", icon_size=14)
         self.maximize_btn.setFixedSize(40, 30)
         self.maximize_btn.setObjectName("title_bar_button")
         self.maximize_btn.clicked.connect(self.toggle_maximize)
 
         # Close button
-        self.close_btn = QPushButton("×")
+        self.close_btn = ShadcnIconButton("x", hover_token="destructive-foreground")
         self.close_btn.setFixedSize(40, 30)
         self.close_btn.setObjectName("close_button")
         self.close_btn.clicked.connect(self.close_window)
@@ -101,10 +102,10 @@ class CustomTitleBar(QWidget):
         if self.parent_window:
             if self.parent_window.isMaximized():
                 self.parent_window.showNormal()
-                self.maximize_btn.setText("□")
+                self.maximize_btn.set_icon_name("square")
             else:
                 self.parent_window.showMaximized()
-                self.maximize_btn.setText("❐")
+                self.maximize_btn.set_icon_name("restore")
 
     def close_window(self):
         if self.parent_window:
@@ -177,8 +178,21 @@ class MainWindow(QWidget):
         theme_label = ShadcnLabel("Theme:")
         from styles import style_manager
 
-        self.theme_combo = ShadcnSelect(style_manager.get_available_themes())
-        self.theme_combo.currentTextChanged.connect(self.on_theme_changed)
+        # Browsing with the arrow keys or mouse wheel restyles only once the
+        # selection rests, instead of once per theme passed
+        self.theme_combo = ShadcnSelect(
+            style_manager.get_available_themes(), debounce=150
+        )
+        self.theme_combo.selection_settled.connect(self.on_theme_changed)
+
+        # Theme browser with preview thumbnails, created on first use
+        self.theme_picker = None
+        browse_btn = OutlineButton("Browse Themes")
+        browse_btn.clicked.connect(self.on_browse_themes)
+
+        # Density of spacing and control heights
+        self.density_combo = ShadcnSelect(["comfortable", "compact", "dense"])
+        self.density_combo.selection_settled.connect(self.on_density_changed)
 
         # Dark mode toggle button
         self.dark_mode_btn = PrimaryButton("Dark Mode")
@@ -186,6 +200,8 @@ class MainWindow(QWidget):
 
         theme_layout.addWidget(theme_label)
         theme_layout.addWidget(self.theme_combo)
+        theme_layout.addWidget(browse_btn)
+        theme_layout.addWidget(self.density_combo)
         theme_layout.addWidget(self.dark_mode_btn)
         theme_layout.addStretch()
 
@@ -297,6 +313,17 @@ class MainWindow(QWidget):
         self.progress_bar.setValue(50)
         progress_layout.addWidget(self.progress_bar)
 
+        # Live brand color customization; 0 keeps the theme's own primary
+        hue_layout = QHBoxLayout()
+        hue_label = ShadcnLabel("Brand hue:")
+        self.hue_slider = ShadcnSlider(Qt.Orientation.Horizontal)
+        self.hue_slider.setRange(0, 360)
+        self.hue_slider.setValue(0)
+        self.hue_slider.valueChanged.connect(self.on_brand_hue_changed)
+        hue_layout.addWidget(hue_label)
+        hue_layout.addWidget(self.hue_slider)
+        progress_layout.addLayout(hue_layout)
+
         layout.addWidget(progress_group)
 
         # Connect signals
@@ -324,6 +351,21 @@ class MainWindow(QWidget):
     def update_progress(self, value):
         self.progress_bar.setValue(value)
 
+    def on_density_changed(self, density):
+        """Switch between comfortable, compact and dense metrics"""
+        from styles import style_manager
+
+        style_manager.set_density(density)
+
+    def on_brand_hue_changed(self, hue):
+        """Override the primary color of the current theme while dragging"""
+        from styles import style_manager
+
+        if hue:
+            style_manager.set_token("primary", f"oklch(0.55 0.2 {hue})")
+        else:
+            style_manager.set_token("primary", None)
+
     def on_primary_clicked(self):
         print("Primary button clicked!")
 
@@ -335,9 +377,35 @@ class MainWindow(QWidget):
         from styles import style_manager
 
         style_manager.switch_theme(theme_name)
+        self.update_dark_mode_button()
         # Refresh styling
         self.refresh_styling()
 
+    def on_browse_themes(self):
+        """Open the theme browser below the theme selector"""
+        if self.theme_picker is None:
+            self.theme_picker = ShadcnThemePicker(self)
+            self.theme_picker.setWindowFlags(Qt.WindowType.Popup)
+            self.theme_picker.resize(560, 420)
+            self.theme_picker.theme_selected.connect(self.on_theme_picked)
+        position = self.theme_combo.mapToGlobal(self.theme_combo.rect().bottomLeft())
+        self.theme_picker.move(position)
+        self.theme_picker.show()
+
+    def on_theme_picked(self, theme_name, dark):
+        """Apply a theme and mode chosen in the theme browser"""
+        from styles import style_manager
+
+        self.theme_picker.hide()
+        self.theme_combo.blockSignals(True)
+        self.theme_combo.setCurrentText(theme_name)
+        self.theme_combo.blockSignals(False)
+        self.theme_combo.cancel_selection()
+
+        style_manager.switch_theme(theme_name, dark)
+        self.update_dark_mode_button()
+        self.refresh_styling()
+
     def on_dark_mode_toggle(self):
         """Toggle dark mode on and off"""
         from styles import style_manager
@@ -346,17 +414,23 @@ class MainWindow(QWidget):
         style_manager.toggle_dark_mode()
 
         # Update button text based on current mode
+        self.update_dark_mode_button()
+
+        # Refresh styling
+        self.refresh_styling()
+
+    def update_dark_mode_button(self):
+        """Label the dark mode button with the mode it switches to"""
+        from styles import style_manager
+
         if style_manager.is_dark_mode():
             self.dark_mode_btn.setText("Light Mode")
         else:
             self.dark_mode_btn.setText("Dark Mode")
 
-        # Refresh styling
-        self.refresh_styling()
-
 
 def main():
-    import os  # noqa: F401
+    import os
 
     app = QApplication(sys.argv)
 
@@ -372,8 +446,13 @@ def main():
 
     style_manager.set_application(app)
     style_manager.apply_theme("neutral")
+    style_manager.set_crossfade(200)
+    if os.environ.get("SHADCN_HOT_RELOAD"):
+        # Development mode: edits to theme files apply on save
+        style_manager.enable_hot_reload()
 
     window = MainWindow()
+    style_manager.watch_window(window)
     window.show()
 
     sys.exit(app.exec())
@@ -2,11 +2,34 @@
 Style manager for applying themes to PyQt6 applications
 """
 
-from typing import Optional
-from PyQt6.QtWidgets import QApplication
+import weakref
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+from PyQt6 import sip
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QApplication, QWidget
 from PyQt6.QtGui import QPalette, QColor
 from themes import ThemeManager
 from themes import Theme
+from themes.palette import ColorToken, Palette
+from themes.tokens import DENSITY_MODES, TokenValue
+from styles.animation import animation_clock
+from styles.cache import AssetCache, DprWatcher
+from styles.hot_reload import ThemeReloader
+from styles.indicators import IndicatorCache
+from styles.transitions import crossfade
+
+# Application palette roles and the tokens _apply_palette mirrors into them
+_PALETTE_ROLES = (
+    (QPalette.ColorRole.Window, ColorToken.BACKGROUND),
+    (QPalette.ColorRole.WindowText, ColorToken.FOREGROUND),
+    (QPalette.ColorRole.Base, ColorToken.BACKGROUND),
+    (QPalette.ColorRole.Text, ColorToken.FOREGROUND),
+    (QPalette.ColorRole.Button, ColorToken.SECONDARY),
+    (QPalette.ColorRole.ButtonText, ColorToken.SECONDARY_FOREGROUND),
+    (QPalette.ColorRole.Highlight, ColorToken.PRIMARY),
+    (QPalette.ColorRole.HighlightedText, ColorToken.PRIMARY_FOREGROUND),
+)
+_PALETTE_TOKENS = {token.token for _, token in _PALETTE_ROLES}
 
 
 class StyleManager:
@@ -15,6 +38,21 @@ class StyleManager:
     def __init__(self):
         self.theme_manager = ThemeManager()
         self._app = None
+        self._palette_version = 0
+        self._colors: Optional[Palette] = None
+        self._qcolors: Dict[str, QColor] = {}
+        self._ramps: Dict[str, List[QColor]] = {}
+        self.assets = AssetCache()
+        self.indicators = IndicatorCache(self)
+        self._dpr_watcher: Optional[DprWatcher] = None
+        self._reloader: Optional[ThemeReloader] = None
+        self.crossfade_duration = 0
+        self._pending_tokens: Set[str] = set()
+        self._token_timer: Optional[QTimer] = None
+        self._density = "comfortable"
+        self._metric_bindings: List[
+            Tuple[weakref.ref, FrozenSet[str], Callable[[QWidget], None]]
+        ] = []
 
     def set_application(self, app: QApplication):
         """Set the QApplication instance"""
@@ -22,14 +60,20 @@ class StyleManager:
 
     def apply_theme(self, theme_name: Optional[str] = None):
         """Apply a theme to the application"""
+        previous = self._colors
         if theme_name:
             self.theme_manager.set_theme(theme_name)
 
+        self._sync_density()
+        self._invalidate_colors(self._changed_colors(previous))
+        self._pending_tokens.clear()
+
         if self._app:
             stylesheet = self.theme_manager.current_theme.get_stylesheet(
                 self.theme_manager.is_dark_mode
             )
             self._app.setStyleSheet(stylesheet)
+            self._apply_metric_bindings()
 
             # Also set the application palette for window frame theming
             self._apply_palette()
@@ -39,42 +83,103 @@ class StyleManager:
         if not self._app:
             return
 
+        colors = self.get_colors()
+        palette = self._app.palette()
+
+        # Window colors affect the title bar on some platforms, button and
+        # highlight colors native widgets
+        for role, token in _PALETTE_ROLES:
+            rgba = colors.rgba(token)
+            if rgba is not None:
+                palette.setColor(role, QColor.fromRgba(rgba))
+
+        self._app.setPalette(palette)
+
+    def watch_window(self, window: QWidget):
+        """Re-render a window's cached assets when its pixel ratio changes"""
+        if self._dpr_watcher is None:
+            self._dpr_watcher = DprWatcher(self.assets)
+        self._dpr_watcher.watch(window)
+
+    def enable_hot_reload(self) -> ThemeReloader:
+        """Watch theme source files and apply saved edits without a restart"""
+        if self._reloader is None:
+            self._reloader = ThemeReloader(self)
+            self._reloader.watch_all()
+        return self._reloader
+
+    def update_theme_colors(
+        self, theme_name: str, colors: Dict[bool, Dict[str, str]]
+    ) -> Dict[bool, Set[str]]:
+        """Replace a theme's source colors, pushing the change if it is current"""
+        theme = self.theme_manager.get_theme(theme_name)
+        if theme is None:
+            return {}
+        changes = theme.update_source_colors(colors)
+        if theme is self.theme_manager.current_theme:
+            self._queue_tokens(changes)
+            self.flush_tokens()
+        return changes
+
+    def _invalidate_colors(self, tokens: Optional[Set[str]] = None):
+        """Drop cached colors so they are rebuilt, all or only some tokens"""
+        self._palette_version += 1
+        self._colors = None
+        if tokens is None:
+            self._qcolors.clear()
+        else:
+            for token in tokens:
+                self._qcolors.pop(token, None)
+        self._ramps.clear()
+        self.indicators.flush()
+
+    def _changed_colors(self, previous: Optional[Palette]) -> Optional[Set[str]]:
+        """Get the tokens that differ from a previous palette, None if unknown"""
         theme = self.theme_manager.current_theme
+        if previous is None or self._pending_tokens:
+            return None
         colors = theme.get_colors_for_mode(self.theme_manager.is_dark_mode)
+        if colors is previous or not isinstance(colors, Palette):
+            # The same palette may have been edited in place
+            return None
+        return previous.diff(colors)
 
-        palette = self._app.palette()
+    @property
+    def palette_version(self) -> int:
+        """Counter bumped whenever the active theme colors change"""
+        return self._palette_version
 
-        # Set window colors (affects title bar on some platforms)
-        if "background" in colors:
-            palette.setColor(QPalette.ColorRole.Window, QColor(colors["background"]))
-        if "foreground" in colors:
-            palette.setColor(
-                QPalette.ColorRole.WindowText, QColor(colors["foreground"])
+    def get_colors(self) -> Palette:
+        """Get the hex colors of the current theme and mode (cached)"""
+        if self._colors is None:
+            self._colors = self.theme_manager.current_theme.get_colors_for_mode(
+                self.theme_manager.is_dark_mode
             )
+        return self._colors
 
-        # Set base colors
-        if "background" in colors:
-            palette.setColor(QPalette.ColorRole.Base, QColor(colors["background"]))
-        if "foreground" in colors:
-            palette.setColor(QPalette.ColorRole.Text, QColor(colors["foreground"]))
-
-        # Set button colors
-        if "secondary" in colors:
-            palette.setColor(QPalette.ColorRole.Button, QColor(colors["secondary"]))
-        if "secondary-foreground" in colors:
-            palette.setColor(
-                QPalette.ColorRole.ButtonText, QColor(colors["secondary-foreground"])
-            )
+    def get_qcolor(self, token: str, fallback: str = "#000000") -> QColor:
+        """Get a cached QColor for a theme token, for custom-painted widgets"""
+        color = self._qcolors.get(token)
+        if color is None:
+            colors = self.get_colors()
+            rgba = colors.rgba(token)
+            if rgba is None:
+                color = QColor(colors.get(token, fallback))
+            else:
+                color = QColor.fromRgba(rgba)
+            self._qcolors[token] = color
+        return color
 
-        # Set highlight colors
-        if "primary" in colors:
-            palette.setColor(QPalette.ColorRole.Highlight, QColor(colors["primary"]))
-        if "primary-foreground" in colors:
-            palette.setColor(
-                QPalette.ColorRole.HighlightedText, QColor(colors["primary-foreground"])
+    def get_ramp(self, variant: str) -> List[QColor]:
+        """Get the cached base-hover-pressed QColor lookup table of a variant"""
+        ramp = self._ramps.get(variant)
+        if ramp is None:
+            ramps = self.theme_manager.current_theme.get_state_ramps(
+                self.theme_manager.is_dark_mode
             )
-
-        self._app.setPalette(palette)
+            ramp = [QColor(*rgba) for rgba in ramps.get(variant, ramps["default"])]
+            self._ramps[variant] = ramp
+        return ramp
 
     def get_current_theme(self) -> Theme:
         """Get the current theme"""
@@ -84,29 +189,149 @@ class StyleManager:
         """Get available theme names"""
         return self.theme_manager.get_available_themes()
 
-    def switch_theme(self, theme_name: str) -> bool:
-        """Switch to a different theme"""
+    def switch_theme(self, theme_name: str, dark_mode: Optional[bool] = None) -> bool:
+        """Switch to a different theme, optionally changing the mode with it"""
         if self.theme_manager.set_theme(theme_name):
-            self.apply_theme()
-            # Force repaint of all widgets
-            if self._app:
-                for widget in self._app.allWidgets():
-                    widget.repaint()
+            if dark_mode is not None:
+                self.theme_manager.set_dark_mode(dark_mode)
+            self._restyle()
             return True
         return False
 
     def toggle_dark_mode(self):
         """Toggle between light and dark mode"""
         self.theme_manager.toggle_dark_mode()
-        self.apply_theme()
-        # Force repaint of all widgets
-        if self._app:
-            for widget in self._app.allWidgets():
-                widget.repaint()
+        self._restyle()
 
     def set_dark_mode(self, dark: bool):
         """Set dark mode state"""
         self.theme_manager.set_dark_mode(dark)
+        self._restyle()
+
+    def set_token(
+        self,
+        token: str,
+        value: Optional[TokenValue],
+        dark_mode: Optional[bool] = None,
+    ):
+        """Override a color or metric token of the current theme live
+
+        Changes are pushed at most once per frame, so a slider can drive
+        this directly. Pass None to remove the override again.
+        """
+        changes = self.theme_manager.current_theme.set_token(token, value, dark_mode)
+        self._queue_tokens(changes)
+
+    def reset_tokens(self):
+        """Remove every token override of the current theme"""
+        self._queue_tokens(self.theme_manager.current_theme.reset_tokens())
+        self._sync_density()
+
+    def set_density(self, density: str):
+        """Scale spacing and control heights: comfortable, compact or dense"""
+        if density not in DENSITY_MODES:
+            raise ValueError(f"Unknown density: {density}")
+        self._density = density
+        self._sync_density()
+
+    def get_density(self) -> str:
+        """Get the current density mode"""
+        return self._density
+
+    def _sync_density(self):
+        """Carry the density over to the current theme's metric tokens"""
+        factor = DENSITY_MODES[self._density]
+        theme = self.theme_manager.current_theme
+        if theme.get_metrics().get("density") != factor:
+            self._queue_tokens(theme.set_token("density", factor))
+
+    def get_metric(self, token: str, fallback: int = 0) -> int:
+        """Get a radius, spacing, size or font size token in pixels"""
+        value = self.theme_manager.current_theme.get_metrics().get(token, fallback)
+        return int(value)
+
+    def bind_metrics(
+        self,
+        widget: QWidget,
+        tokens: Iterable[str],
+        apply: Callable[[QWidget], None],
+    ):
+        """Call ``apply(widget)`` now and whenever one of the metric tokens changes
+
+        Only widgets bound to a changed token are touched, so switching
+        density does not walk the whole widget tree.
+        """
+        self._metric_bindings.append((weakref.ref(widget), frozenset(tokens), apply))
+        apply(widget)
+
+    def _apply_metric_bindings(self, tokens: Optional[Set[str]] = None):
+        bindings = []
+        for binding in self._metric_bindings:
+            widget = binding[0]()
+            if widget is None or sip.isdeleted(widget):
+                continue
+            bindings.append(binding)
+            if tokens is None or binding[1] & tokens:
+                binding[2](widget)
+        self._metric_bindings = bindings
+
+    def _queue_tokens(self, changes: Dict[bool, Set[str]]):
+        self._pending_tokens |= changes.get(self.theme_manager.is_dark_mode, set())
+        if not self._pending_tokens:
+            return
+        if self._token_timer is None:
+            self._token_timer = QTimer()
+            self._token_timer.setSingleShot(True)
+            self._token_timer.timeout.connect(self.flush_tokens)
+        if not self._token_timer.isActive():
+            self._token_timer.start(animation_clock().frame_interval())
+
+    def flush_tokens(self):
+        """Push queued token changes now, along the cheapest path
+
+        The stylesheet is only re-set when it uses a changed token, and the
+        palette only when it mirrors one; otherwise custom-painted widgets
+        just repaint with the new colors.
+        """
+        if self._token_timer is not None:
+            self._token_timer.stop()
+        tokens, self._pending_tokens = self._pending_tokens, set()
+        if not tokens:
+            return
+
+        self._invalidate_colors(tokens)
+        if not self._app:
+            return
+        theme = self.theme_manager.current_theme
+        if theme.affects_stylesheet(tokens):
+            self._app.setStyleSheet(
+                theme.get_stylesheet(self.theme_manager.is_dark_mode)
+            )
+        else:
+            for widget in self._app.allWidgets():
+                widget.update()
+        if tokens & _PALETTE_TOKENS:
+            self._apply_palette()
+        self._apply_metric_bindings(tokens)
+
+    def set_crossfade(self, duration: int):
+        """Crossfade theme changes over a duration in milliseconds, 0 disables"""
+        self.crossfade_duration = max(0, duration)
+
+    def _restyle(self):
+        """Apply the current theme, behind a crossfade when enabled"""
+        if self._app and self.crossfade_duration:
+            windows = [
+                widget
+                for widget in self._app.topLevelWidgets()
+                if widget.isVisible() and not widget.isMinimized()
+            ]
+            if windows:
+                crossfade(windows, self._apply_and_repaint, self.crossfade_duration)
+                return
+        self._apply_and_repaint()
+
+    def _apply_and_repaint(self):
         self.apply_theme()
         # Force repaint of all widgets
         if self._app:
@@ -0,0 +1,184 @@
+"""
+Shared animation clock for Shadcn widget transitions
+"""
+
+from typing import Callable, Dict, List, Optional
+from PyQt6 import sip
+from PyQt6.QtCore import QElapsedTimer, QEasingCurve, QObject, Qt, QTimer
+from PyQt6.QtGui import QGuiApplication
+from PyQt6.QtWidgets import QWidget
+
+# Used when the refresh rate of the primary screen is unknown
+_DEFAULT_REFRESH_RATE = 60.0
+
+
+class Animation:
+    """A value animated by the shared clock on behalf of a widget
+
+    Transitions run once from ``start_value`` to ``end_value``; looping
+    animations cycle ``value`` from 0 to 1 every ``duration`` milliseconds.
+    """
+
+    def __init__(
+        self,
+        widget: QWidget,
+        duration: int,
+        start_value: float = 0.0,
+        end_value: float = 1.0,
+        kind: str = "transition",
+        loop: bool = False,
+        easing: QEasingCurve.Type = QEasingCurve.Type.OutCubic,
+        on_step: Optional[Callable[[float], None]] = None,
+        on_finished: Optional[Callable[[], None]] = None,
+    ):
+        self.widget = widget
+        self.duration = max(1, duration)
+        self.start_value = start_value
+        self.end_value = end_value
+        self.kind = kind
+        self.loop = loop
+        self.value = start_value
+        self.finished = False
+        self._curve = QEasingCurve(easing)
+        self._on_step = on_step
+        self._on_finished = on_finished
+        self._started_at = 0
+
+    def _step(self, now: int):
+        elapsed = now - self._started_at
+        if self.loop:
+            self.value = (elapsed % self.duration) / self.duration
+        else:
+            progress = min(1.0, elapsed / self.duration)
+            eased = self._curve.valueForProgress(progress)
+            self.value = self.start_value + (self.end_value - self.start_value) * eased
+            self.finished = progress >= 1.0
+        if self._on_step:
+            self._on_step(self.value)
+
+
+class AnimationClock(QObject):
+    """Drives every Shadcn animation from a single display-rate timer
+
+    The timer only runs while at least one animation is active. Each tick
+    advances all animations and then schedules one update per animating
+    widget, so Qt paints them together in the next frame.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._animations: List[Animation] = []
+        self._elapsed = QElapsedTimer()
+        self._elapsed.start()
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+        self.frames = 0
+
+    def frame_interval(self) -> int:
+        """Milliseconds between frames of the primary screen"""
+        screen = QGuiApplication.primaryScreen()
+        rate = screen.refreshRate() if screen else 0.0
+        return max(1, round(1000 / (rate or _DEFAULT_REFRESH_RATE)))
+
+    def start(self, animation: Animation) -> Animation:
+        """Start driving an animation"""
+        animation._started_at = self._elapsed.elapsed()
+        animation.finished = False
+        if animation not in self._animations:
+            self._animations.append(animation)
+        if not self._timer.isActive():
+            self._timer.start(self.frame_interval())
+        return animation
+
+    def stop(self, animation: Optional[Animation]):
+        """Stop an animation, leaving its value where it is"""
+        if animation in self._animations:
+            self._animations.remove(animation)
+        if not self._animations:
+            self._timer.stop()
+
+    def animate(
+        self,
+        widget: QWidget,
+        start_value: float,
+        end_value: float,
+        duration: int,
+        kind: str = "transition",
+        on_step: Optional[Callable[[float], None]] = None,
+        on_finished: Optional[Callable[[], None]] = None,
+    ) -> Animation:
+        """Start a one-shot transition between two values"""
+        return self.start(
+            Animation(
+                widget,
+                duration,
+                start_value,
+                end_value,
+                kind,
+                on_step=on_step,
+                on_finished=on_finished,
+            )
+        )
+
+    def loop(self, widget: QWidget, period: int, kind: str = "loop") -> Animation:
+        """Start a looping animation whose value cycles from 0 to 1"""
+        return self.start(
+            Animation(
+                widget, period, kind=kind, loop=True, easing=QEasingCurve.Type.Linear
+            )
+        )
+
+    def _tick(self):
+        now = self._elapsed.elapsed()
+        dirty = {}
+        finished = []
+        for animation in list(self._animations):
+            if sip.isdeleted(animation.widget):
+                self._animations.remove(animation)
+                continue
+            animation._step(now)
+            if animation not in self._animations:
+                # Stopped by its own step, so there is nothing to paint
+                continue
+            dirty[id(animation.widget)] = animation.widget
+            if animation.finished:
+                self._animations.remove(animation)
+                finished.append(animation)
+
+        for widget in dirty.values():
+            widget.update()
+        for animation in finished:
+            if animation._on_finished:
+                animation._on_finished()
+        self.frames += 1
+        if not self._animations:
+            self._timer.stop()
+
+    def is_running(self) -> bool:
+        """Check if the clock is currently ticking"""
+        return self._timer.isActive()
+
+    def active_count(self, kind: Optional[str] = None) -> int:
+        """Number of active animations, optionally of one kind"""
+        if kind is None:
+            return len(self._animations)
+        return sum(1 for animation in self._animations if animation.kind == kind)
+
+    def stats(self) -> Dict[str, int]:
+        """Active animation counts per kind, for profiling"""
+        counts: Dict[str, int] = {}
+        for animation in self._animations:
+            counts[animation.kind] = counts.get(animation.kind, 0) + 1
+        return counts
+
+
+_clock: Optional[AnimationClock] = None
+
+
+def animation_clock() -> AnimationClock:
+    """Get the shared animation clock"""
+    global _clock
+    if _clock is None:
+        _clock = AnimationClock()
+    return _clock
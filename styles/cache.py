@@ -0,0 +1,192 @@
+"""
+Device-pixel-ratio aware pixmap caching for themed assets
+"""
+
+from typing import Callable, Dict, Hashable, List, Optional, Set, Tuple
+from PyQt6 import sip
+from PyQt6.QtCore import QEvent, QObject, QTimer
+from PyQt6.QtGui import QPixmap, QPixmapCache
+from PyQt6.QtWidgets import QWidget
+
+# Widgets prepared per idle tick when a window changes pixel ratio
+_PREPARE_BATCH = 32
+
+# Entries a namespace tracks before checking for evicted pixmaps
+_PRUNE_MIN = 1024
+
+
+class AssetCache:
+    """Pixmap cache keyed by namespace, key and device pixel ratio
+
+    Pixmaps live in QPixmapCache, so Qt's global budget bounds memory. The
+    cache remembers which keys belong to which namespace and pixel ratio so
+    a theme change or a window leaving a screen drops exactly those entries.
+    """
+
+    def __init__(self):
+        self._keys: Dict[Tuple[str, float], Set[str]] = {}
+        # Bucket sizes at which keys evicted by QPixmapCache are next pruned
+        self._prune_at: Dict[Tuple[str, float], int] = {}
+
+    def get(
+        self,
+        namespace: str,
+        key: Hashable,
+        dpr: float,
+        render: Callable[[float], QPixmap],
+    ) -> QPixmap:
+        """Get a cached pixmap, rendering it at the pixel ratio on a miss"""
+        cache_key = f"shadcn:{namespace}:{key}@{dpr:g}"
+        pixmap = QPixmapCache.find(cache_key)
+        if pixmap is None:
+            pixmap = render(dpr)
+            QPixmapCache.insert(cache_key, pixmap)
+            bucket = (namespace, dpr)
+            keys = self._keys.setdefault(bucket, set())
+            keys.add(cache_key)
+            if len(keys) >= self._prune_at.get(bucket, _PRUNE_MIN):
+                self._prune(bucket)
+        return pixmap
+
+    def _prune(self, bucket: Tuple[str, float]):
+        """Forget keys whose pixmaps QPixmapCache has evicted
+
+        Keys of frequently changing content, e.g. live sparklines, would
+        otherwise accumulate. Pruning again only after the bucket doubles
+        keeps the cost per insert constant.
+        """
+        keys = self._keys[bucket]
+        keys.difference_update([key for key in keys if QPixmapCache.find(key) is None])
+        self._prune_at[bucket] = max(_PRUNE_MIN, 2 * len(keys))
+
+    def invalidate(self, namespace: str):
+        """Drop every entry of a namespace at all pixel ratios"""
+        for bucket in [bucket for bucket in self._keys if bucket[0] == namespace]:
+            self._remove(bucket)
+
+    def evict_dpr(self, dpr: float):
+        """Drop every entry rendered for a pixel ratio"""
+        for bucket in [bucket for bucket in self._keys if bucket[1] == dpr]:
+            self._remove(bucket)
+
+    def _remove(self, bucket: Tuple[str, float]):
+        self._prune_at.pop(bucket, None)
+        for cache_key in self._keys.pop(bucket):
+            QPixmapCache.remove(cache_key)
+
+    def stats(self) -> Dict[str, int]:
+        """Get the number of tracked entries per namespace and pixel ratio"""
+        return {
+            f"{namespace}@{dpr:g}": len(keys)
+            for (namespace, dpr), keys in self._keys.items()
+        }
+
+
+class DprWatcher(QObject):
+    """Re-renders a window's assets when it moves to a different pixel ratio
+
+    Widgets opt in by implementing ``prepare_assets(dpr)``. Only widgets of
+    the affected window are prepared, in small batches on idle ticks of the
+    GUI thread, since pixmaps must be painted there. Watched windows hold a
+    count on their pixel ratio, and its assets are evicted once no watched
+    window uses it anymore.
+    """
+
+    def __init__(self, cache: AssetCache):
+        super().__init__()
+        self._cache = cache
+        self._dprs: Dict[int, float] = {}
+        # Watched windows at each pixel ratio
+        self._dpr_counts: Dict[float, int] = {}
+        self._pending: List[Tuple[QWidget, float]] = []
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._prepare_batch)
+
+    def watch(self, window: QWidget):
+        """Start tracking the pixel ratio of a top-level window"""
+        window = window.window()
+        if id(window) in self._dprs:
+            return
+        key = id(window)
+        self._set_dpr(key, window.devicePixelRatioF())
+        window.installEventFilter(self)
+        window.destroyed.connect(lambda: self._release(key))
+        if window.windowHandle() is not None:
+            self._connect_screen(window)
+
+    def _connect_screen(self, window: QWidget):
+        handle = window.windowHandle()
+        if handle is not None and not handle.property("shadcn_dpr_watched"):
+            handle.setProperty("shadcn_dpr_watched", True)
+            handle.screenChanged.connect(lambda _: self._check(window))
+
+    def eventFilter(self, a0, a1):
+        if a1 is not None and isinstance(a0, QWidget):
+            event_type = a1.type()
+            if event_type == QEvent.Type.Show:
+                self._connect_screen(a0)
+                self._check(a0)
+            elif event_type == QEvent.Type.DevicePixelRatioChange:
+                self._check(a0)
+        return False
+
+    def _set_dpr(self, key: int, dpr: Optional[float]) -> Optional[float]:
+        """Move a window to a pixel ratio, or forget it with None
+
+        Returns the window's previous ratio if no watched window uses it
+        anymore.
+        """
+        old_dpr = self._dprs.pop(key, None)
+        if dpr is not None:
+            self._dprs[key] = dpr
+            self._dpr_counts[dpr] = self._dpr_counts.get(dpr, 0) + 1
+        if old_dpr is None:
+            return None
+        count = self._dpr_counts.pop(old_dpr) - 1
+        if count:
+            self._dpr_counts[old_dpr] = count
+            return None
+        return old_dpr
+
+    def _release(self, key: int):
+        """Forget a destroyed window, evicting a ratio it alone used"""
+        unused = self._set_dpr(key, None)
+        if unused is not None:
+            self._cache.evict_dpr(unused)
+
+    def _check(self, window: QWidget):
+        """Queue the window's assets if its pixel ratio changed"""
+        dpr = window.devicePixelRatioF()
+        if self._dprs.get(id(window)) == dpr:
+            return
+        unused = self._set_dpr(id(window), dpr)
+        self._pending = [
+            (widget, ratio)
+            for widget, ratio in self._pending
+            if not sip.isdeleted(widget) and widget.window() is not window
+        ]
+        self._pending.extend(
+            (widget, dpr)
+            for widget in window.findChildren(QWidget)
+            if hasattr(widget, "prepare_assets")
+        )
+        if unused is not None:
+            self._cache.evict_dpr(unused)
+        self._timer.start()
+
+    def _prepare_batch(self):
+        batch = self._pending[:_PREPARE_BATCH]
+        del self._pending[:_PREPARE_BATCH]
+        for widget, dpr in batch:
+            if sip.isdeleted(widget):
+                continue
+            widget.prepare_assets(dpr)
+            widget.update()
+        if not self._pending:
+            self._timer.stop()
+
+    @property
+    def pending(self) -> int:
+        """Number of widgets still waiting to prepare their assets"""
+        return len(self._pending)
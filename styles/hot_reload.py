@@ -0,0 +1,126 @@
+"""
+Theme hot-reload for development: watch theme sources and apply edits live
+"""
+
+import importlib.util
+import inspect
+import os
+from typing import Dict, Optional, Set
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QThreadPool, QTimer, pyqtSignal
+from themes.base import ShadcnTheme
+
+# Editors often write a file in several steps; wait this long for them to settle
+_SETTLE_MS = 20
+
+
+def load_theme_colors(name: str, path: str) -> Dict[bool, Dict[str, str]]:
+    """Execute a theme source file and get the raw colors of its theme
+
+    The module is loaded under a private name and not registered in
+    ``sys.modules``, so the running application keeps its own import.
+    """
+    spec = importlib.util.spec_from_file_location(f"_shadcn_reload_{name}", path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load theme source {path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    for value in vars(module).values():
+        if (
+            inspect.isclass(value)
+            and issubclass(value, ShadcnTheme)
+            and value.__module__ == module.__name__
+        ):
+            theme = value()
+            if theme.name == name:
+                return {
+                    False: dict(getattr(theme, "_light_colors", {})),
+                    True: dict(getattr(theme, "_dark_colors", {})),
+                }
+    raise LookupError(f"No theme named {name} in {path}")
+
+
+class ThemeReloader(QObject):
+    """Recompiles themes whose source files change on disk
+
+    Sources are parsed on a worker thread. Back on the GUI thread only the
+    tokens that differ from the loaded theme are recompiled, and the change
+    is pushed to the application if the theme is the current one.
+    """
+
+    reloaded = pyqtSignal(str, object)
+    reload_failed = pyqtSignal(str, str)
+    _loaded = pyqtSignal(str, object)
+    _failed = pyqtSignal(str, str)
+
+    def __init__(self, style_manager):
+        super().__init__()
+        self._style_manager = style_manager
+        self._paths: Dict[str, str] = {}
+        self._changed: Set[str] = set()
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(_SETTLE_MS)
+        self._timer.timeout.connect(self._reload_changed)
+        self._loaded.connect(self._apply)
+        self._failed.connect(self._report)
+
+    def watch_all(self):
+        """Watch the source file of every registered theme"""
+        for name, theme in self._style_manager.theme_manager.themes.items():
+            path = inspect.getsourcefile(type(theme))
+            if path:
+                self.watch_theme(name, path)
+
+    def watch_theme(self, name: str, path: str):
+        """Watch one theme's source file"""
+        path = os.path.abspath(path)
+        self._paths[path] = name
+        self._watcher.addPath(path)
+
+    def watched(self) -> Dict[str, str]:
+        """Get the watched source paths and their theme names"""
+        return dict(self._paths)
+
+    def _on_file_changed(self, path: str):
+        # Saving by replacing the file drops it from the watcher
+        if path not in self._watcher.files() and os.path.exists(path):
+            self._watcher.addPath(path)
+        if path in self._paths:
+            self._changed.add(path)
+            self._timer.start()
+
+    def _reload_changed(self):
+        changed, self._changed = self._changed, set()
+        for path in changed:
+            self.reload(self._paths[path], path)
+
+    def reload(self, name: str, path: Optional[str] = None):
+        """Reload a theme from its source file on a worker thread
+
+        Without a path, the theme must be watched.
+        """
+        if path is None:
+            path = next((p for p, theme in self._paths.items() if theme == name), None)
+            if path is None:
+                raise ValueError(f"Theme {name} is not watched")
+
+        def load():
+            try:
+                colors = load_theme_colors(name, path)
+            except Exception as e:
+                self._failed.emit(name, f"{type(e).__name__}: {e}")
+            else:
+                self._loaded.emit(name, colors)
+
+        QThreadPool.globalInstance().start(load)
+
+    def _apply(self, name: str, colors: Dict[bool, Dict[str, str]]):
+        changes = self._style_manager.update_theme_colors(name, colors)
+        self.reloaded.emit(name, changes)
+
+    def _report(self, name: str, message: str):
+        print(f"Error reloading theme {name}: {message}")
+        self.reload_failed.emit(name, message)
@@ -0,0 +1,149 @@
+"""
+Cached rendering of checkbox, radio button and slider handle indicators
+"""
+
+from PyQt6.QtCore import Qt, QRectF, QPointF, QSize
+from PyQt6.QtGui import QPainter, QPainterPath, QPixmap, QPen
+
+CHECKBOX = "checkbox"
+RADIO = "radio"
+SLIDER_HANDLE = "slider_handle"
+
+# Indicator border width, matching the QSS rules
+_BORDER = 2.0
+# Default width of the focus ring, drawn in the band the QSS reserves around
+# indicators; the ring-width metric token sets it
+FOCUS_RING = 2
+# Suffix of the states of a focused indicator, e.g. "checked-hover-focus"
+FOCUS = "-focus"
+
+
+def _state_token(token: str, state: str) -> str:
+    """Get the derived theme token of a base token for an indicator state"""
+    if state.endswith(FOCUS):
+        state = state[: -len(FOCUS)]
+    for suffix in ("hover", "pressed", "disabled"):
+        if state.endswith(suffix):
+            return f"{token}-{suffix}"
+    return token
+
+
+class IndicatorCache:
+    """Renders themed indicators once and serves them from the asset cache
+
+    Pixmaps are keyed by theme, mode, palette version, indicator kind, state,
+    size and device pixel ratio, so painting an indicator is a single blit.
+    """
+
+    NAMESPACE = "indicator"
+
+    def __init__(self, style_manager):
+        self._style_manager = style_manager
+
+    def pixmap(self, kind: str, state: str, size: QSize, dpr: float) -> QPixmap:
+        """Get the indicator pixmap, rendering it on first use"""
+        manager = self._style_manager
+        key = (
+            f"{manager.get_current_theme_name()}:{int(manager.is_dark_mode())}:"
+            f"{manager.palette_version}:{kind}:{state}:"
+            f"{size.width()}x{size.height()}"
+        )
+        return manager.assets.get(
+            self.NAMESPACE,
+            key,
+            dpr,
+            lambda ratio: self._render(kind, state, size, ratio),
+        )
+
+    def flush(self):
+        """Remove every cached indicator, e.g. after a theme change"""
+        self._style_manager.assets.invalidate(self.NAMESPACE)
+
+    def _render(self, kind: str, state: str, size: QSize, dpr: float) -> QPixmap:
+        """Render an indicator into a transparent pixmap"""
+        pixmap = QPixmap(round(size.width() * dpr), round(size.height() * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        band = self._style_manager.get_metric("ring-width", FOCUS_RING)
+        ring = QRectF(0, 0, size.width(), size.height())
+        if state.endswith(FOCUS):
+            self._draw_focus_ring(painter, kind, ring, band)
+        rect = ring.adjusted(band, band, -band, -band)
+        if kind == SLIDER_HANDLE:
+            self._draw_slider_handle(painter, state, rect)
+        else:
+            self._draw_toggle(painter, kind, state, rect)
+        painter.end()
+        return pixmap
+
+    def _draw_focus_ring(self, painter: QPainter, kind: str, rect: QRectF, width: int):
+        """Draw the focus ring in the band around an indicator"""
+        inset = width / 2
+        ring = rect.adjusted(inset, inset, -inset, -inset)
+        painter.setPen(QPen(self._style_manager.get_qcolor("focus-ring"), width))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        if kind == CHECKBOX:
+            radius = self._style_manager.get_metric("radius-sm", 4) + width
+            painter.drawRoundedRect(ring, radius, radius)
+        else:
+            painter.drawEllipse(ring)
+
+    def _draw_toggle(self, painter: QPainter, kind: str, state: str, rect: QRectF):
+        """Draw a checkbox or radio button indicator"""
+        color = self._style_manager.get_qcolor
+        check_state = state.split("-")[0]
+        checked = check_state in ("checked", "partial")
+        if checked:
+            fill = color(_state_token("primary", state))
+            border = fill
+        else:
+            fill = color(_state_token("background", state))
+            if state.endswith("hover"):
+                border = color("muted-foreground")
+            else:
+                border = color("border")
+
+        box = rect.adjusted(_BORDER / 2, _BORDER / 2, -_BORDER / 2, -_BORDER / 2)
+        painter.setPen(QPen(border, _BORDER))
+        painter.setBrush(fill)
+        if kind == RADIO:
+            painter.drawEllipse(box)
+        else:
+            radius = self._style_manager.get_metric("radius-sm", 4)
+            painter.drawRoundedRect(box, radius, radius)
+
+        if not checked:
+            return
+
+        mark = color("primary-foreground")
+        width, height = rect.width(), rect.height()
+        if kind == RADIO:
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(mark)
+            painter.drawEllipse(rect.center(), width * 3 / 16, height * 3 / 16)
+            return
+
+        pen = QPen(mark, 2)
+        pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+        pen.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
+        painter.setPen(pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        if check_state == "partial":
+            path = QPainterPath(QPointF(width * 0.3, height / 2))
+            path.lineTo(QPointF(width * 0.7, height / 2))
+        else:
+            path = QPainterPath(QPointF(width * 0.27, height * 0.52))
+            path.lineTo(QPointF(width * 0.43, height * 0.68))
+            path.lineTo(QPointF(width * 0.74, height * 0.35))
+        # The mark is laid out in the box, inside the focus ring band
+        painter.drawPath(path.translated(rect.topLeft()))
+
+    def _draw_slider_handle(self, painter: QPainter, state: str, rect: QRectF):
+        """Draw a round slider handle"""
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self._style_manager.get_qcolor(_state_token("primary", state)))
+        painter.drawEllipse(rect)
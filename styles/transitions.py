@@ -0,0 +1,63 @@
+"""
+Crossfade transitions for theme changes
+"""
+
+from typing import Callable, List
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QPainter, QPixmap
+from PyQt6.QtWidgets import QWidget
+from styles.animation import animation_clock
+
+
+class _CrossfadeOverlay(QWidget):
+    """Snapshot of a window drawn over it while the new style fades in"""
+
+    def __init__(self, window: QWidget, snapshot: QPixmap):
+        super().__init__(window)
+        self._snapshot = snapshot
+        self._opacity = 1.0
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setAttribute(Qt.WidgetAttribute.WA_NoSystemBackground)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.setGeometry(window.rect())
+
+    def set_opacity(self, opacity: float):
+        self._opacity = opacity
+
+    def paintEvent(self, a0):
+        painter = QPainter(self)
+        painter.setOpacity(self._opacity)
+        painter.drawPixmap(0, 0, self._snapshot)
+
+
+def crossfade(windows: List[QWidget], restyle: Callable[[], None], duration: int):
+    """Run a restyle behind snapshots of the windows, then fade them out
+
+    The windows are frozen while the restyle runs, so partially repolished
+    widgets are never shown. The overlays ignore mouse and keyboard input.
+    """
+    overlays = []
+    for window in windows:
+        overlay = _CrossfadeOverlay(window, window.grab())
+        overlay.show()
+        overlay.raise_()
+        overlays.append(overlay)
+        window.setUpdatesEnabled(False)
+
+    try:
+        restyle()
+    finally:
+        for window in windows:
+            window.setUpdatesEnabled(True)
+
+    clock = animation_clock()
+    for overlay in overlays:
+        clock.animate(
+            overlay,
+            1.0,
+            0.0,
+            duration,
+            kind="crossfade",
+            on_step=overlay.set_opacity,
+            on_finished=overlay.deleteLater,
+        )
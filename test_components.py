@@ -7,12 +7,20 @@ import sys
 from PyQt6.QtWidgets import QApplication
 from main import MainWindow
 
+_app = None
+
+
+def get_application():
+    """Get the QApplication, creating it once and keeping it alive"""
+    global _app
+    if _app is None:
+        _app = QApplication.instance() or QApplication(sys.argv)
+    return _app
+
 
 def test_application():
     """Test that the application can be instantiated and shows components"""
-    app = QApplication(  # noqa: F841
-        sys.argv
-    )  # Required for QWidget creation, even though not used in test
+    app = get_application()  # noqa: F841
 
     # Create main window
     window = MainWindow()
@@ -37,6 +45,1269 @@ def test_application():
     # sys.exit(app.exec())
 
 
+def test_painted_button():
+    """Test that painted buttons render without the stylesheet engine"""
+    from PyQt6.QtWidgets import QPushButton
+    from styles import style_manager
+    from widgets import ShadcnPaintedButton
+
+    app = get_application()
+    style_manager.set_application(app)
+    style_manager.apply_theme("blue")
+
+    button = ShadcnPaintedButton("Primary", "primary")
+    assert button.variant == "primary"
+    assert button.sizeHint().height() >= 54
+
+    image = button.grab().toImage()
+    center = image.pixelColor(image.width() // 2, 4)
+    assert center.name() == style_manager.get_qcolor("primary").name()
+
+    # It is no QPushButton, so button rules neither size nor paint it
+    assert not isinstance(button, QPushButton)
+    hint = button.sizeHint()
+    app.setStyleSheet(
+        app.styleSheet() + "QPushButton { padding: 40px; background: red; }"
+    )
+    assert button.sizeHint() == hint
+    assert button.grab().toImage() == image
+    style_manager.apply_theme("blue")
+
+    # Held down from the keyboard, without hover, it shows the pressed color
+    button.setDown(True)
+    image = button.grab().toImage()
+    pressed = style_manager.get_ramp("primary")[-1]
+    assert image.pixelColor(image.width() // 2, 4).name() == pressed.name()
+    button.setDown(False)
+
+    # Outlines of resized buttons do not pile up
+    from widgets import buttons
+
+    for width in range(buttons._CACHE_LIMIT + 10):
+        buttons._rounded_path(width, 36, 6)
+    assert len(buttons._path_cache) <= buttons._CACHE_LIMIT
+
+    print("✓ Painted button renders from theme colors")
+
+
+def test_cached_label():
+    """Test that cached labels elide and refresh only on text changes"""
+    from widgets import HeadingLabel
+
+    get_application()
+    label = HeadingLabel("A fairly long heading that needs eliding", cached=True)
+    label.resize(120, 40)
+    label.grab()
+    elided = label._elided_text(label.contentsRect().width())
+    assert elided.endswith("\u2026")
+
+    label.grab()
+    assert label._elided_text(label.contentsRect().width()) is elided
+
+    label.setText("Short")
+    label.grab()
+    assert label._elided_text(label.contentsRect().width()) == "Short"
+
+    # Only the current width is kept, and setNum bypasses setText
+    for width in range(60, 200, 10):
+        label.resize(width, 40)
+        label.grab()
+    assert label._elided[0] == label.contentsRect().width()
+    label.setNum(42)
+    label.grab()
+    assert label._static_text.text() == "42"
+
+    print("✓ Cached label elides and refreshes on text change")
+
+
+def test_indicator_cache():
+    """Test that indicators are rendered once and flushed on theme change"""
+    from PyQt6.QtCore import QSize
+    from styles import style_manager
+    from styles.indicators import CHECKBOX
+
+    style_manager.set_application(get_application())
+    style_manager.apply_theme("blue")
+
+    first = style_manager.indicators.pixmap(CHECKBOX, "checked", QSize(26, 26), 1.0)
+    again = style_manager.indicators.pixmap(CHECKBOX, "checked", QSize(26, 26), 1.0)
+    assert first.cacheKey() == again.cacheKey()
+
+    style_manager.switch_theme("rose")
+    rose = style_manager.indicators.pixmap(CHECKBOX, "checked", QSize(26, 26), 1.0)
+    assert rose.cacheKey() != first.cacheKey()
+
+    # The check mark is centered in the box, inside the focus ring band
+    image = rose.toImage()
+    mark = style_manager.get_qcolor("primary-foreground").name()
+    columns = [
+        x for x in range(26) for y in range(26) if image.pixelColor(x, y).name() == mark
+    ]
+    assert abs((min(columns) + max(columns)) / 2 - 13) <= 1
+
+    # Keyboard focus shows a ring around the cached indicators
+    from PyQt6.QtCore import Qt
+    from PyQt6.QtWidgets import QVBoxLayout, QWidget
+    from widgets import ShadcnCheckbox, ShadcnRadioButton, ShadcnSlider
+
+    window = QWidget()
+    layout = QVBoxLayout(window)
+    widgets = [ShadcnCheckbox("Check"), ShadcnRadioButton("Radio"), ShadcnSlider()]
+    for widget in widgets:
+        layout.addWidget(widget)
+    window.show()
+    get_application().processEvents()
+    for widget in widgets:
+        widget.clearFocus()
+        get_application().processEvents()
+        blurred = widget.grab().toImage()
+        widget.setFocus(Qt.FocusReason.TabFocusReason)
+        get_application().processEvents()
+        assert widget.grab().toImage() != blurred
+    window.close()
+
+    print("✓ Indicator pixmaps cached per theme")
+
+
+def test_icon_cache():
+    """Test that icons are parsed once and re-tinted from the cache"""
+    from styles import style_manager
+    from widgets import ShadcnIcon
+    from widgets import icons
+
+    style_manager.set_application(get_application())
+    style_manager.apply_theme("blue")
+
+    icon = ShadcnIcon("check", 16, "primary")
+    first = icon.pixmap(2.0)
+    assert first.width() == 32
+    assert icon.pixmap(2.0).cacheKey() == first.cacheKey()
+
+    renderers = len(icons._renderers)
+    style_manager.switch_theme("rose")
+    assert icon.pixmap(2.0).cacheKey() != first.cacheKey()
+    assert len(icons._renderers) == renderers
+
+    print("✓ Icons cached per size, color and pixel ratio")
+
+
+def test_dpr_watcher():
+    """Test that a pixel ratio change re-renders only that window's assets"""
+    from PyQt6.QtCore import QEvent, QSize
+    from PyQt6.QtWidgets import QWidget, QVBoxLayout
+    from styles import style_manager
+    from styles.indicators import CHECKBOX
+    from widgets import ShadcnCheckbox
+
+    app = get_application()
+    style_manager.set_application(app)
+    style_manager.apply_theme("blue")
+
+    window = QWidget()
+    QVBoxLayout(window).addWidget(ShadcnCheckbox("Option"))
+    style_manager.watch_window(window)
+    window.show()
+
+    # Another watched window still uses the old ratio, so its assets stay
+    other = QWidget()
+    style_manager.watch_window(other)
+    watcher = style_manager._dpr_watcher
+    watcher._set_dpr(id(window), 3.0)
+    watcher._set_dpr(id(other), 3.0)
+    style_manager.indicators.pixmap(CHECKBOX, "checked", QSize(26, 26), 3.0)
+    watcher._check(window)
+    assert watcher.pending == 1
+    assert any(key.endswith("@3") for key in style_manager.assets.stats())
+
+    # They are evicted once the last window using the ratio goes away
+    other.deleteLater()
+    app.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+    assert not any(key.endswith("@3") for key in style_manager.assets.stats())
+
+    while watcher.pending:
+        app.processEvents()
+    window.close()
+
+    print("✓ Pixel ratio changes re-render window assets")
+
+
+def test_animation_clock():
+    """Test that all animations share one clock that stops when idle"""
+    from PyQt6.QtWidgets import QWidget, QVBoxLayout
+    from styles.animation import animation_clock
+    from widgets import ShadcnSpinner, ShadcnSkeleton, ShadcnProgressBar
+
+    app = get_application()
+    clock = animation_clock()
+
+    window = QWidget()
+    layout = QVBoxLayout(window)
+    progress_bar = ShadcnProgressBar()
+    progress_bar.set_indeterminate(True)
+    for widget in (ShadcnSpinner(), ShadcnSkeleton(120), progress_bar):
+        layout.addWidget(widget)
+    window.show()
+
+    assert clock.is_running()
+    assert clock.stats() == {"spinner": 1, "shimmer": 1, "progress": 1}
+    frames = clock.frames
+    while clock.frames == frames:
+        app.processEvents()
+
+    window.hide()
+    assert clock.active_count() == 0
+    assert not clock.is_running()
+
+    print("✓ Shared animation clock drives and stops all animations")
+
+
+def test_state_ramps():
+    """Test that button state ramps run from base to hover to pressed"""
+    from themes import ThemeManager
+    from themes.base import RAMP_STEPS
+
+    theme = ThemeManager().get_theme("blue")
+    colors = theme.get_colors_for_mode(False)
+    assert colors["primary-hover"] != colors["primary"]
+
+    ramp = theme.get_state_ramps(False)["primary"]
+    assert len(ramp) == 2 * RAMP_STEPS + 1
+    as_hex = ["#{:02x}{:02x}{:02x}".format(*rgba[:3]) for rgba in ramp]
+    assert as_hex[0] == colors["primary"]
+    assert as_hex[RAMP_STEPS] == colors["primary-hover"]
+    assert as_hex[-1] == colors["primary-pressed"]
+
+    print("✓ Button state ramps interpolate between theme states")
+
+
+def test_derived_state_colors():
+    """Test that every state token is derived once with the palette"""
+    from themes import ThemeManager
+    from themes.base import STATE_TOKEN_BASES
+
+    theme = ThemeManager().get_theme("rose")
+    for dark_mode in (False, True):
+        colors = theme.get_colors_for_mode(dark_mode)
+        for token in STATE_TOKEN_BASES:
+            for state in ("hover", "pressed", "disabled"):
+                assert f"{token}-{state}" in colors
+        assert "focus-ring" in colors
+        assert colors["primary-hover"] != colors["primary-pressed"]
+        assert theme.get_colors_for_mode(dark_mode) is colors
+
+    stylesheet = theme.get_stylesheet(False)
+    assert theme.get_colors_for_mode(False)["secondary-hover"] in stylesheet
+
+    print("✓ Derived state colors compiled with the palette")
+
+
+def test_theme_crossfade():
+    """Test that a crossfaded theme switch overlays and then removes a snapshot"""
+    from PyQt6.QtCore import Qt
+    from PyQt6.QtWidgets import QWidget
+    from styles import style_manager
+    from styles.animation import animation_clock
+
+    app = get_application()
+    style_manager.set_application(app)
+    style_manager.apply_theme("neutral")
+    style_manager.set_crossfade(50)
+
+    window = MainWindow()
+    window.show()
+    try:
+        assert style_manager.switch_theme("violet")
+        overlays = [
+            child
+            for child in window.findChildren(QWidget)
+            if child.testAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        ]
+        assert len(overlays) == 1
+        assert window.updatesEnabled()
+        assert animation_clock().active_count("crossfade") == 1
+
+        while animation_clock().active_count("crossfade"):
+            app.processEvents()
+    finally:
+        style_manager.set_crossfade(0)
+        window.close()
+
+    print("✓ Theme switches crossfade from a window snapshot")
+
+
+def test_theme_picker():
+    """Test that the theme picker opens at once and caches thumbnails on disk"""
+    import os
+    import tempfile
+    from styles import style_manager
+    from widgets import ShadcnThemePicker
+
+    app = get_application()
+    style_manager.set_application(app)
+    style_manager.apply_theme("neutral")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        picker = ShadcnThemePicker(cache_dir=cache_dir)
+        themes = style_manager.get_available_themes()
+        assert picker.count() == 2 * len(themes)
+        assert picker.pending == picker.count()
+
+        picker.show()
+        while picker.pending:
+            app.processEvents()
+        picker.close()
+        assert len(os.listdir(cache_dir)) == picker.count()
+
+        selected = []
+        picker.theme_selected.connect(lambda name, dark: selected.append((name, dark)))
+        picker.itemClicked.emit(picker.item(1))
+        assert selected == [(themes[0], True)]
+
+        # A second picker reads the thumbnails back instead of rendering them
+        cached = ShadcnThemePicker(cache_dir=cache_dir).thumbnail("violet", True)
+        assert not cached.isNull()
+        assert len(os.listdir(cache_dir)) == picker.count()
+
+    print("✓ Theme picker renders previews in the background and caches them")
+
+
+def test_debounced_theme_select():
+    """Test that browsing the theme selector switches theme only once"""
+    import time
+    from styles import style_manager
+
+    app = get_application()
+    style_manager.set_application(app)
+    style_manager.apply_theme("neutral")
+
+    window = MainWindow()
+    switched = []
+    style_manager.switch_theme = lambda name, *args: switched.append(name) or True
+    try:
+        for theme in ("stone", "zinc", "slate", "gray"):
+            window.theme_combo.setCurrentText(theme)
+        assert switched == []
+        assert window.theme_combo.is_settling()
+
+        deadline = time.monotonic() + 2
+        while window.theme_combo.is_settling() and time.monotonic() < deadline:
+            app.processEvents()
+        assert switched == ["gray"]
+    finally:
+        del style_manager.switch_theme
+        window.close()
+
+    print("✓ Theme selector debounces browsing to a single switch")
+
+
+def test_live_token_override():
+    """Test that a token override recompiles only what depends on it"""
+    from styles import style_manager
+    from themes import ThemeManager
+
+    app = get_application()
+    style_manager.set_application(app)
+    style_manager.apply_theme("blue")
+    theme = style_manager.get_current_theme()
+    reference = ThemeManager().get_theme("blue")
+    try:
+        theme.get_stylesheet(False)
+        changes = theme.set_token("primary", "oklch(0.6 0.2 30)", False)
+        assert changes[False] == {
+            "primary",
+            "primary-hover",
+            "primary-pressed",
+            "primary-disabled",
+        }
+        colors = theme.get_colors_for_mode(False)
+        assert theme.get_stylesheet(False) == theme._generate_stylesheet(colors)
+        assert theme.get_colors_for_mode(True) == reference.get_colors_for_mode(True)
+
+        # Several changes within a frame are pushed together
+        version = style_manager.palette_version
+        for hue in (40, 50, 60):
+            style_manager.set_token("primary", f"oklch(0.6 0.2 {hue})", False)
+        assert style_manager.palette_version == version
+        style_manager.flush_tokens()
+        assert style_manager.palette_version == version + 1
+        assert style_manager.get_colors()["primary"] in app.styleSheet()
+    finally:
+        theme.reset_tokens()
+        style_manager.apply_theme("neutral")
+
+    assert theme.get_colors_for_mode(False) == reference.get_colors_for_mode(False)
+    print("✓ Token overrides recompile incrementally and push once per frame")
+
+
+def test_metric_tokens():
+    """Test that metric changes reach only dependent QSS slots and widgets"""
+    from styles import style_manager
+    from PyQt6.QtWidgets import QStyle, QStyleOptionButton
+    from themes.tokens import TokenGraph, DerivedToken
+    from widgets import ShadcnInput, ShadcnCard, ShadcnCheckbox
+
+    graph = TokenGraph(
+        {"a": 1, "b": 2},
+        {
+            "c": DerivedToken(("a",), lambda a: a * 10),
+            "d": DerivedToken(("c", "b"), lambda c, b: c + b),
+            "e": DerivedToken(("b",), lambda b: b),
+        },
+    )
+    assert graph.values["d"] == 12
+    assert graph.set("a", 3) == {"a", "c", "d"}
+    assert graph.set("a", 3) == set()
+
+    app = get_application()
+    style_manager.set_application(app)
+    style_manager.apply_theme("neutral")
+    theme = style_manager.get_current_theme()
+    text_input = ShadcnInput()
+    card = ShadcnCard()
+    checkbox = ShadcnCheckbox("Option")
+
+    def indicator_width():
+        checkbox.ensurePolished()
+        option = QStyleOptionButton()
+        checkbox.initStyleOption(option)
+        return (
+            checkbox.style()
+            .subElementRect(QStyle.SubElement.SE_CheckBoxIndicator, option, checkbox)
+            .width()
+        )
+
+    assert indicator_width() == 26
+    try:
+        assert text_input.minimumHeight() == 40
+        style_manager.set_density("dense")
+        style_manager.flush_tokens()
+        assert text_input.minimumHeight() == style_manager.get_metric("input-height")
+        assert text_input.minimumHeight() == 30
+        assert card.layout().contentsMargins().left() == 12
+        assert "padding: 6px 12px;" in app.styleSheet()
+        # Painted indicators and their focus ring band follow density too
+        assert indicator_width() == style_manager.get_metric("indicator-box") < 26
+        assert "margin: -7px 0;" in app.styleSheet()
+
+        # Metrics survive theme switches, colors stay untouched
+        style_manager.apply_theme("rose")
+        assert style_manager.get_metric("button-height") == 27
+        assert theme.get_colors_for_mode(False)["primary"].startswith("#")
+    finally:
+        style_manager.set_density("comfortable")
+        style_manager.apply_theme("neutral")
+
+    assert text_input.minimumHeight() == 40
+    assert "padding: 8px 16px;" in app.styleSheet()
+    print("✓ Metric tokens propagate to dependent rules and widgets")
+
+
+def test_theme_hot_reload():
+    """Test that saving a watched theme source recompiles and applies it"""
+    import os
+    import shutil
+    import tempfile
+    import time
+    from styles import style_manager
+    from styles.hot_reload import ThemeReloader
+
+    app = get_application()
+    style_manager.set_application(app)
+    style_manager.apply_theme("rose")
+    theme = style_manager.get_current_theme()
+    original = dict(theme._light_colors)
+    style_manager.get_current_theme().get_stylesheet(False)
+
+    with tempfile.TemporaryDirectory() as source_dir:
+        path = os.path.join(source_dir, "rose.py")
+        shutil.copy(os.path.join(os.path.dirname(__file__), "themes", "rose.py"), path)
+        reloader = ThemeReloader(style_manager)
+        reloader.watch_theme("rose", path)
+        results = []
+        reloader.reloaded.connect(lambda name, changes: results.append(changes))
+        try:
+            with open(path) as source:
+                text = source.read()
+            old_primary = original["primary"]
+            with open(path, "w") as source:
+                source.write(
+                    text.replace(
+                        f'"primary": "{old_primary}"', '"primary": "#123456"', 1
+                    )
+                )
+            version, stylesheet = style_manager.palette_version, app.styleSheet()
+            started = time.monotonic()
+            while not results and time.monotonic() - started < 5:
+                app.processEvents()
+            elapsed = time.monotonic() - started
+
+            assert results, "theme was not reloaded"
+            assert "primary" in results[0][False]
+            assert "background" not in results[0][False]
+            # The theme is recompiled and the new colors pushed to the app
+            assert theme.get_colors_for_mode(False)["primary"] == "#123456"
+            assert style_manager.get_colors()["primary"] == "#123456"
+            assert style_manager.palette_version > version
+            assert app.styleSheet() != stylesheet
+            assert "#123456" in app.styleSheet()
+
+            try:
+                reloader.reload("blue")
+            except ValueError as e:
+                assert "blue" in str(e)
+            else:
+                raise AssertionError("reloading an unwatched theme did not fail")
+        finally:
+            theme.update_source_colors({False: original})
+            style_manager.apply_theme("neutral")
+
+    print(f"✓ Theme source edits hot-reload in {elapsed * 1000:.0f} ms")
+
+
+def test_theme_generator():
+    """Test that seed colors generate complete, cached light and dark themes"""
+    import numpy as np
+    from themes import ThemeManager
+    from themes import generator
+
+    rose = ThemeManager().get_theme("rose")
+    theme = generator.generate_theme("oklch(0.645 0.246 16)", "tenant-rose")
+    assert theme.name == "tenant-rose"
+    assert theme._light_colors.keys() == rose._light_colors.keys()
+    assert theme._dark_colors.keys() == rose._dark_colors.keys()
+    assert (
+        theme.get_colors_for_mode(False)["primary"]
+        == rose.get_colors_for_mode(False)["primary"]
+    )
+    assert "primary-hover" in theme.get_colors_for_mode(True)
+
+    seeds = ["#2563eb", "#16a34a", "#facc15", "#000000", (0.6, 0.2, 300)]
+    inline = generator.generate_palettes(seeds, workers=0)
+    assert inline[2][False]["primary-foreground"].startswith("oklch(0.208")
+    assert inline[0][False]["primary-foreground"].startswith("oklch(0.984")
+    # Cached results are handed out as copies
+    inline[0][False]["primary"] = "#ff0000"
+    again = generator.generate_palettes(seeds)
+    assert again[0] is not inline[0] and again[0][False]["primary"] != "#ff0000"
+    cached = len(generator._cache)
+    limit = generator._CACHE_LIMIT
+    generator._CACHE_LIMIT = cached + 1
+    try:
+        generator.generate_palettes([(0.5, 0.1, hue) for hue in range(3)], workers=0)
+        assert len(generator._cache) <= generator._CACHE_LIMIT
+    finally:
+        generator._CACHE_LIMIT = limit
+    inline = generator.generate_palettes(seeds, workers=0)
+    # Near-gray seeds keep their hue, as in themes.color
+    near_gray = generator.generate_palette_batch(np.array([[0.5, 5e-5, 200.0]]))
+    assert near_gray[0][False]["primary"] == "oklch(0.500 0.000 200.000)"
+
+    generator.clear_cache()
+    chunk_size = generator.CHUNK_SIZE
+    generator.CHUNK_SIZE = 2
+    try:
+        assert generator.generate_palettes(seeds, workers=2) == inline
+    finally:
+        generator.CHUNK_SIZE = chunk_size
+
+    manager = ThemeManager()
+    manager.register_theme(theme)
+    assert manager.set_theme("tenant-rose")
+    print("✓ Seed colors generate complete light and dark themes")
+
+
+def test_contrast_audit():
+    """Test contrast of token pairs across themes and automatic adjustment"""
+    import numpy as np
+    from themes import ThemeManager
+    from themes.audit import (
+        CONTRAST_PAIRS,
+        adjust_palettes,
+        apca_contrast,
+        audit_palettes,
+        audit_themes,
+        theme_palettes,
+    )
+
+    white, black = np.ones(3), np.zeros(3)
+    assert abs(apca_contrast(black, white) - 106.04) < 0.01
+    assert abs(apca_contrast(white, black) + 107.88) < 0.01
+
+    labels, palettes = theme_palettes(ThemeManager().themes.values())
+    report = audit_palettes(palettes, min_apca=45)
+    assert report.wcag.shape == (len(labels), len(CONTRAST_PAIRS))
+    pair = CONTRAST_PAIRS.index(("foreground", "background"))
+    assert (report.wcag[:, pair] > 15).all()
+    failures = audit_themes(min_wcag=4.5)
+    assert ("yellow", False) in failures
+    assert all(failure.wcag < 4.5 for failure in failures[("yellow", False)])
+
+    missing = audit_palettes([{"foreground": "#000000"}])
+    assert np.isnan(missing.wcag).all() and missing.passed
+
+    low = {"foreground": "oklch(0.7 0.1 250)", "background": "oklch(0.98 0 0)"}
+    translucent = {"foreground": "oklch(0 0 0 / 20%)", "background": "#ffffff"}
+    assert audit_palettes([translucent]).wcag[0, pair] < 2
+    adjusted = adjust_palettes([low], min_apca=60)
+    assert audit_palettes(adjusted, min_apca=60).passed
+    assert adjusted[0]["background"] == low["background"]
+    assert adjusted[0]["foreground"].endswith(" 250.000)")
+    assert low["foreground"] == "oklch(0.7 0.1 250)"
+    print("✓ Contrast audit measures and fixes token pairs")
+
+
+def test_color_math_parity():
+    """Test that the built-in color math matches coloraide on every shipped token"""
+    try:
+        import coloraide  # type: ignore
+    except ImportError:
+        print("- coloraide not installed, skipping color math parity")
+        return
+    from themes import ThemeManager
+    from themes import color as colormath
+
+    hexes = set()
+    for theme in ThemeManager().themes.values():
+        for dark in (False, True):
+            for value in theme.get_source_colors(dark).values():
+                coords = value[6:-1].split()
+                if len(coords) != 3:
+                    continue
+                reference = coloraide.Color("oklch", [float(c) for c in coords])
+                expected = reference.convert("srgb").coords()
+                actual = colormath.oklch_to_srgb([float(c) for c in coords])
+                assert all(abs(a - b) < 1e-12 for a, b in zip(actual, expected))
+            hexes.update(theme.get_colors_for_mode(dark).values())
+            for value in theme.get_source_colors(dark).values():
+                lch, alpha = colormath.parse_oklch(value)
+                reference = coloraide.Color("oklch", lch).convert("srgb")
+                expected = reference.fit(method="oklch-chroma").coords()
+                assert colormath.to_hex(colormath.gamut_map(lch), alpha) == (
+                    colormath.to_hex(expected, alpha)
+                )
+
+    # Translucent tokens compile to Qt's #aarrggbb, which coloraide reads differently
+    hexes = sorted(color for color in hexes if len(color) == 7)
+    for color in hexes:
+        reference = coloraide.Color(color).convert("oklch")
+        lightness, chroma, hue = colormath.srgb_to_oklch(colormath.parse_hex(color)[0])
+        assert abs(lightness - reference["lightness"]) < 1e-12
+        assert abs(chroma - reference["chroma"]) < 1e-12
+
+    def reference_rgba(color):
+        return colormath.to_rgba(color.convert("srgb")[:3], color.alpha())
+
+    for start, end in zip(hexes, reversed(hexes)):
+        for amount in (0.125, 0.5, 0.875):
+            expected = coloraide.Color(start).mix(end, amount, space="oklch")
+            actual = colormath.mix(
+                colormath.parse_hex(start), colormath.parse_hex(end), amount
+            )
+            assert colormath.to_rgba(*actual) == reference_rgba(expected)
+    transparent = coloraide.Color(hexes[0]).set("alpha", 0)
+    expected = transparent.mix(hexes[-1], 0.25, space="oklch")
+    actual = colormath.mix(
+        (colormath.parse_hex(hexes[0])[0], 0.0), colormath.parse_hex(hexes[-1]), 0.25
+    )
+    assert colormath.to_rgba(*actual) == reference_rgba(expected)
+    print("✓ Color math matches coloraide on every shipped token")
+
+
+def test_gamut_mapping():
+    """Test that out-of-gamut and translucent tokens compile faithfully"""
+    import numpy as np
+    from themes import ThemeManager
+    from themes import color as colormath
+    from themes.oklab import _to_srgb, gamut_map, linear_srgb_to_oklch
+    from themes.oklab import hex_to_srgb, parse_unique_colors, srgb_to_linear
+
+    teal = "oklch(0.647 0.196 163)"
+    lch, _ = colormath.parse_oklch(teal)
+    srgb = colormath.oklch_to_srgb(lch)
+    assert not colormath.in_srgb_gamut(srgb)
+    mapped = colormath.gamut_map(lch)
+    clipped = [min(1.0, max(0.0, c)) for c in srgb]
+    assert colormath.in_srgb_gamut(mapped)
+    lightness, chroma, hue = colormath.srgb_to_oklch(mapped)
+    assert abs(lightness - lch[0]) < 0.01 and chroma < lch[1]
+    assert abs(hue - lch[2]) < abs(colormath.srgb_to_oklch(clipped)[2] - lch[2])
+
+    assert colormath.compile_colors(["oklch(1 0 0)", "oklch(0 0 0)"]) == [
+        "#ffffff",
+        "#000000",
+    ]
+    assert colormath.compile_colors(["oklch(1 0 0 / 10%)"]) == ["#1affffff"]
+    assert colormath.parse_hex("#1affffff") == ([1.0, 1.0, 1.0], 26 / 255)
+    assert colormath.compile_colors(["#123456", "oklch(bad)"]) == [
+        "#123456",
+        "#000000",
+    ]
+
+    neutral = ThemeManager().get_theme("neutral")
+    dark = neutral.get_colors_for_mode(True)
+    assert dark["border"] == "#1affffff" and dark["input"] == "#26ffffff"
+    assert ThemeManager().get_theme("teal").get_colors_for_mode(False)[
+        "primary"
+    ] == colormath.to_hex(mapped)
+
+    sources = [
+        colormath.parse_oklch(value)[0]
+        for dark_mode in (False, True)
+        for value in neutral.get_source_colors(dark_mode).values()
+    ]
+    batch = gamut_map(np.array(sources))
+    assert [colormath.to_hex(rgb) for rgb in batch.tolist()] == [
+        colormath.to_hex(colormath.gamut_map(lch)) for lch in sources
+    ]
+
+    # The batch conversions match themes.color, gray hues included
+    compiled = list(neutral.get_colors_for_mode(False).values())
+    compiled += list(
+        ThemeManager().get_theme("teal").get_colors_for_mode(True).values()
+    )
+    rgb = [colormath.parse_hex(value)[0] for value in compiled]
+    expected = np.array([colormath.srgb_to_oklch(channels) for channels in rgb])
+    actual = linear_srgb_to_oklch(srgb_to_linear(np.array(rgb)))
+    assert np.allclose(actual, expected, atol=1e-12, equal_nan=True)
+    assert np.isnan(actual[:, 2]).any()
+    # Translucent palette colors are #aarrggbb, not #rrggbb plus a digit pair
+    assert np.allclose(hex_to_srgb(["#1affffff", "#fff"]), 1.0)
+    values, _ = parse_unique_colors(["#80ff0000"])
+    assert np.isclose(values[0, 3], 128 / 255)
+    assert np.allclose(values[0, :3], colormath.srgb_to_oklch([1.0, 0.0, 0.0]))
+    assert np.allclose(_to_srgb(actual), rgb, atol=1e-12)
+    print("✓ Out-of-gamut and translucent tokens compile faithfully")
+
+
+def test_theme_bundle():
+    """Test that bundled themes compile in parallel and load lazily"""
+    import os
+    import tempfile
+    from PyQt6.QtWidgets import QWidget
+    from styles import style_manager
+    from themes import ThemeManager, bundle
+    from themes.generator import generate_theme
+    from widgets import PrimaryButton
+
+    definitions = {
+        "acme": {"seed": "#2563eb"},
+        "globex": {"extends": "violet", "light": {"primary": "#123456"}},
+        "initech": {"seed": "oklch(0.6 0.2 30)", "dark": {"background": "#000000"}},
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        inline = os.path.join(directory, "inline.bundle")
+        pooled = os.path.join(directory, "pooled.bundle")
+        assert bundle.build_bundle(definitions, inline, workers=0) == 3
+        chunk_size = bundle.CHUNK_SIZE
+        bundle.CHUNK_SIZE = 1
+        try:
+            bundle.build_bundle(definitions, pooled, workers=2)
+        finally:
+            bundle.CHUNK_SIZE = chunk_size
+        with open(inline, "rb") as a, open(pooled, "rb") as b:
+            assert a.read() == b.read()
+
+        with bundle.ThemeBundle(inline) as themes:
+            assert len(themes) == 3 and "acme" in themes and "hooli" not in themes
+            acme = themes.theme("acme")
+            assert not acme._records
+            generated = generate_theme("#2563eb", "acme")
+            expected = generated.get_stylesheet(False)
+            stylesheet = acme.get_stylesheet(False)
+            assert list(acme._records) == [False]
+            assert stylesheet == bundle.minify_stylesheet(expected)
+            assert len(stylesheet) < len(expected) and "/*" not in stylesheet
+            assert acme.get_colors_for_mode(True) == generated.get_colors_for_mode(True)
+
+            globex = themes.get_colors("globex")
+            violet = ThemeManager().get_theme("violet").get_colors_for_mode(False)
+            assert globex["primary"] == "#123456"
+            assert globex["background"] == violet["background"]
+            assert themes.get_colors("initech", True)["background"] == "#000000"
+
+            # Minified and full stylesheets paint the same
+            app = get_application()
+            images = []
+            for sheet in (expected, stylesheet):
+                container = QWidget()
+                container.setStyleSheet(sheet)
+                button = PrimaryButton("Primary", container)
+                button.resize(button.sizeHint())
+                app.processEvents()
+                images.append(button.grab().toImage())
+            assert images[0] == images[1]
+
+            # Overrides recompile from the bundled sources
+            acme.set_token("primary", "#00ff00", dark_mode=False)
+            assert "#00ff00" in acme.get_stylesheet(False)
+            assert acme.get_colors_for_mode(False)["primary-hover"] != (
+                generated.get_colors_for_mode(False)["primary-hover"]
+            )
+
+            style_manager.set_application(app)
+            style_manager.theme_manager.register_theme(themes.theme("initech"))
+            style_manager.apply_theme("initech")
+            assert (
+                style_manager.get_colors()["primary"]
+                == themes.get_colors("initech")["primary"]
+            )
+            style_manager.apply_theme("neutral")
+
+    print("✓ Bundled themes compile in parallel and load lazily")
+
+
+def test_packed_palette():
+    """Test that compiled palettes are packed by token id behind a dict view"""
+    import sys
+    from PyQt6.QtGui import QColor
+    from styles import style_manager
+    from themes import ThemeManager
+    from themes.palette import ColorToken, Palette, TOKEN_NAMES
+
+    assert ColorToken.SIDEBAR_PRIMARY_FOREGROUND.token == ("sidebar-primary-foreground")
+    manager = ThemeManager()
+    rose = manager.get_theme("rose")
+    for theme in (rose, manager.get_theme("neutral")):
+        for dark in (False, True):
+            colors = theme.get_colors_for_mode(dark)
+            reference = dict(theme._compile_colors(dark).values)
+            assert isinstance(colors, Palette) and colors == reference
+            assert set(colors) == set(TOKEN_NAMES) and not colors._extra
+            for token, value in reference.items():
+                assert QColor.fromRgba(colors.rgba(token)) == QColor(value)
+    dark = manager.get_theme("neutral").get_colors_for_mode(True)
+    assert dark["border"] == "#1affffff"
+    assert dark.rgba(ColorToken.BORDER) == 0x1AFFFFFF
+    size = sys.getsizeof(dark._rgba) + sys.getsizeof(dark)
+    assert size < sys.getsizeof(dict(dark)) / 4
+
+    # Unpackable values and unknown tokens are kept as given
+    palette = Palette({"primary": "#FFF", "brand": "#123456", "ring": "#ff0000"})
+    assert palette["primary"] == "#FFF" and palette.rgba("primary") is None
+    assert palette.get("brand") == "#123456" and "muted" not in palette
+    palette.set("ring", None)
+    assert dict(palette) == {"primary": "#FFF", "brand": "#123456"}
+
+    light, blue = rose.get_colors_for_mode(False), manager.get_theme("blue")
+    changed = light.diff(blue.get_colors_for_mode(False))
+    assert changed == {
+        token
+        for token in TOKEN_NAMES
+        if light[token] != blue.get_colors_for_mode(False)[token]
+    }
+    assert "primary" in changed and "background" not in changed
+    assert light.diff(Palette(light)) == set()
+    assert light.diff(palette) >= {"brand", "primary", "ring", "background"}
+
+    # Token edits update the packed palette in place
+    rose.set_token("primary", "#00ff00", dark_mode=False)
+    assert light is rose.get_colors_for_mode(False)
+    assert light["primary"] == "#00ff00"
+    assert light["primary-hover"] != blue.get_colors_for_mode(False)["primary-hover"]
+    rose.reset_tokens()
+    assert light == dict(rose._compile_colors(False).values)
+
+    # Stylesheet color slots read packed colors by token id
+    template = rose.get_stylesheet_template()
+    for index in template.token_slots["primary"]:
+        assert template.color_ids[index] == ColorToken.PRIMARY
+    assert template._fill(index, light, {}) == light["primary"]
+
+    app = get_application()
+    style_manager.set_application(app)
+    style_manager.apply_theme("rose")
+    background = style_manager.get_qcolor("background")
+    style_manager.apply_theme("blue")
+    assert style_manager.get_qcolor("background") is background
+    assert style_manager.get_qcolor("primary") == QColor(
+        blue.get_colors_for_mode(False)["primary"]
+    )
+    assert app.palette().color(app.palette().ColorRole.Highlight) == (
+        style_manager.get_qcolor("primary")
+    )
+    style_manager.apply_theme("neutral")
+
+    print("✓ Compiled palettes are packed by token id")
+
+
+def test_chart_decimation():
+    """Test that charts decimate large series and cache the plot layer"""
+    import numpy as np
+    from styles import style_manager
+    from widgets import ShadcnChart
+    from widgets.charts import ChartSeries, minmax_envelope
+
+    app = get_application()
+    style_manager.set_application(app)
+    style_manager.apply_theme("blue")
+
+    rng = np.random.default_rng(7)
+    y = np.cumsum(rng.standard_normal(200_000))
+    y[5000:5100] = np.nan
+    series = ChartSeries(y)
+    assert len(series.levels) > 2
+    # Pyramid envelopes match a direct reduction up to one block per column
+    _, low, high = series.envelope(0, len(y) - 1, 400)
+    edges = np.clip(np.ceil(np.linspace(0, len(y) - 1, 401)), 0, len(y))
+    exact_low, exact_high = minmax_envelope(y, y, edges.astype(np.intp))
+    assert np.nanmax(np.abs(high - exact_high)) < 0.1 * np.ptp(y[~np.isnan(y)])
+    assert np.nanmin(low) == np.nanmin(exact_low)
+    assert np.nanmax(high) == np.nanmax(exact_high)
+    # Zoomed in far enough, every sample is drawn
+    x, low, high = series.envelope(1000, 1100, 400)
+    assert low is high and x[0] == 999 and x[-1] == 1100
+
+    edges = np.array([0, 2, 2, 5])
+    low, high = minmax_envelope(np.arange(5.0), np.arange(5.0), edges)
+    assert np.isnan(low[1]) and low[2] == 2 and high[2] == 4
+
+    chart = ShadcnChart()
+    chart.resize(600, 300)
+    chart.add_series(y)
+    chart.add_series(np.sin(np.arange(len(y)) / 5000), kind="area")
+    chart.show()
+    app.processEvents()
+    chart.repaint()
+    layer = chart._layer
+    chart.repaint()
+    assert chart._layer is layer
+
+    views = []
+    chart.view_changed.connect(lambda x0, x1: views.append((x0, x1)))
+    chart.set_view(-50_000, 10_000)
+    assert chart.view() == (0, 60_000) and views
+    chart.repaint()
+    assert chart._layer is not layer
+    chart.set_view(100, 101)
+    assert chart.view()[1] - chart.view()[0] == 4
+
+    image = chart.grab().toImage()
+    primary = style_manager.get_qcolor("chart-1").rgb()
+    assert any(
+        image.pixel(column, row) == primary
+        for column in range(0, image.width(), 2)
+        for row in range(image.height())
+    )
+    chart.reset_view()
+    assert chart.view() == (0, len(y) - 1)
+    chart.close()
+
+    print("✓ Charts decimate large series and cache the plot layer")
+
+
+def test_streaming_chart():
+    """Test that streaming charts buffer samples and draw only new ones"""
+    import threading
+    import time
+    import numpy as np
+    from PyQt6.QtCore import QTimer
+    from styles import style_manager
+    from styles.animation import animation_clock
+    from widgets import ShadcnStreamingChart
+    from widgets.charts import RingBuffer
+
+    ring = RingBuffer(2, 5)
+    ring.append([[1, 2, 3], [4, 5, 6]])
+    ring.append([[7, 8, 9, 10], [11, 12, 13, 14]])
+    start, samples = ring.read(0, 100)
+    assert ring.count == 7 and start == 2
+    assert samples.tolist() == [[3, 7, 8, 9, 10], [6, 11, 12, 13, 14]]
+    assert ring.read(5, 6)[1].tolist() == [[9], [13]]
+    ring.append(np.arange(2 * 12).reshape(2, 12))
+    assert ring.read(0, ring.count)[1][0].tolist() == [7, 8, 9, 10, 11]
+
+    app = get_application()
+    style_manager.set_application(app)
+    style_manager.apply_theme("blue")
+    chart = ShadcnStreamingChart(series=8, capacity=20_000, window=5_000)
+    chart.resize(500, 200)
+    chart.set_y_range((-20, 20))
+    chart.show()
+    app.processEvents()
+    # A shown chart without new samples schedules no frames
+    clock = animation_clock()
+    assert clock.active_count("stream") == 0
+    assert not any(timer.isActive() for timer in chart.findChildren(QTimer))
+    nbytes = chart.buffer.nbytes
+    paints = []
+    original_paint = chart.paintEvent
+
+    def count_paint(event):
+        paints.append(1)
+        original_paint(event)
+
+    chart.paintEvent = count_paint
+
+    done = threading.Event()
+
+    def produce():
+        rng = np.random.default_rng(3)
+        while not done.is_set():
+            chart.append(rng.standard_normal((8, 16)))
+            time.sleep(0.001)
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    started = time.monotonic()
+    while time.monotonic() - started < 0.5:
+        app.processEvents()
+    done.set()
+    producer.join()
+    elapsed = time.monotonic() - started
+    assert chart.buffer.count > 1000 and chart.buffer.nbytes == nbytes
+    frames = elapsed * 1000 / clock.frame_interval()
+    assert 0 < len(paints) <= frames + 2
+
+    # Once every sample is drawn, the chart leaves the clock
+    started = time.monotonic()
+    while clock.active_count("stream") and time.monotonic() - started < 1:
+        app.processEvents()
+    assert clock.active_count("stream") == 0
+    assert chart._drawn == chart.buffer.count
+
+    # New samples scroll the cached layer instead of redrawing it
+    chart.repaint()
+    layer, full_renders = chart._layer, chart.full_renders
+    for _ in range(5):
+        chart.append(np.zeros((8, 40)))
+        chart.repaint()
+    assert chart._layer is layer and chart.full_renders == full_renders
+    chart.append(np.full((8, 40), 100.0))
+    chart.set_y_range(None)
+    chart.repaint()
+    assert chart._y_range[1] > 100
+    chart.close()
+
+    print(f"✓ Streaming chart painted {len(paints)} frames in {elapsed:.2f} s")
+
+
+def test_sparkline():
+    """Test that sparklines render once per data version, size and color"""
+    import time
+    import numpy as np
+    from PyQt6.QtCore import QModelIndex
+    from PyQt6.QtGui import QStandardItem, QStandardItemModel
+    from PyQt6.QtWidgets import QTableView
+    from styles import style_manager
+    from widgets import ShadcnSparkline, ShadcnSparklineDelegate, SparklineData
+    from widgets.charts import SPARKLINE_ROLE, sparkline_pixmap
+
+    app = get_application()
+    style_manager.set_application(app)
+    style_manager.apply_theme("blue")
+
+    data = SparklineData(np.sin(np.linspace(0, 20, 50_000)))
+    first = sparkline_pixmap(data, 100, 24, 1.0)
+    assert first.width() == 100 and not first.toImage().isNull()
+    assert sparkline_pixmap(data, 100, 24, 1.0).cacheKey() == first.cacheKey()
+    assert sparkline_pixmap(data, 100, 24, 2.0).width() == 200
+    key = data.key
+    data.set_values(np.cos(np.linspace(0, 20, 50_000)))
+    assert data.key != key
+    assert sparkline_pixmap(data, 100, 24, 1.0).cacheKey() != first.cacheKey()
+    flat = sparkline_pixmap(SparklineData([1.0, 1.0, np.nan, 1.0]), 40, 10, 1.0)
+    assert flat.width() == 40
+
+    widget = ShadcnSparkline(np.arange(100.0))
+    widget.resize(120, 32)
+    widget.grab()
+    widget.set_values([3, 1, 2])
+    widget.grab()
+
+    rng = np.random.default_rng(5)
+    model = QStandardItemModel(5000, 2)
+    for row in range(5000):
+        model.setItem(row, 0, QStandardItem(f"SYM{row}"))
+        item = QStandardItem()
+        item.setData(SparklineData(rng.standard_normal(390).cumsum()), SPARKLINE_ROLE)
+        model.setItem(row, 1, item)
+    assert isinstance(model.index(0, 1).data(SPARKLINE_ROLE), SparklineData)
+    assert model.index(0, 0, QModelIndex()).data(SPARKLINE_ROLE) is None
+
+    table = QTableView()
+    table.setItemDelegateForColumn(1, ShadcnSparklineDelegate(table))
+    table.setModel(model)
+    table.setColumnWidth(1, 140)
+    table.resize(400, 600)
+    table.show()
+    app.processEvents()
+    before = sum(style_manager.assets.stats().values())
+    scroll = table.verticalScrollBar()
+    frames = []
+    for position in range(0, scroll.maximum(), scroll.maximum() // 40):
+        scroll.setValue(position)
+        started = time.perf_counter()
+        table.viewport().repaint()
+        frames.append(time.perf_counter() - started)
+    # Scrolling back only hits the cache
+    entries = sum(style_manager.assets.stats().values())
+    assert entries > before
+    scroll.setValue(0)
+    started = time.perf_counter()
+    table.viewport().repaint()
+    cached = time.perf_counter() - started
+    assert sum(style_manager.assets.stats().values()) == entries
+    table.close()
+
+    print(
+        f"✓ Sparkline table frames {max(frames) * 1000:.1f} ms, "
+        f"cached {cached * 1000:.1f} ms"
+    )
+
+
+def test_heatmap():
+    """Test that heatmaps color values through a cached token ramp in place"""
+    import time
+    import numpy as np
+    from PyQt6 import sip
+    from PyQt6.QtCore import QPointF
+    from styles import style_manager
+    from themes.oklab import oklch_ramp
+    from widgets import ShadcnHeatmap
+    from widgets.heatmap import colormap_lut, map_colors
+
+    ramp = oklch_ramp([[1.0, 1.0, 1.0, 1.0], [0.0, 0.0, 1.0, 1.0]], 3)
+    assert np.allclose(ramp[0], [1, 1, 1, 1]) and np.allclose(ramp[-1], [0, 0, 1, 1])
+    lut = colormap_lut((0xFFFFFFFF, 0xFF0000FF))
+    assert colormap_lut((0xFFFFFFFF, 0xFF0000FF)) is lut
+    assert lut[0] == 0xFFFFFFFF and lut[-2] == 0xFF0000FF and lut[-1] == 0
+    colors = map_colors(np.array([0.0, 0.5, 1.0, 7.0, np.nan]), lut, (0.0, 1.0))
+    assert colors[0] == lut[0] and colors[2] == colors[3] == lut[-2]
+    assert colors[4] == 0 and colors[1] not in (lut[0], lut[-2])
+
+    app = get_application()
+    style_manager.set_application(app)
+    style_manager.apply_theme("blue")
+    matrix = np.random.default_rng(2).random((4096, 4096), dtype=np.float32)
+    heatmap = ShadcnHeatmap(matrix)
+    heatmap.resize(800, 600)
+    heatmap.show()
+    app.processEvents()
+    started = time.perf_counter()
+    heatmap.set_data(matrix)
+    heatmap.repaint()
+    full = time.perf_counter() - started
+    assert heatmap._buffer.shape == (600, 800) and heatmap.value_range()[1] <= 1.0
+    # The image paints straight from the buffer the colors are written to
+    assert int(sip.voidptr(heatmap._image.constBits())) == heatmap._buffer.ctypes.data
+
+    heatmap.set_value_range((0.0, 1.0))
+    heatmap.repaint()
+    renders = heatmap.full_renders
+    started = time.perf_counter()
+    heatmap.update_region(0, 0, np.zeros((1024, 1024)))
+    heatmap.repaint()
+    region = time.perf_counter() - started
+    assert heatmap.full_renders == renders
+    corner = heatmap.grab().toImage().pixelColor(10, 10)
+    assert corner == style_manager.get_qcolor("muted")
+    heatmap.set_value_range(None)
+    heatmap.update_region(0, 0, np.full((4, 4), 5.0))
+    heatmap.repaint()
+    assert heatmap.full_renders == renders + 1 and heatmap.value_range()[1] == 5.0
+
+    style_manager.apply_theme("zinc")
+    heatmap.repaint()
+    assert heatmap.full_renders == renders + 2
+    assert heatmap.cell_at(QPointF(400, 300)) == (2048, 2048)
+    heatmap.close()
+
+    print(
+        f"✓ Heatmap of 4096x4096 in {full * 1000:.1f} ms, "
+        f"region update {region * 1000:.1f} ms"
+    )
+
+
+def test_histogram():
+    """Test that histograms re-bin and count appended samples incrementally"""
+    import time
+    import numpy as np
+    from styles import style_manager
+    from widgets import ShadcnBarChart, ShadcnHistogram
+    from widgets.charts import Histogram
+
+    rng = np.random.default_rng(4)
+    samples = rng.lognormal(3.0, 0.6, 1_000_000)
+    histogram = Histogram(samples, bins=40)
+    for bins in (40, 7, 333):
+        histogram.set_bins(bins)
+        expected = np.histogram(samples, bins=histogram.edges)[0]
+        assert (histogram.counts == expected).all()
+    # Samples within the range are counted into the existing bins
+    counts = histogram.counts
+    more = samples[:1000] * 0.99
+    histogram.append(np.concatenate((more, [np.nan])))
+    assert histogram.counts is counts and len(histogram) == 1_001_000
+    samples = np.concatenate((samples, more))
+    assert (counts == np.histogram(samples, bins=histogram.edges)[0]).all()
+    histogram.append([samples.max() * 2])
+    assert histogram.value_range()[1] == samples.max() * 2
+    assert histogram.counts.sum() == len(histogram)
+    fixed = Histogram([1, 2, 3, 50], bins=2, value_range=(0, 4))
+    assert fixed.counts.tolist() == [1, 2]
+    # Samples outside a fixed range count once the range is fitted again
+    fixed = Histogram(np.arange(100.0), 10, (0, 50))
+    fixed.append([500.0])
+    fixed.set_value_range(None)
+    expected = np.histogram(np.append(np.arange(100.0), 500.0), bins=10)
+    assert fixed.value_range() == (0.0, 500.0)
+    assert np.allclose(fixed.edges, expected[1])
+    assert (fixed.counts == expected[0]).all() and fixed.counts.sum() == 101
+
+    app = get_application()
+    style_manager.set_application(app)
+    style_manager.apply_theme("blue")
+    chart = ShadcnHistogram(samples, bins=50)
+    chart.resize(600, 300)
+    chart.show()
+    app.processEvents()
+    builds = chart.geometry_builds
+    style_manager.apply_theme("zinc")
+    chart.repaint()
+    assert chart.geometry_builds == builds
+    frames = []
+    for bins in range(10, 2000, 97):
+        started = time.perf_counter()
+        chart.set_bins(bins)
+        chart.repaint()
+        frames.append(time.perf_counter() - started)
+    assert chart.geometry_builds == builds + len(frames)
+    chart.close()
+
+    bars = ShadcnBarChart()
+    bars.set_series([[3, -1, 4], [1, 5, 9]])
+    bars.resize(300, 200)
+    image = bars.grab().toImage()
+    assert not image.isNull() and len(bars._geometry[1]) == 2
+
+    print(f"✓ Histogram re-binned in at most {max(frames) * 1000:.1f} ms")
+
+
 if __name__ == "__main__":
     test_application()
+    test_painted_button()
+    test_cached_label()
+    test_indicator_cache()
+    test_icon_cache()
+    test_dpr_watcher()
+    test_animation_clock()
+    test_state_ramps()
+    test_derived_state_colors()
+    test_theme_crossfade()
+    test_theme_picker()
+    test_debounced_theme_select()
+    test_live_token_override()
+    test_metric_tokens()
+    test_theme_hot_reload()
+    test_theme_generator()
+    test_contrast_audit()
+    test_color_math_parity()
+    test_gamut_mapping()
+    test_theme_bundle()
+    test_packed_palette()
+    test_chart_decimation()
+    test_streaming_chart()
+    test_sparkline()
+    test_heatmap()
+    test_histogram()
     print("✓ All tests passed!")
@@ -76,6 +76,10 @@ class ThemeManager:
         """Set dark mode state"""
         self.current_dark_mode = dark
 
+    def register_theme(self, theme: Theme):
+        """Add a theme, e.g. a generated one, under its name"""
+        self.themes[theme.name] = theme
+
     def get_theme(self, theme_name: str) -> Optional[Theme]:
         """Get a theme by name"""
         return self.themes.get(theme_name)
@@ -0,0 +1,317 @@
+"""
+Contrast audit of foreground/background token pairs across many palettes
+
+Every palette and pair is evaluated at once as NumPy arrays, giving the
+WCAG 2 contrast ratio and the APCA lightness contrast (Lc) of each pair.
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from themes.oklab import gamut_map, parse_unique_colors
+
+# (foreground, background) pairs drawn as text on a surface
+CONTRAST_PAIRS: Tuple[Tuple[str, str], ...] = (
+    ("foreground", "background"),
+    ("card-foreground", "card"),
+    ("popover-foreground", "popover"),
+    ("primary-foreground", "primary"),
+    ("secondary-foreground", "secondary"),
+    ("muted-foreground", "muted"),
+    ("muted-foreground", "background"),
+    ("accent-foreground", "accent"),
+    ("destructive-foreground", "destructive"),
+    ("sidebar-foreground", "sidebar"),
+    ("sidebar-primary-foreground", "sidebar-primary"),
+    ("sidebar-accent-foreground", "sidebar-accent"),
+)
+
+# WCAG 2 AA for body text, and the APCA Lc recommended for it
+WCAG_AA = 4.5
+APCA_BODY = 60.0
+
+# APCA 0.0.98G-4g constants
+_APCA_COEFFICIENTS = np.array([0.2126729, 0.7151522, 0.0721750])
+_APCA_BLACK_THRESHOLD = 0.022
+_APCA_BLACK_CLAMP = 1.414
+_APCA_SCALE = 1.14
+_APCA_OFFSET = 0.027
+_APCA_LOW_CLIP = 0.1
+
+# Bisection steps used to find the smallest passing lightness shift
+_ADJUST_STEPS = 16
+
+
+class ContrastFailure:
+    """A pair in one palette that is below the contrast thresholds"""
+
+    def __init__(
+        self, palette: int, foreground: str, background: str, wcag: float, apca: float
+    ):
+        self.palette = palette
+        self.foreground = foreground
+        self.background = background
+        self.wcag = wcag
+        self.apca = apca
+
+    def __repr__(self) -> str:
+        return (
+            f"ContrastFailure({self.palette}, {self.foreground} on "
+            f"{self.background}, wcag={self.wcag:.2f}, apca={self.apca:.1f})"
+        )
+
+
+class ContrastReport:
+    """WCAG 2 ratios and APCA Lc values of every pair in every palette
+
+    ``wcag`` and ``apca`` have one row per palette and one column per pair.
+    Pairs with a token missing from a palette are NaN and never fail.
+    """
+
+    def __init__(
+        self,
+        pairs: Sequence[Tuple[str, str]],
+        wcag: np.ndarray,
+        apca: np.ndarray,
+        min_wcag: Optional[float],
+        min_apca: Optional[float],
+    ):
+        self.pairs = tuple(pairs)
+        self.wcag = wcag
+        self.apca = apca
+        self.min_wcag = min_wcag
+        self.min_apca = min_apca
+
+    @property
+    def failing(self) -> np.ndarray:
+        """Boolean mask of the pairs below either threshold"""
+        mask = np.zeros(self.wcag.shape, dtype=bool)
+        if self.min_wcag is not None:
+            mask |= self.wcag < self.min_wcag
+        if self.min_apca is not None:
+            mask |= np.abs(self.apca) < self.min_apca
+        return mask
+
+    @property
+    def passed(self) -> bool:
+        """Check if every pair meets the thresholds"""
+        return not self.failing.any()
+
+    def failures(self) -> List[ContrastFailure]:
+        """Get every failing pair, ordered by palette"""
+        return [
+            ContrastFailure(
+                int(palette),
+                *self.pairs[pair],
+                float(self.wcag[palette, pair]),
+                float(self.apca[palette, pair]),
+            )
+            for palette, pair in zip(*np.nonzero(self.failing))
+        ]
+
+
+def _pair_colors(
+    palettes: Sequence[Dict[str, str]], pairs: Sequence[Tuple[str, str]]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Get (palettes, pairs, 7) arrays of the foregrounds and backgrounds
+
+    Each color is OKLCH, alpha and its gamut mapped sRGB, computed once per
+    distinct color.
+    """
+    tokens = list(dict.fromkeys(token for pair in pairs for token in pair))
+    colors: List[Optional[str]] = []
+    for palette in palettes:
+        colors.extend(map(palette.get, tokens))
+    values, indices = parse_unique_colors(colors)
+    values = np.concatenate((values, gamut_map(values[:, :3])), axis=1)
+    values = values[indices].reshape(len(palettes), len(tokens), 7)
+    index = {token: position for position, token in enumerate(tokens)}
+    foreground = [index[pair[0]] for pair in pairs]
+    background = [index[pair[1]] for pair in pairs]
+    return values[:, foreground], values[:, background]
+
+
+def _composite(foreground: np.ndarray, alpha: np.ndarray, background: np.ndarray):
+    """Blend translucent foregrounds over their backgrounds in sRGB"""
+    return foreground * alpha[..., None] + background * (1.0 - alpha[..., None])
+
+
+def wcag_contrast(foreground: np.ndarray, background: np.ndarray) -> np.ndarray:
+    """WCAG 2 contrast ratio of sRGB arrays with channels on the last axis"""
+
+    def luminance(srgb: np.ndarray) -> np.ndarray:
+        linear = np.where(
+            srgb <= 0.04045, srgb / 12.92, ((srgb + 0.055) / 1.055) ** 2.4
+        )
+        return linear @ np.array([0.2126, 0.7152, 0.0722])
+
+    first, second = luminance(foreground), luminance(background)
+    return (np.maximum(first, second) + 0.05) / (np.minimum(first, second) + 0.05)
+
+
+def apca_contrast(foreground: np.ndarray, background: np.ndarray) -> np.ndarray:
+    """APCA Lc of text on background sRGB arrays; negative for light text"""
+
+    def luminance(srgb: np.ndarray) -> np.ndarray:
+        y = (srgb**2.4) @ _APCA_COEFFICIENTS
+        return np.where(
+            y < _APCA_BLACK_THRESHOLD,
+            y + np.clip(_APCA_BLACK_THRESHOLD - y, 0.0, None) ** _APCA_BLACK_CLAMP,
+            y,
+        )
+
+    text, surface = luminance(foreground), luminance(background)
+    with np.errstate(invalid="ignore"):
+        normal = (surface**0.56 - text**0.57) * _APCA_SCALE
+        reverse = (surface**0.65 - text**0.62) * _APCA_SCALE
+    contrast = np.where(
+        surface > text,
+        np.where(normal < _APCA_LOW_CLIP, 0.0, normal - _APCA_OFFSET),
+        np.where(reverse > -_APCA_LOW_CLIP, 0.0, reverse + _APCA_OFFSET),
+    )
+    return contrast * 100.0
+
+
+def _contrast(
+    foreground: np.ndarray, background: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    surface = background[..., 4:]
+    text = _composite(foreground[..., 4:], foreground[..., 3], surface)
+    return wcag_contrast(text, surface), apca_contrast(text, surface)
+
+
+def audit_palettes(
+    palettes: Sequence[Dict[str, str]],
+    pairs: Sequence[Tuple[str, str]] = CONTRAST_PAIRS,
+    min_wcag: Optional[float] = WCAG_AA,
+    min_apca: Optional[float] = None,
+) -> ContrastReport:
+    """Measure the contrast of every pair in a list of source palettes
+
+    Palettes map tokens to ``oklch(...)`` or hex strings, as themes and the
+    theme generator define them. Pass ``min_apca`` to also require an APCA
+    Lc, or ``min_wcag=None`` to judge by APCA alone.
+    """
+    foreground, background = _pair_colors(palettes, pairs)
+    wcag, apca = _contrast(foreground, background)
+    return ContrastReport(pairs, wcag, apca, min_wcag, min_apca)
+
+
+def theme_palettes(themes=None) -> Tuple[List[Tuple[str, bool]], List[Dict[str, str]]]:
+    """Get the labels and source palettes of both modes of themes
+
+    Defaults to the shipped themes.
+    """
+    if themes is None:
+        from themes import ThemeManager
+
+        themes = ThemeManager().themes.values()
+    labels, palettes = [], []
+    for theme in themes:
+        for dark in (False, True):
+            labels.append((theme.name, dark))
+            palettes.append(theme.get_source_colors(dark))
+    return labels, palettes
+
+
+def audit_themes(
+    themes=None,
+    pairs: Sequence[Tuple[str, str]] = CONTRAST_PAIRS,
+    min_wcag: Optional[float] = WCAG_AA,
+    min_apca: Optional[float] = None,
+) -> Dict[Tuple[str, bool], List[ContrastFailure]]:
+    """Audit both modes of themes, returning failures by (theme name, dark)"""
+    labels, palettes = theme_palettes(themes)
+    report = audit_palettes(palettes, pairs, min_wcag, min_apca)
+    failures: Dict[Tuple[str, bool], List[ContrastFailure]] = {}
+    for failure in report.failures():
+        failures.setdefault(labels[failure.palette], []).append(failure)
+    return failures
+
+
+def _format(oklch: np.ndarray, alpha: float, darker: bool) -> str:
+    lightness, chroma, hue = oklch[:3].tolist()
+    # Gray has no hue, which themes.color reads as 0
+    hue = 0.0 if math.isnan(hue) else hue
+    # Round away from the background so the printed color still passes
+    lightness = math.floor(lightness * 1000) if darker else math.ceil(lightness * 1000)
+    lightness, chroma = lightness / 1000, math.floor(chroma * 1000) / 1000
+    if alpha < 1.0:
+        return f"oklch({lightness:.3f} {chroma:.3f} {hue:.3f} / {alpha * 100:g}%)"
+    return f"oklch({lightness:.3f} {chroma:.3f} {hue:.3f})"
+
+
+def adjust_palettes(
+    palettes: Sequence[Dict[str, str]],
+    pairs: Sequence[Tuple[str, str]] = CONTRAST_PAIRS,
+    min_wcag: Optional[float] = WCAG_AA,
+    min_apca: Optional[float] = None,
+    passes: int = 3,
+) -> List[Dict[str, str]]:
+    """Get copies of palettes with failing foregrounds shifted until they pass
+
+    Each failing foreground keeps its hue and moves away from its background
+    in lightness, toward black or white, by the smallest amount that meets
+    the thresholds; chroma fades along the way so the extremes are reachable.
+    Backgrounds are never changed. A foreground shared by several pairs is
+    moved by the largest shift they need, and palettes are re-audited for
+    up to ``passes`` rounds.
+    """
+    result = [dict(palette) for palette in palettes]
+    for _ in range(passes):
+        foreground, background = _pair_colors(result, pairs)
+        report = ContrastReport(
+            pairs, *_contrast(foreground, background), min_wcag, min_apca
+        )
+        rows, columns = np.nonzero(report.failing)
+        if not len(rows):
+            break
+
+        start = foreground[rows, columns]
+        surface = background[rows, columns]
+        start_lightness = start[:, 0]
+        # Keep the text's polarity when the extreme in that direction suffices
+        darker = start_lightness < surface[:, 0]
+
+        def candidates(t: np.ndarray, darker: np.ndarray) -> np.ndarray:
+            target = np.where(darker, 0.0, 1.0)
+            shifted = start.copy()
+            shifted[:, 0] = start_lightness + t * (target - start_lightness)
+            shifted[:, 1] = start[:, 1] * (1.0 - t)
+            shifted[:, 4:] = gamut_map(shifted[:, :3])
+            return shifted
+
+        def passing(t: np.ndarray, darker: np.ndarray) -> np.ndarray:
+            shifted = candidates(t, darker)
+            wcag, apca = _contrast(shifted, surface)
+            ok = np.ones(len(t), dtype=bool)
+            if min_wcag is not None:
+                ok &= wcag >= min_wcag
+            if min_apca is not None:
+                ok &= np.abs(apca) >= min_apca
+            return ok
+
+        # Flip polarity only if the other extreme passes and this one cannot
+        ones = np.ones(len(rows))
+        flip = ~passing(ones, darker) & passing(ones, ~darker)
+        darker = darker ^ flip
+        low, high = np.zeros(len(rows)), ones
+        for _ in range(_ADJUST_STEPS):
+            middle = (low + high) / 2
+            ok = passing(middle, darker)
+            high = np.where(ok, middle, high)
+            low = np.where(ok, low, middle)
+        adjusted = candidates(high, darker)
+
+        shifts: Dict[Tuple[int, str], Tuple[float, str]] = {}
+        for index, (row, column) in enumerate(zip(rows.tolist(), columns.tolist())):
+            key = (row, pairs[column][0])
+            shift = float(high[index])
+            if key not in shifts or shift > shifts[key][0]:
+                shifts[key] = (
+                    shift,
+                    _format(adjusted[index], start[index, 3], darker[index]),
+                )
+        for (row, token), (_, color) in shifts.items():
+            result[row][token] = color
+    return result
@@ -2,9 +2,140 @@
 Base theme classes for PyQt6 applications
 """
 
+import hashlib
 from abc import ABC, abstractmethod
-from typing import Dict
-import coloraide  # type: ignore
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Set, Tuple
+from themes import color as colormath
+from themes.palette import TOKEN_IDS, Palette, format_rgba
+from themes.tokens import (
+    METRIC_DERIVATIONS,
+    METRIC_TOKENS,
+    DerivedToken,
+    TokenGraph,
+    TokenValue,
+)
+
+Rgba = Tuple[int, int, int, int]
+
+# Tokens that get derived hover, pressed and disabled variants
+STATE_TOKEN_BASES = (
+    "background",
+    "primary",
+    "secondary",
+    "accent",
+    "muted",
+    "destructive",
+)
+
+# OKLCH lightness shift of the hover and pressed states, away from the
+# nearer end of the lightness range
+HOVER_LIGHTNESS = 0.04
+PRESSED_LIGHTNESS = 0.08
+
+# Disabled colors move this far towards the background and keep this much chroma
+DISABLED_BLEND = 0.5
+DISABLED_CHROMA = 0.5
+
+# Share of the background mixed into the ring color for focus rings
+FOCUS_RING_BLEND = 0.5
+
+# Interpolation steps between consecutive button states in a color ramp
+RAMP_STEPS = 8
+
+# Tokens of the base, hover and pressed state of each button variant; a base
+# of None is a transparent background that fades in towards the hover color
+BUTTON_STATE_TOKENS: Dict[str, Tuple[Optional[str], str, str]] = {
+    "default": ("background", "background-hover", "background-pressed"),
+    "primary": ("primary", "primary-hover", "primary-pressed"),
+    "secondary": ("secondary", "secondary-hover", "secondary-pressed"),
+    "outline": (None, "accent", "accent-pressed"),
+    "ghost": (None, "accent", "accent-pressed"),
+}
+
+
+@lru_cache(maxsize=256)
+def _oklch_lightness(color: str) -> float:
+    """Get the OKLCH lightness of a hex color"""
+    return colormath.srgb_to_oklch(colormath.parse_hex(color)[0])[0]
+
+
+# Separators of the token slots recorded in the stylesheet template
+_SLOT = "\x00"
+_SLOT_DEFAULT = "\x01"
+
+
+class _SlotRecorder(dict):
+    """Stands in for the colors while generating the stylesheet template
+
+    Every token lookup returns a marker instead of a color, so the
+    generated stylesheet records where each token is used.
+    """
+
+    def get(self, key, default=None):
+        return f"{_SLOT}{key}{_SLOT_DEFAULT}{default}{_SLOT}"
+
+    def __getitem__(self, key):
+        return self.get(key, "")
+
+
+class StylesheetTemplate:
+    """A stylesheet split into literal text and token slots
+
+    Slots of ``ColorToken`` tokens are resolved to token ids once, so
+    filling them reads the packed palette color directly. After a token
+    changes only the slots that use it are filled again.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        parts = text.split(_SLOT)
+        self.segments: List[str] = parts
+        self.slots: Dict[int, Tuple[str, str]] = {}
+        self.token_slots: Dict[str, List[int]] = {}
+        # Token id of each slot whose token is a ColorToken
+        self.color_ids: Dict[int, int] = {}
+        for index in range(1, len(parts), 2):
+            token, default = parts[index].split(_SLOT_DEFAULT, 1)
+            self.slots[index] = (token, default)
+            self.token_slots.setdefault(token, []).append(index)
+            if token in TOKEN_IDS:
+                self.color_ids[index] = TOKEN_IDS[token]
+
+    def _fill(
+        self, index: int, colors: Palette, metrics: Mapping[str, TokenValue]
+    ) -> str:
+        """Get the text of a slot, from the colors before the metrics"""
+        token_id = self.color_ids.get(index)
+        if token_id is not None:
+            rgba = colors.rgba(token_id)
+            if rgba is not None:
+                return format_rgba(rgba)
+        token, default = self.slots[index]
+        value = colors.get(token)
+        return str(metrics.get(token, default) if value is None else value)
+
+    def render(self, colors: Palette, metrics: Mapping[str, TokenValue]) -> List[str]:
+        """Fill every slot, returning the stylesheet as segments"""
+        segments = list(self.segments)
+        for index in self.slots:
+            segments[index] = self._fill(index, colors, metrics)
+        return segments
+
+    def update(
+        self,
+        segments: List[str],
+        colors: Palette,
+        metrics: Mapping[str, TokenValue],
+        tokens: Set[str],
+    ) -> bool:
+        """Refill the slots of changed tokens, returning if any were used"""
+        used = False
+        for token in tokens:
+            for index in self.token_slots.get(token, ()):
+                segments[index] = self._fill(index, colors, metrics)
+                used = True
+        return used
 
 
 class Theme(ABC):
@@ -23,225 +154,503 @@ class Theme(ABC):
 
 
 class ShadcnTheme(Theme):
-    """Base class for Shadcn-inspired themes"""
+    """Base class for Shadcn-inspired themes
+
+    Colors and metrics are design tokens in a TokenGraph: derived tokens
+    declare the tokens they are computed from, so overriding a token
+    recompiles exactly the tokens, ramps and stylesheet slots downstream.
+    """
 
     def __init__(self):
         self._current_dark_mode = False
+        self._palettes: Dict[bool, Palette] = {}
+        self._color_graphs: Dict[bool, TokenGraph] = {}
+        self._metric_graph: Optional[TokenGraph] = None
+        self._compiled_ramps: Dict[bool, Dict[str, List[Rgba]]] = {}
+        self._overrides: Dict[bool, Dict[str, str]] = {False: {}, True: {}}
+        self._metric_overrides: Dict[str, TokenValue] = {}
+        self._template: Optional[StylesheetTemplate] = None
+        self._stylesheet_segments: Dict[bool, List[str]] = {}
 
     @property
     def name(self) -> str:
         """Theme name - override in subclasses"""
         return "base"
 
+    def _raw_colors(self, dark_mode: bool) -> Dict[str, str]:
+        """Get the source colors of a mode with token overrides applied"""
+        raw_colors = getattr(self, "_dark_colors" if dark_mode else "_light_colors", {})
+        overrides = self._overrides[dark_mode]
+        if overrides:
+            raw_colors = {**raw_colors, **overrides}
+        return raw_colors
+
+    def get_source_colors(self, dark_mode: bool = False) -> Dict[str, str]:
+        """Get a copy of the uncompiled source colors of a mode, with overrides"""
+        return dict(self._raw_colors(dark_mode))
+
+    def fingerprint(self, dark_mode: bool = False) -> str:
+        """Get a stable hash of the theme's source colors for a mode"""
+        raw_colors = self._raw_colors(dark_mode)
+        source = f"{self.name}:{int(dark_mode)}:" + ";".join(
+            f"{key}={value}" for key, value in sorted(raw_colors.items())
+        )
+        return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
     def get_stylesheet(self, dark_mode: bool = False) -> str:
         """Generate stylesheet using OKLCH colors"""
-        colors = self.get_colors_for_mode(dark_mode)
-        return self._generate_stylesheet(colors)
-
-    def get_colors_for_mode(self, dark_mode: bool = False) -> Dict[str, str]:
-        """Get colors for the specified mode, converting OKLCH to hex"""
-        if dark_mode:
-            raw_colors = getattr(self, "_dark_colors", {})
-        else:
-            raw_colors = getattr(self, "_light_colors", {})
-
-        # Convert OKLCH colors to hex
-        converted_colors = {}
-        for key, value in raw_colors.items():
-            if value.startswith("oklch("):
-                converted_colors[key] = self._oklch_to_hex(value)
+        segments = self._stylesheet_segments.get(dark_mode)
+        if segments is None:
+            segments = self.get_stylesheet_template().render(
+                self.get_colors_for_mode(dark_mode), self.get_metrics()
+            )
+            self._stylesheet_segments[dark_mode] = segments
+        return "".join(segments)
+
+    def get_stylesheet_template(self) -> StylesheetTemplate:
+        """Get the stylesheet with its token lookups as fillable slots"""
+        if self._template is None:
+            self._template = StylesheetTemplate(
+                self._generate_stylesheet(_SlotRecorder())
+            )
+        return self._template
+
+    def get_metrics(self) -> Dict[str, TokenValue]:
+        """Get the radius, spacing, size and typography tokens in pixels"""
+        if self._metric_graph is None:
+            self._metric_graph = TokenGraph(
+                {**METRIC_TOKENS, **self._metric_overrides}, METRIC_DERIVATIONS
+            )
+        return self._metric_graph.values
+
+    def set_token(
+        self,
+        token: str,
+        value: Optional[TokenValue],
+        dark_mode: Optional[bool] = None,
+    ) -> Dict[bool, Set[str]]:
+        """Override a color or metric token, or remove the override with None
+
+        Only the derived tokens, ramps and stylesheet slots that depend on
+        the token are recompiled. Color overrides apply to both modes unless
+        one is given; metrics are shared by both modes. Returns the tokens
+        that changed in each mode.
+        """
+        if token in METRIC_TOKENS:
+            if value is None:
+                self._metric_overrides.pop(token, None)
+                value = METRIC_TOKENS[token]
             else:
-                converted_colors[key] = value
-
-        return converted_colors
-
-    def _oklch_to_hex(self, oklch_str: str) -> str:
-        """Convert OKLCH color string to hex format"""
-        try:
-            # Parse OKLCH values: oklch(L C H)
-            values = oklch_str.replace("oklch(", "").replace(")", "").split()
-            if len(values) != 3:
-                return "#000000"  # fallback
-
-            lightness = float(values[0])
-            c = float(values[1])
-            h = float(values[2])
-
-            # Convert OKLCH to sRGB using coloraide
-            color = coloraide.Color("oklch", [lightness, c, h])
-            rgb = color.convert("srgb")
-            r, g, b = rgb.coords()
-
-            # Convert to 0-255 range and create hex
-            r_int = max(0, min(255, int(r * 255)))
-            g_int = max(0, min(255, int(g * 255)))
-            b_int = max(0, min(255, int(b * 255)))
-
-            return f"#{r_int:02x}{g_int:02x}{b_int:02x}"
-
-        except Exception as e:
-            print(f"Error converting OKLCH color {oklch_str}: {e}")
-            return "#000000"  # fallback to black
-
-    def _generate_stylesheet(self, colors: Dict[str, str]) -> str:
-        """Generate the QSS stylesheet from colors"""
+                self._metric_overrides[token] = value
+            if self._metric_graph is None:
+                return {False: set(), True: set()}
+            changed = self._metric_graph.set(token, value)
+            for mode in (False, True):
+                self._refill_stylesheet(mode, changed)
+            return {False: set(changed), True: set(changed)}
+
+        modes = (False, True) if dark_mode is None else (dark_mode,)
+        changes = {}
+        for mode in modes:
+            if value is None:
+                self._overrides[mode].pop(token, None)
+            else:
+                self._overrides[mode][token] = str(value)
+            changes[mode] = self._recompile_token(mode, token)
+        return changes
+
+    def reset_tokens(self, dark_mode: Optional[bool] = None) -> Dict[bool, Set[str]]:
+        """Remove every token override"""
+        modes = (False, True) if dark_mode is None else (dark_mode,)
+        changes: Dict[bool, Set[str]] = {mode: set() for mode in modes}
+        for token in list(self._metric_overrides):
+            for mode, changed in self.set_token(token, None).items():
+                if mode in changes:
+                    changes[mode] |= changed
+        for mode in modes:
+            for token in list(self._overrides[mode]):
+                del self._overrides[mode][token]
+                changes[mode] |= self._recompile_token(mode, token)
+        return changes
+
+    def update_source_colors(
+        self, colors: Dict[bool, Dict[str, str]]
+    ) -> Dict[bool, Set[str]]:
+        """Replace the source colors of modes, recompiling only changed tokens"""
+        changes: Dict[bool, Set[str]] = {}
+        for mode, mode_colors in colors.items():
+            attribute = "_dark_colors" if mode else "_light_colors"
+            previous = getattr(self, attribute, {})
+            setattr(self, attribute, dict(mode_colors))
+            changes[mode] = set()
+            for token in previous.keys() | mode_colors.keys():
+                if previous.get(token) != mode_colors.get(token):
+                    changes[mode] |= self._recompile_token(mode, token)
+        return changes
+
+    def get_overrides(self, dark_mode: bool = False) -> Dict[str, TokenValue]:
+        """Get the color token overrides of a mode and the metric overrides"""
+        return {**self._overrides[dark_mode], **self._metric_overrides}
+
+    def _recompile_token(self, dark_mode: bool, token: str) -> Set[str]:
+        """Update the compiled colors of a mode after a token changed"""
+        palette = self._palettes.get(dark_mode)
+        if palette is None:
+            # Nothing compiled yet; it is built with the override on first use
+            return set()
+        graph = self._color_graphs.get(dark_mode)
+        if graph is None:
+            # Rebuilt from the palette for the first edit of a compiled mode
+            graph = TokenGraph(palette, self._color_derivations(), evaluated=palette)
+            self._color_graphs[dark_mode] = graph
+
+        value = self._raw_colors(dark_mode).get(token)
+        changed = graph.set(
+            token, None if value is None else self._convert_color(value)
+        )
+        if not changed:
+            return changed
+        for name in changed:
+            palette.set(name, graph.values.get(name))  # type: ignore[arg-type]
+
+        ramps = self._compiled_ramps.get(dark_mode)
+        if ramps:
+            for variant, tokens in BUTTON_STATE_TOKENS.items():
+                if changed.intersection(tokens):
+                    ramps.pop(variant, None)
+        self._refill_stylesheet(dark_mode, changed)
+        return changed
+
+    def _refill_stylesheet(self, dark_mode: bool, tokens: Set[str]):
+        """Refill the stylesheet slots of changed tokens, if it was built"""
+        segments = self._stylesheet_segments.get(dark_mode)
+        if segments is not None:
+            self.get_stylesheet_template().update(
+                segments,
+                self.get_colors_for_mode(dark_mode),
+                self.get_metrics(),
+                tokens,
+            )
+
+    def affects_stylesheet(self, tokens: Set[str]) -> bool:
+        """Check if any of the tokens is used by the stylesheet"""
+        token_slots = self.get_stylesheet_template().token_slots
+        return any(token in token_slots for token in tokens)
+
+    def get_colors_for_mode(self, dark_mode: bool = False) -> Palette:
+        """Get colors for the specified mode, converting OKLCH to hex
+
+        Compiled colors are kept packed in a ``Palette``; the token graph
+        used to derive them is only kept once a token is edited.
+        """
+        palette = self._palettes.get(dark_mode)
+        if palette is None:
+            palette = Palette(self._compile_colors(dark_mode).values)  # type: ignore
+            self._palettes[dark_mode] = palette
+        return palette
+
+    def _compile_colors(self, dark_mode: bool) -> TokenGraph:
+        """Convert the raw colors of a mode to hex and derive the state colors"""
+        raw_colors = self._raw_colors(dark_mode)
+
+        # Gamut map OKLCH colors to hex, converting each distinct color once
+        converted_colors = dict(
+            zip(raw_colors, colormath.compile_colors(raw_colors.values()))
+        )
+        return TokenGraph(converted_colors, self._color_derivations())
+
+    def _color_derivations(self) -> Dict[str, DerivedToken]:
+        """Declare the derived state colors and the tokens they depend on
+
+        Hover and pressed states shift OKLCH lightness towards the middle of
+        the range, disabled states fade towards the background and lose
+        chroma, and the focus ring mixes the ring into the background.
+        """
+        derived = {}
+        for token in STATE_TOKEN_BASES:
+            derived[f"{token}-hover"] = DerivedToken(
+                (token,), lambda base: self._shift_lightness(base, HOVER_LIGHTNESS)
+            )
+            derived[f"{token}-pressed"] = DerivedToken(
+                (token,), lambda base: self._shift_lightness(base, PRESSED_LIGHTNESS)
+            )
+            derived[f"{token}-disabled"] = DerivedToken(
+                (token, "background"), self._disabled_color
+            )
+        derived["focus-ring"] = DerivedToken(
+            ("ring", "background"),
+            lambda ring, background: self._mix_hex(ring, background, FOCUS_RING_BLEND),
+        )
+        return derived
+
+    def _shift_lightness(self, color: str, shift: float) -> str:
+        """Move the OKLCH lightness of a color away from the nearer extreme"""
+        lightness, chroma, hue = colormath.srgb_to_oklch(colormath.parse_hex(color)[0])
+        direction = -1.0 if lightness > 0.5 else 1.0
+        return colormath.to_hex(
+            colormath.oklch_to_srgb([lightness + direction * shift, chroma, hue])
+        )
+
+    def _disabled_color(self, color: str, background: str) -> str:
+        """Fade a color towards the background lightness and reduce its chroma"""
+        lightness, chroma, hue = colormath.srgb_to_oklch(colormath.parse_hex(color)[0])
+        background_lightness = _oklch_lightness(background)
+        lightness += (background_lightness - lightness) * DISABLED_BLEND
+        return colormath.to_hex(
+            colormath.oklch_to_srgb([lightness, chroma * DISABLED_CHROMA, hue])
+        )
+
+    def get_state_ramps(self, dark_mode: bool = False) -> Dict[str, List[Rgba]]:
+        """Get base to hover to pressed color ramps for each button variant
+
+        Each ramp is a lookup table of RGBA tuples interpolated in OKLCH:
+        index 0 is the base state, ``RAMP_STEPS`` the hover state and the
+        last entry the pressed state, so animations only index into it.
+        """
+        ramps = self._compiled_ramps.setdefault(dark_mode, {})
+        if len(ramps) < len(BUTTON_STATE_TOKENS):
+            # Built on first use, or rebuilt for variants a token change hit
+            colors = self.get_colors_for_mode(dark_mode)
+            for variant, tokens in BUTTON_STATE_TOKENS.items():
+                if variant not in ramps:
+                    ramps[variant] = self._build_ramp(colors, tokens)
+        return ramps
+
+    def _build_ramp(
+        self, colors: Dict[str, str], tokens: Tuple[Optional[str], str, str]
+    ) -> List[Rgba]:
+        """Interpolate a ramp through the colors of a variant's states"""
+        base_token, hover_token, pressed_token = tokens
+        hover = colormath.parse_hex(colors.get(hover_token, "#000000"))
+        pressed = colormath.parse_hex(colors.get(pressed_token, "#000000"))
+        if base_token is None:
+            base = (hover[0], 0.0)
+        else:
+            base = colormath.parse_hex(colors.get(base_token, "#000000"))
+
+        ramp = []
+        for start, end in ((base, hover), (hover, pressed)):
+            for step in range(RAMP_STEPS):
+                mixed = colormath.mix(start, end, step / RAMP_STEPS)
+                ramp.append(colormath.to_rgba(*mixed))
+        ramp.append(colormath.to_rgba(*pressed))
+        return ramp
+
+    def _mix_hex(self, start: str, end: str, amount: float) -> str:
+        """Blend two hex colors in OKLCH"""
+        mixed, _ = colormath.mix(
+            colormath.parse_hex(start), colormath.parse_hex(end), amount
+        )
+        return colormath.to_hex(mixed)
+
+    def _convert_color(self, value: str) -> str:
+        """Convert a source color to the hex form used in compiled palettes"""
+        return colormath.compile_colors([value])[0]
+
+    def _generate_stylesheet(self, tokens: Mapping[str, TokenValue]) -> str:
+        """Generate the QSS stylesheet from color and metric tokens"""
         return f"""
         /* Global styles */
         QWidget {{
-            color: {colors.get('foreground', '#0f172a')};
-            background-color: {colors.get('background', '#ffffff')};
+            color: {tokens.get('foreground', '#0f172a')};
+            background-color: {tokens.get('background', '#ffffff')};
         }}
 
         /* Main window background */
         QMainWindow, QWidget#MainWindow {{
-            background-color: {colors.get('background', '#ffffff')};
-            color: {colors.get('foreground', '#0f172a')};
+            background-color: {tokens.get('background', '#ffffff')};
+            color: {tokens.get('foreground', '#0f172a')};
         }}
 
         /* Try to affect window frame */
         QMainWindow {{
-            background-color: {colors.get('background', '#ffffff')};
+            background-color: {tokens.get('background', '#ffffff')};
         }}
 
         /* Buttons */
         QPushButton {{
-            background-color: {colors.get('background', '#f8fafc')};
-            border: 1px solid {colors.get('border', '#e2e8f0')};
-            border-radius: 6px;
-            padding: 8px 16px;
+            background-color: {tokens.get('background', '#f8fafc')};
+            border: 1px solid {tokens.get('border', '#e2e8f0')};
+            border-radius: {tokens.get('radius-md', 6)}px;
+            padding: {tokens.get('space-2', 8)}px {tokens.get('space-4', 16)}px;
             font-weight: 500;
-            color: {colors.get('foreground', '#475569')};
-            min-height: 36px;
+            color: {tokens.get('foreground', '#475569')};
+            min-height: {tokens.get('button-height', 36)}px;
         }}
 
         QPushButton:hover {{
-            background-color: {colors.get('muted', '#f1f5f9')};
-            border-color: {colors.get('border', '#cbd5e1')};
+            background-color: {tokens.get('background-hover', '#f1f5f9')};
+            border-color: {tokens.get('border', '#cbd5e1')};
         }}
 
         QPushButton:pressed {{
-            background-color: {colors.get('border', '#e2e8f0')};
+            background-color: {tokens.get('background-pressed', '#e2e8f0')};
+        }}
+
+        QPushButton:disabled {{
+            background-color: {tokens.get('background-disabled', '#f8fafc')};
+            color: {tokens.get('muted-foreground', '#64748b')};
         }}
 
         QPushButton#primary {{
-            background-color: {colors.get('primary', '#0f172a')};
-            border-color: {colors.get('primary', '#0f172a')};
-            color: {colors.get('primary-foreground', '#ffffff')};
+            background-color: {tokens.get('primary', '#0f172a')};
+            border-color: {tokens.get('primary', '#0f172a')};
+            color: {tokens.get('primary-foreground', '#ffffff')};
         }}
 
         QPushButton#primary:hover {{
-            background-color: {colors.get('primary', '#1e293b')};
-            border-color: {colors.get('primary', '#1e293b')};
+            background-color: {tokens.get('primary-hover', '#1e293b')};
+            border-color: {tokens.get('primary-hover', '#1e293b')};
+        }}
+
+        QPushButton#primary:pressed {{
+            background-color: {tokens.get('primary-pressed', '#334155')};
+            border-color: {tokens.get('primary-pressed', '#334155')};
+        }}
+
+        QPushButton#primary:disabled {{
+            background-color: {tokens.get('primary-disabled', '#94a3b8')};
+            border-color: {tokens.get('primary-disabled', '#94a3b8')};
         }}
 
         QPushButton#secondary {{
-            background-color: {colors.get('secondary', '#f1f5f9')};
-            border-color: {colors.get('border', '#e2e8f0')};
-            color: {colors.get('secondary-foreground', '#475569')};
+            background-color: {tokens.get('secondary', '#f1f5f9')};
+            border-color: {tokens.get('border', '#e2e8f0')};
+            color: {tokens.get('secondary-foreground', '#475569')};
         }}
 
         QPushButton#secondary:hover {{
-            background-color: {colors.get('muted', '#e2e8f0')};
-            border-color: {colors.get('border', '#cbd5e1')};
+            background-color: {tokens.get('secondary-hover', '#e2e8f0')};
+            border-color: {tokens.get('border', '#cbd5e1')};
+        }}
+
+        QPushButton#secondary:pressed {{
+            background-color: {tokens.get('secondary-pressed', '#cbd5e1')};
+        }}
+
+        QPushButton#secondary:disabled {{
+            background-color: {tokens.get('secondary-disabled', '#f8fafc')};
+            color: {tokens.get('muted-foreground', '#64748b')};
         }}
 
         QPushButton#outline {{
             background-color: transparent;
-            border: 1px solid {colors.get('border', '#e2e8f0')};
-            color: {colors.get('foreground', '#475569')};
+            border: 1px solid {tokens.get('border', '#e2e8f0')};
+            color: {tokens.get('foreground', '#475569')};
         }}
 
         QPushButton#outline:hover {{
-            background-color: {colors.get('background', '#f8fafc')};
-            border-color: {colors.get('border', '#cbd5e1')};
+            background-color: {tokens.get('accent', '#f1f5f9')};
+            border-color: {tokens.get('border', '#cbd5e1')};
+        }}
+
+        QPushButton#outline:pressed {{
+            background-color: {tokens.get('accent-pressed', '#e2e8f0')};
+        }}
+
+        QPushButton#outline:disabled {{
+            color: {tokens.get('muted-foreground', '#64748b')};
         }}
 
         QPushButton#ghost {{
             background-color: transparent;
             border: none;
-            color: {colors.get('foreground', '#475569')};
+            color: {tokens.get('foreground', '#475569')};
         }}
 
         QPushButton#ghost:hover {{
-            background-color: {colors.get('muted', '#f1f5f9')};
+            background-color: {tokens.get('accent', '#f1f5f9')};
+        }}
+
+        QPushButton#ghost:pressed {{
+            background-color: {tokens.get('accent-pressed', '#e2e8f0')};
+        }}
+
+        QPushButton#ghost:disabled {{
+            color: {tokens.get('muted-foreground', '#64748b')};
         }}
 
         /* Input fields */
         QLineEdit, QTextEdit {{
-            background-color: {colors.get('background', '#ffffff')};
-            border: 1px solid {colors.get('border', '#e2e8f0')};
+            background-color: {tokens.get('background', '#ffffff')};
+            border: 1px solid {tokens.get('border', '#e2e8f0')};
             border
-            padding: 8px 12px;
-            font-size: 14px;
-            color: {colors.get('foreground', '#0f172a')};
+            padding: {tokens.get('space-2', 8)}px {tokens.get('space-3', 12)}px;
+            font-size: {tokens.get('text-sm', 14)}px;
+            color: {tokens.get('foreground', '#0f172a')};
         }}
 
         QLineEdit:focus, QTextEdit:focus {{
-            border-color: {colors.get('ring', '#3b82f6')};
+            border-color: {tokens.get('ring', '#3b82f6')};
             outline: none;
         }}
 
         QLineEdit:hover, QTextEdit:hover {{
-            border-color: {colors.get('border', '#cbd5e1')};
+            border-color: {tokens.get('border', '#cbd5e1')};
+        }}
+
+        QLineEdit:disabled, QTextEdit:disabled, QComboBox:disabled {{
+            background-color: {tokens.get('muted-disabled', '#f8fafc')};
+            color: {tokens.get('muted-foreground', '#64748b')};
         }}
 
         /* Custom Shadcn Input Widgets */
         ShadcnInput, QLineEdit#shadcn_input {{
-            background-color: {colors.get('background', '#ffffff')};
-            border: 1px solid {colors.get('border', '#e2e8f0')};
-            border-radius: 6px;
-            padding: 8px 12px;
-            font-size: 14px;
-            color: {colors.get('foreground', '#0f172a')};
-            selection-background-color: {colors.get('primary', '#0f172a')};
-            selection-color: {colors.get('primary-foreground', '#ffffff')};
+            background-color: {tokens.get('background', '#ffffff')};
+            border: 1px solid {tokens.get('border', '#e2e8f0')};
+            border-radius: {tokens.get('radius-md', 6)}px;
+            padding: {tokens.get('space-2', 8)}px {tokens.get('space-3', 12)}px;
+            font-size: {tokens.get('text-sm', 14)}px;
+            color: {tokens.get('foreground', '#0f172a')};
+            selection-background-color: {tokens.get('primary', '#0f172a')};
+            selection-color: {tokens.get('primary-foreground', '#ffffff')};
         }}
 
         ShadcnInput:focus, QLineEdit#shadcn_input:focus {{
-            border-color: {colors.get('ring', '#3b82f6')};
+            border-color: {tokens.get('ring', '#3b82f6')};
             outline: none;
         }}
 
         ShadcnInput:hover, QLineEdit#shadcn_input:hover {{
-            border-color: {colors.get('border', '#cbd5e1')};
+            border-color: {tokens.get('border', '#cbd5e1')};
         }}
 
         ShadcnTextArea, QTextEdit#shadcn_textarea {{
-            background-color: {colors.get('background', '#ffffff')};
-            border: 1px solid {colors.get('border', '#e2e8f0')};
-            border-radius: 6px;
-            padding: 8px 12px;
-            font-size: 14px;
-            color: {colors.get('foreground', '#0f172a')};
-            selection-background-color: {colors.get('primary', '#0f172a')};
-            selection-color: {colors.get('primary-foreground', '#ffffff')};
+            background-color: {tokens.get('background', '#ffffff')};
+            border: 1px solid {tokens.get('border', '#e2e8f0')};
+            border-radius: {tokens.get('radius-md', 6)}px;
+            padding: {tokens.get('space-2', 8)}px {tokens.get('space-3', 12)}px;
+            font-size: {tokens.get('text-sm', 14)}px;
+            color: {tokens.get('foreground', '#0f172a')};
+            selection-background-color: {tokens.get('primary', '#0f172a')};
+            selection-color: {tokens.get('primary-foreground', '#ffffff')};
         }}
 
         ShadcnTextArea:focus, QTextEdit#shadcn_textarea:focus {{
-            border-color: {colors.get('ring', '#3b82f6')};
+            border-color: {tokens.get('ring', '#3b82f6')};
             outline: none;
         }}
 
         ShadcnTextArea:hover, QTextEdit#shadcn_textarea:hover {{
-            border-color: {colors.get('border', '#cbd5e1')};
+            border-color: {tokens.get('border', '#cbd5e1')};
         }}
 
         ShadcnSelect, QComboBox#shadcn_select {{
-            background-color: {colors.get('background', '#ffffff')};
-            border: 1px solid {colors.get('border', '#e2e8f0')};
-            border-radius: 6px;
-            padding: 8px 12px;
-            font-size: 14px;
-            color: {colors.get('foreground', '#0f172a')};
-            min-height: 40px;
+            background-color: {tokens.get('background', '#ffffff')};
+            border: 1px solid {tokens.get('border', '#e2e8f0')};
+            border-radius: {tokens.get('radius-md', 6)}px;
+            padding: {tokens.get('space-2', 8)}px {tokens.get('space-3', 12)}px;
+            font-size: {tokens.get('text-sm', 14)}px;
+            color: {tokens.get('foreground', '#0f172a')};
+            min-height: {tokens.get('input-height', 40)}px;
         }}
 
         ShadcnSelect:hover, QComboBox#shadcn_select:hover {{
-            border-color: {colors.get('border', '#cbd5e1')};
+            border-color: {tokens.get('border', '#cbd5e1')};
         }}
 
         ShadcnSelect:focus, QComboBox#shadcn_select:focus {{
-            border-color: {colors.get('ring', '#3b82f6')};
+            border-color: {tokens.get('ring', '#3b82f6')};
             outline: none;
         }}
 
@@ -253,65 +662,43 @@ class ShadcnTheme(Theme):
         ShadcnSelect::down-arrow, QComboBox#shadcn_select::down-arrow {{
             border: none;
             background: none;
-            color: {colors.get('muted-foreground', '#64748b')};
+            color: {tokens.get('muted-foreground', '#64748b')};
             width: 12px;
             height: 12px;
         }}
 
         ShadcnSelect QAbstractItemView, QComboBox#shadcn_select QAbstractItemView {{
-            background-color: {colors.get('background', '#ffffff')};
-            border: 1px solid {colors.get('border', '#e2e8f0')};
-            border-radius: 6px;
-            selection-background-color: {colors.get('muted', '#f1f5f9')};
-            selection-color: {colors.get('foreground', '#0f172a')};
+            background-color: {tokens.get('background', '#ffffff')};
+            border: 1px solid {tokens.get('border', '#e2e8f0')};
+            border-radius: {tokens.get('radius-md', 6)}px;
+            selection-background-color: {tokens.get('muted', '#f1f5f9')};
+            selection-color: {tokens.get('foreground', '#0f172a')};
         }}
 
         ShadcnCheckbox, QCheckBox#shadcn_checkbox {{
-            spacing: 8px;
-            color: {colors.get('foreground', '#0f172a')};
-            font-size: 14px;
+            spacing: {tokens.get('space-2', 8)}px;
+            color: {tokens.get('foreground', '#0f172a')};
+            font-size: {tokens.get('text-sm', 14)}px;
         }}
 
+        /* Shadcn indicators are painted from cached pixmaps; only size them here,
+           with room for the focus ring around them */
         ShadcnCheckbox::indicator, QCheckBox#shadcn_checkbox::indicator {{
-            width: 18px;
-            height: 18px;
-            border: 2px solid {colors.get('border', '#d1d5db')};
-            border-radius: 4px;
-            background-color: {colors.get('background', '#ffffff')};
-        }}
-
-        ShadcnCheckbox::indicator:hover, QCheckBox#shadcn_checkbox::indicator:hover {{
-            border-color: {colors.get('muted-foreground', '#9ca3af')};
-        }}
-
-        ShadcnCheckbox::indicator:checked, QCheckBox#shadcn_checkbox::indicator:checked {{
-            background-color: {colors.get('primary', '#0f172a')};
-            border-color: {colors.get('primary', '#0f172a')};
-            image: url("data:image/svg+xml,%3csvg viewBox='0 0 16 16' fill='white' xmlns='http://www.w3.org/2000/svg'%3e%3cpath d='m13.854 3.646-7.5 7.5a.5.5 0 0 1-.708 0l-3.5-3.5a.5.5 0 0 1 .708-.708L6 10.293l7.146-7.147a.5.5 0 0 1 .708.708z'/%3e%3c/svg%3e");
+            width: {tokens.get('indicator-box', 26)}px;
+            height: {tokens.get('indicator-box', 26)}px;
+            border: none;
         }}
 
         ShadcnRadioButton, QRadioButton#shadcn_radio {{
-            spacing: 8px;
-            color: {colors.get('foreground', '#0f172a')};
-            font-size: 14px;
+            spacing: {tokens.get('space-2', 8)}px;
+            color: {tokens.get('foreground', '#0f172a')};
+            font-size: {tokens.get('text-sm', 14)}px;
         }}
 
         ShadcnRadioButton::indicator, QRadioButton#shadcn_radio::indicator {{
-            width: 18px;
-            height: 18px;
-            border: 2px solid {colors.get('border', '#d1d5db')};
-            border-radius: 9px;
-            background-color: {colors.get('background', '#ffffff')};
-        }}
-
-        ShadcnRadioButton::indicator:hover, QRadioButton#shadcn_radio::indicator:hover {{
-            border-color: {colors.get('muted-foreground', '#9ca3af')};
-        }}
-
-        ShadcnRadioButton::indicator:checked, QRadioButton#shadcn_radio::indicator:checked {{
-            background-color: {colors.get('primary', '#0f172a')};
-            border-color: {colors.get('primary', '#0f172a')};
-            image: url("data:image/svg+xml,%3csvg viewBox='0 0 16 16' fill='white' xmlns='http://www.w3.org/2000/svg'%3e%3ccircle cx='8' cy='8' r='3'/%3e%3c/svg%3e");
+            width: {tokens.get('indicator-box', 26)}px;
+            height: {tokens.get('indicator-box', 26)}px;
+            border: none;
         }}
 
         ShadcnSlider, QSlider#shadcn_slider {{
@@ -319,33 +706,22 @@ class ShadcnTheme(Theme):
         }}
 
         ShadcnSlider::groove:horizontal, QSlider#shadcn_slider::groove:horizontal {{
-            height: 6px;
-            background-color: {colors.get('border', '#e2e8f0')};
-            border-radius: 3px;
+            height: {tokens.get('slider-groove-height', 6)}px;
+            background-color: {tokens.get('border', '#e2e8f0')};
+            border-radius: {tokens.get('slider-groove-radius', 3)}px;
         }}
 
         ShadcnSlider::handle:horizontal, QSlider#shadcn_slider::handle:horizontal {{
-            background-color: {colors.get('primary', '#0f172a')};
-            border: none;
-            width: 20px;
-            height: 20px;
-            border-radius: 10px;
-            margin: -7px 0;
-        }}
-
-        ShadcnSlider::handle:horizontal:hover, QSlider#shadcn_slider::handle:horizontal:hover {{
-            background-color: {colors.get('primary', '#1e293b')};
-        }}
-
-        ShadcnSlider::handle:horizontal:pressed, QSlider#shadcn_slider::handle:horizontal:pressed {{
-            background-color: {colors.get('primary', '#334155')};
+            width: {tokens.get('slider-handle-box', 24)}px;
+            height: {tokens.get('slider-handle-box', 24)}px;
+            margin: {tokens.get('slider-handle-margin', -9)}px 0;
         }}
 
         QLabel#shadcn_label {{
-            color: {colors.get('foreground', '#374151')};
-            font-size: 14px;
+            color: {tokens.get('foreground', '#374151')};
+            font-size: {tokens.get('text-sm', 14)}px;
             font-weight: 500;
-            margin-bottom: 4px;
+            margin-bottom: {tokens.get('space-1', 4)}px;
         }}
 
         QWidget#shadcn_form_field {{
@@ -354,98 +730,98 @@ class ShadcnTheme(Theme):
 
         /* Labels */
         QLabel {{
-            color: {colors.get('foreground', '#374151')};
-            font-size: 14px;
+            color: {tokens.get('foreground', '#374151')};
+            font-size: {tokens.get('text-sm', 14)}px;
         }}
 
         QLabel#heading {{
-            font-size: 24px;
+            font-size: {tokens.get('text-2xl', 24)}px;
             font-weight: 600;
-            color: {colors.get('foreground', '#0f172a')};
-            margin-bottom: 8px;
+            color: {tokens.get('foreground', '#0f172a')};
+            margin-bottom: {tokens.get('space-2', 8)}px;
         }}
 
         QLabel#subheading {{
-            font-size: 18px;
+            font-size: {tokens.get('text-lg', 18)}px;
             font-weight: 500;
-            color: {colors.get('foreground', '#374151')};
-            margin-bottom: 4px;
+            color: {tokens.get('foreground', '#374151')};
+            margin-bottom: {tokens.get('space-1', 4)}px;
         }}
 
         /* Cards */
         QFrame#card {{
-            background-color: {colors.get('card', '#ffffff')};
-            border: 1px solid {colors.get('border', '#e2e8f0')};
-            border-radius: 8px;
-            padding: 16px;
+            background-color: {tokens.get('card', '#ffffff')};
+            border: 1px solid {tokens.get('border', '#e2e8f0')};
+            border-radius: {tokens.get('radius-lg', 8)}px;
+            padding: {tokens.get('space-4', 16)}px;
         }}
 
         QFrame#card:hover {{
-            border-color: {colors.get('border', '#cbd5e1')};
+            border-color: {tokens.get('border', '#cbd5e1')};
         }}
 
         /* Group boxes */
         QGroupBox {{
             font-weight: 600;
-            border: 1px solid {colors.get('border', '#e2e8f0')};
-            border-radius: 8px;
-            margin-top: 8px;
-            padding-top: 16px;
+            border: 1px solid {tokens.get('border', '#e2e8f0')};
+            border-radius: {tokens.get('radius-lg', 8)}px;
+            margin-top: {tokens.get('space-2', 8)}px;
+            padding-top: {tokens.get('space-4', 16)}px;
         }}
 
         QGroupBox::title {{
             subcontrol-origin: margin;
-            left: 12px;
-            padding: 0 8px 0 8px;
-            color: {colors.get('foreground', '#374151')};
+            left: {tokens.get('space-3', 12)}px;
+            padding: 0 {tokens.get('space-2', 8)}px 0 {tokens.get('space-2', 8)}px;
+            color: {tokens.get('foreground', '#374151')};
             font-weight: 600;
         }}
 
         /* Checkboxes and Radio buttons */
         QCheckBox, QRadioButton {{
-            spacing: 8px;
-            color: {colors.get('foreground', '#0f172a')};
+            spacing: {tokens.get('space-2', 8)}px;
+            color: {tokens.get('foreground', '#0f172a')};
         }}
 
         QCheckBox::indicator, QRadioButton::indicator {{
-            width: 16px;
-            height: 16px;
-            border: 1px solid {colors.get('border', '#d1d5db')};
-            border-radius: 3px;
-            background-color: {colors.get('background', '#ffffff')};
+            width: {tokens.get('indicator-size-sm', 16)}px;
+            height: {tokens.get('indicator-size-sm', 16)}px;
+            border: 1px solid {tokens.get('border', '#d1d5db')};
+            border-radius: {tokens.get('radius-xs', 3)}px;
+            background-color: {tokens.get('background', '#ffffff')};
         }}
 
         QCheckBox::indicator:hover, QRadioButton::indicator:hover {{
-            border-color: {colors.get('muted-foreground', '#9ca3af')};
+            border-color: {tokens.get('muted-foreground', '#9ca3af')};
         }}
 
         QCheckBox::indicator:checked {{
-            background-color: {colors.get('primary', '#0f172a')};
-            border-color: {colors.get('primary', '#0f172a')};
+            background-color: {tokens.get('primary', '#0f172a')};
+            border-color: {tokens.get('primary', '#0f172a')};
         }}
 
         QRadioButton::indicator:checked {{
-            background-color: {colors.get('primary', '#0f172a')};
-            border-color: {colors.get('primary', '#0f172a')};
-            border-radius: 8px;
+            background-color: {tokens.get('primary', '#0f172a')};
+            border-color: {tokens.get('primary', '#0f172a')};
+            border-radius: {tokens.get('indicator-radius-sm', 8)}px;
         }}
 
         /* Combo boxes */
         QComboBox {{
-            background-color: {colors.get('background', '#ffffff')};
-            border: 1px solid {colors.get('border', '#e2e8f0')};
-            border-radius: 6px;
-            padding: 8px 12px;
-            min-height: 36px;
-            color: {colors.get('foreground', '#0f172a')};
+            background-color: {tokens.get('background', '#ffffff')};
+            border: 1px solid {tokens.get('border', '#e2e8f0')};
+            border-radius: {tokens.get('radius-md', 6)}px;
+            padding: {tokens.get('space-2', 8)}px {tokens.get('space-3', 12)}px;
+            min-height: {tokens.get('button-height', 36)}px;
+            color: {tokens.get('foreground', '#0f172a')};
         }}
 
         QComboBox:hover {{
-            border-color: {colors.get('border', '#cbd5e1')};
+            border-color: {tokens.get('border', '#cbd5e1')};
         }}
 
         QComboBox:focus {{
-            border-color: {colors.get('ring', '#3b82f6')};
+            border-color: {tokens.get('ring', '#3b82f6')};
             outline: none;
         }}
 
@@ -457,26 +833,26 @@ class ShadcnTheme(Theme):
         QComboBox::down-arrow {{
             border: none;
             background: none;
-            color: {colors.get('foreground', '#0f172a')};
+            color: {tokens.get('foreground', '#0f172a')};
         }}
 
         QComboBox QAbstractItemView {{
-            background-color: {colors.get('background', '#ffffff')};
-            border: 1px solid {colors.get('border', '#e2e8f0')};
-            border-radius: 6px;
-            selection-background-color: {colors.get('muted', '#f1f5f9')};
-            selection-color: {colors.get('foreground', '#0f172a')};
+            background-color: {tokens.get('background', '#ffffff')};
+            border: 1px solid {tokens.get('border', '#e2e8f0')};
+            border-radius: {tokens.get('radius-md', 6)}px;
+            selection-background-color: {tokens.get('muted', '#f1f5f9')};
+            selection-color: {tokens.get('foreground', '#0f172a')};
         }}
 
         /* Sliders */
         QSlider::groove:horizontal {{
             height: 4px;
-            background-color: {colors.get('border', '#e2e8f0')};
+            background-color: {tokens.get('border', '#e2e8f0')};
             border-radius: 2px;
         }}
 
         QSlider::handle:horizontal {{
-            background-color: {colors.get('primary', '#0f172a')};
+            background-color: {tokens.get('primary', '#0f172a')};
             border: none;
             width: 16px;
             height: 16px;
@@ -485,39 +861,39 @@ class ShadcnTheme(Theme):
         }}
 
         QSlider::handle:horizontal:hover {{
-            background-color: {colors.get('primary', '#1e293b')};
+            background-color: {tokens.get('primary-hover', '#1e293b')};
         }}
 
         /* Progress bars */
         QProgressBar {{
-            border: 1px solid {colors.get('border', '#e2e8f0')};
-            border-radius: 4px;
+            border: 1px solid {tokens.get('border', '#e2e8f0')};
+            border-radius: {tokens.get('radius-sm', 4)}px;
             text-align: center;
-            background-color: {colors.get('background', '#f8fafc')};
-            color: {colors.get('primary-foreground', '#ffffff')};
+            background-color: {tokens.get('background', '#f8fafc')};
+            color: {tokens.get('primary-foreground', '#ffffff')};
             font-weight: 500;
         }}
 
         QProgressBar::chunk {{
-            background-color: {colors.get('primary', '#0f172a')};
-            border-radius: 3px;
+            background-color: {tokens.get('primary', '#0f172a')};
+            border-radius: {tokens.get('radius-xs', 3)}px;
         }}
 
         /* Scroll bars */
         QScrollBar:vertical {{
-            background-color: {colors.get('background', '#f8fafc')};
-            width: 12px;
-            border-radius: 6px;
+            background-color: {tokens.get('background', '#f8fafc')};
+            width: {tokens.get('scrollbar-width', 12)}px;
+            border-radius: {tokens.get('scrollbar-radius', 6)}px;
         }}
 
         QScrollBar::handle:vertical {{
-            background-color: {colors.get('border', '#cbd5e1')};
-            border-radius: 6px;
+            background-color: {tokens.get('border', '#cbd5e1')};
+            border-radius: {tokens.get('scrollbar-radius', 6)}px;
             min-height: 30px;
         }}
 
         QScrollBar::handle:vertical:hover {{
-            background-color: {colors.get('muted-foreground', '#94a3b8')};
+            background-color: {tokens.get('muted-foreground', '#94a3b8')};
         }}
 
         QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
@@ -531,55 +907,55 @@ class ShadcnTheme(Theme):
 
         /* Custom title bar */
         QWidget#title_bar {{
-            background-color: {colors.get('background', '#ffffff')};
-            border-bottom: 1px solid {colors.get('border', '#e2e8f0')};
+            background-color: {tokens.get('background', '#ffffff')};
+            border-bottom: 1px solid {tokens.get('border', '#e2e8f0')};
         }}
 
         QPushButton#title_bar_button {{
             background-color: transparent;
             border: none;
-            color: {colors.get('muted-foreground', '#64748b')};
-            font-size: 16px;
+            color: {tokens.get('muted-foreground', '#64748b')};
+            font-size: {tokens.get('text-base', 16)}px;
             font-weight: bold;
-            border-radius: 4px;
+            border-radius: {tokens.get('radius-sm', 4)}px;
             padding: 2px;
         }}
 
         QPushButton#title_bar_button:hover {{
-            background-color: {colors.get('muted', '#f1f5f9')};
-            color: {colors.get('foreground', '#0f172a')};
+            background-color: {tokens.get('muted', '#f1f5f9')};
+            color: {tokens.get('foreground', '#0f172a')};
         }}
 
         QPushButton#title_bar_button:pressed {{
-            background-color: {colors.get('border', '#e2e8f0')};
+            background-color: {tokens.get('muted-pressed', '#e2e8f0')};
         }}
 
         QPushButton#title_bar_button:focus {{
             outline: none;
-            background-color: {colors.get('muted', '#f1f5f9')};
+            background-color: {tokens.get('muted', '#f1f5f9')};
         }}
 
         QPushButton#close_button {{
             background-color: transparent;
             border: none;
-            color: {colors.get('muted-foreground', '#64748b')};
-            font-size: 16px;
+            color: {tokens.get('muted-foreground', '#64748b')};
+            font-size: {tokens.get('text-base', 16)}px;
             font-weight: bold;
-            border-radius: 4px;
+            border-radius: {tokens.get('radius-sm', 4)}px;
             padding: 2px;
         }}
 
         QPushButton#close_button:hover {{
-            background-color: {colors.get('destructive', '#ef4444')};
-            color: {colors.get('destructive-foreground', '#ffffff')};
+            background-color: {tokens.get('destructive', '#ef4444')};
+            color: {tokens.get('destructive-foreground', '#ffffff')};
         }}
 
         QPushButton#close_button:pressed {{
-            background-color: {colors.get('destructive', '#dc2626')};
+            background-color: {tokens.get('destructive-pressed', '#dc2626')};
         }}
 
         QPushButton#close_button:focus {{
             outline: none;
-            background-color: {colors.get('muted', '#f1f5f9')};
+            background-color: {tokens.get('muted', '#f1f5f9')};
         }}
         """
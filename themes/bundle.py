@@ -0,0 +1,348 @@
+"""
+Compile many themes at once into a single indexed bundle file
+
+A bundle holds the source colors, compiled palettes and minified
+stylesheets of both modes of every theme in it, e.g. one branded theme per
+customer. Opening a bundle reads only its index; a theme's palette and
+stylesheet are read and decompressed when that theme is first used.
+
+Build one from a JSON file of theme definitions keyed by theme id::
+
+    python -m themes.bundle build tenants.json tenants.bundle
+
+A definition is a seed color, a shipped theme to extend, explicit source
+colors, or a combination, with per-mode colors applied last::
+
+    {"acme": {"seed": "#2563eb"},
+     "globex": {"extends": "violet", "light": {"primary": "oklch(0.6 0.2 300)"}}}
+"""
+
+import argparse
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+from themes.base import ShadcnTheme, StylesheetTemplate
+from themes.tokens import TokenGraph
+
+Palettes = Dict[bool, Dict[str, str]]
+
+# Bump when the file layout or the compiled content changes
+BUNDLE_VERSION = 1
+
+# Themes compiled per worker task
+CHUNK_SIZE = 64
+
+_MAGIC = b"SHTB"
+# Magic, version, index offset, index length
+_HEADER = struct.Struct("<4sIQQ")
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_WHITESPACE = re.compile(r"\s+")
+_PUNCTUATION = re.compile(r"\s*([{};,])\s*")
+_PROPERTY = re.compile(r":\s+")
+
+
+def minify_stylesheet(stylesheet: str) -> str:
+    """Strip comments and insignificant whitespace from a stylesheet
+
+    Whitespace before a colon is kept, since in a selector it separates a
+    descendant from a pseudo-state.
+    """
+    stylesheet = _COMMENT.sub("", stylesheet)
+    stylesheet = _WHITESPACE.sub(" ", stylesheet)
+    stylesheet = _PUNCTUATION.sub(r"\1", stylesheet)
+    stylesheet = _PROPERTY.sub(":", stylesheet)
+    return stylesheet.replace(";}", "}").strip()
+
+
+def load_definitions(path: str) -> Dict[str, Dict[str, Any]]:
+    """Read theme definitions keyed by theme id from a JSON file"""
+    with open(path, encoding="utf-8") as f:
+        definitions = json.load(f)
+    if not isinstance(definitions, dict):
+        raise ValueError(f"{path} must contain an object of theme definitions")
+    return definitions
+
+
+def resolve_definitions(
+    definitions: Mapping[str, Mapping[str, Any]],
+) -> Dict[str, Palettes]:
+    """Turn theme definitions into the source colors of both modes
+
+    Seeds are generated together in one batch.
+    """
+    from themes import ThemeManager
+    from themes.generator import generate_palettes
+
+    shipped = ThemeManager().themes
+    seeded = [name for name, definition in definitions.items() if "seed" in definition]
+    generated = dict(
+        zip(seeded, generate_palettes([definitions[name]["seed"] for name in seeded]))
+    )
+
+    palettes: Dict[str, Palettes] = {}
+    for name, definition in definitions.items():
+        unknown = set(definition) - {"seed", "extends", "light", "dark"}
+        if unknown:
+            raise ValueError(f"Unknown keys in theme {name}: {', '.join(unknown)}")
+        sources: Palettes = {False: {}, True: {}}
+        if "extends" in definition:
+            base = shipped.get(definition["extends"])
+            if base is None:
+                raise ValueError(
+                    f"Theme {name} extends unknown theme {definition['extends']}"
+                )
+            sources = {mode: base.get_source_colors(mode) for mode in (False, True)}
+        if name in generated:
+            for mode in (False, True):
+                sources[mode].update(generated[name][mode])
+        sources[False].update(definition.get("light", {}))
+        sources[True].update(definition.get("dark", {}))
+        palettes[name] = sources
+    return palettes
+
+
+def _compile_chunk(
+    items: Sequence[Tuple[str, Palettes]],
+) -> List[Tuple[str, bytes, bytes]]:
+    """Compile themes to a compressed record per mode
+
+    The stylesheet template is minified once and filled for every theme.
+    """
+    from themes.generator import GeneratedTheme
+
+    template: Optional[StylesheetTemplate] = None
+    results = []
+    for name, palettes in items:
+        theme = GeneratedTheme(name, palettes)
+        if template is None:
+            template = StylesheetTemplate(
+                minify_stylesheet(theme.get_stylesheet_template().text)
+            )
+        records = []
+        for mode in (False, True):
+            colors = theme.get_colors_for_mode(mode)
+            record = {
+                "sources": palettes[mode],
+                "colors": dict(colors),
+                "stylesheet": "".join(template.render(colors, theme.get_metrics())),
+            }
+            records.append(zlib.compress(json.dumps(record).encode("utf-8")))
+        results.append((name, records[0], records[1]))
+    return results
+
+
+def _compile(
+    palettes: Dict[str, Palettes], workers: Optional[int]
+) -> Iterator[Tuple[str, bytes, bytes]]:
+    items = list(palettes.items())
+    chunks = [
+        items[start : start + CHUNK_SIZE] for start in range(0, len(items), CHUNK_SIZE)
+    ]
+    if len(chunks) <= 1 or workers == 0:
+        for chunk in chunks:
+            yield from _compile_chunk(chunk)
+        return
+    max_workers = min(len(chunks), workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        for results in pool.map(_compile_chunk, chunks):
+            yield from results
+
+
+def build_bundle(
+    definitions: Mapping[str, Mapping[str, Any]],
+    path: str,
+    workers: Optional[int] = None,
+) -> int:
+    """Compile theme definitions into a bundle file, returning the theme count
+
+    Themes are compiled in chunks of ``CHUNK_SIZE`` across a process pool;
+    ``workers=0`` compiles in this process. The file is written next to
+    ``path`` and moved into place when complete.
+    """
+    palettes = resolve_definitions(definitions)
+    index: Dict[str, List[int]] = {}
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, BUNDLE_VERSION, 0, 0))
+        for name, light, dark in _compile(palettes, workers):
+            offset = f.tell()
+            f.write(light)
+            f.write(dark)
+            index[name] = [offset, len(light), offset + len(light), len(dark)]
+        index_data = zlib.compress(json.dumps(index).encode("utf-8"))
+        index_offset = f.tell()
+        f.write(index_data)
+        f.seek(0)
+        f.write(_HEADER.pack(_MAGIC, BUNDLE_VERSION, index_offset, len(index_data)))
+    os.replace(temporary, path)
+    return len(index)
+
+
+class ThemeBundle:
+    """Read-only access to a bundle file
+
+    The file is memory-mapped and only its index is parsed up front, so
+    looking up a theme is a dictionary access and a single record read.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, offset, length = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a theme bundle")
+        if version != BUNDLE_VERSION:
+            self.close()
+            raise ValueError(f"{path} has bundle version {version}")
+        self._index: Dict[str, List[int]] = json.loads(
+            zlib.decompress(self._map[offset : offset + length])
+        )
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def names(self) -> List[str]:
+        """Get the ids of every theme in the bundle"""
+        return list(self._index)
+
+    def read(self, name: str, dark_mode: bool = False) -> Dict[str, Any]:
+        """Read the sources, compiled colors and stylesheet of one mode"""
+        entry = self._index[name]
+        offset, length = entry[2:] if dark_mode else entry[:2]
+        return json.loads(zlib.decompress(self._map[offset : offset + length]))
+
+    def get_stylesheet(self, name: str, dark_mode: bool = False) -> str:
+        """Get the minified stylesheet of a theme"""
+        return self.read(name, dark_mode)["stylesheet"]
+
+    def get_colors(self, name: str, dark_mode: bool = False) -> Dict[str, str]:
+        """Get the compiled palette of a theme"""
+        return self.read(name, dark_mode)["colors"]
+
+    def theme(self, name: str) -> "BundledTheme":
+        """Get a theme that can be registered with the ThemeManager"""
+        if name not in self._index:
+            raise KeyError(name)
+        return BundledTheme(self, name)
+
+    def close(self):
+        """Unmap the bundle file"""
+        self._map.close()
+
+
+class BundledTheme(ShadcnTheme):
+    """A theme whose compiled palettes and stylesheets come from a bundle
+
+    Each mode is read from the bundle on first use. Until tokens are
+    overridden the bundled palette and stylesheet are used as they are;
+    overrides recompile from the bundled source colors as usual.
+    """
+
+    def __init__(self, bundle: ThemeBundle, name: str):
+        super().__init__()
+        self._bundle = bundle
+        self._name = name
+        self._records: Dict[bool, Dict[str, Any]] = {}
+
+    @property
+    def name(self) -> str:
+        """Get the name of the theme"""
+        return self._name
+
+    def _record(self, dark_mode: bool) -> Dict[str, Any]:
+        record = self._records.get(dark_mode)
+        if record is None:
+            record = self._records[dark_mode] = self._bundle.read(self._name, dark_mode)
+        return record
+
+    @property
+    def _light_colors(self) -> Dict[str, str]:
+        return self._record(False)["sources"]
+
+    @_light_colors.setter
+    def _light_colors(self, colors: Dict[str, str]):
+        self._record(False)["sources"] = colors
+
+    @property
+    def _dark_colors(self) -> Dict[str, str]:
+        return self._record(True)["sources"]
+
+    @_dark_colors.setter
+    def _dark_colors(self, colors: Dict[str, str]):
+        self._record(True)["sources"] = colors
+
+    def _compile_colors(self, dark_mode: bool) -> TokenGraph:
+        """Use the bundled palette unless tokens of the mode are overridden"""
+        if self._overrides[dark_mode]:
+            return super()._compile_colors(dark_mode)
+        colors = self._record(dark_mode)["colors"]
+        return TokenGraph(colors, self._color_derivations(), evaluated=colors)
+
+    def get_stylesheet(self, dark_mode: bool = False) -> str:
+        """Use the bundled stylesheet until tokens are overridden"""
+        if (
+            dark_mode not in self._stylesheet_segments
+            and not self._overrides[dark_mode]
+            and not self._metric_overrides
+        ):
+            return self._record(dark_mode)["stylesheet"]
+        return super().get_stylesheet(dark_mode)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(
+        prog="python -m themes.bundle", description=__doc__.strip().splitlines()[0]
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="compile theme definitions")
+    build.add_argument("definitions", help="JSON file of theme definitions")
+    build.add_argument("output", help="bundle file to write")
+    build.add_argument("--workers", type=int, help="worker processes, 0 for none")
+    show = commands.add_parser("show", help="print a theme from a bundle")
+    show.add_argument("bundle", help="bundle file to read")
+    show.add_argument("name", nargs="?", help="theme id; lists ids if omitted")
+    show.add_argument("--dark", action="store_true", help="show the dark mode")
+    show.add_argument("--colors", action="store_true", help="print the palette")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        count = build_bundle(
+            load_definitions(args.definitions), args.output, args.workers
+        )
+        print(f"Compiled {count} themes into {args.output}")
+        return 0
+
+    with ThemeBundle(args.bundle) as bundle:
+        if args.name is None:
+            print("\n".join(bundle.names()))
+        elif args.name not in bundle:
+            print(f"No theme {args.name} in {args.bundle}", file=sys.stderr)
+            return 1
+        elif args.colors:
+            print(json.dumps(bundle.get_colors(args.name, args.dark), indent=2))
+        else:
+            print(bundle.get_stylesheet(args.name, args.dark))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,299 @@
+"""
+Color conversions between sRGB, OKLab and OKLCH for compiling themes
+
+A small pure-Python replacement for the parts of coloraide the theme
+compiler uses. Matrices and conversion steps follow coloraide exactly, so
+compiled palettes are identical to the ones it produces.
+"""
+
+import math
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+Vector = List[float]
+
+# sRGB and OKLab matrices as defined by coloraide, via XYZ D65; themes.oklab
+# builds its batch conversions from them
+SRGB_LINEAR_TO_XYZ = (
+    (0.4123907992659593, 0.357584339383878, 0.1804807884018343),
+    (0.21263900587151024, 0.715168678767756, 0.07219231536073371),
+    (0.01933081871559182, 0.11919477979462598, 0.9505321522496607),
+)
+XYZ_TO_SRGB_LINEAR = (
+    (3.240969941904523, -1.5373831775700941, -0.4986107602930035),
+    (-0.9692436362808797, 1.8759675015077204, 0.04155505740717562),
+    (0.05563007969699365, -0.20397695888897652, 1.0569715142428784),
+)
+XYZ_TO_LMS = (
+    (0.819022437996703, 0.3619062600528904, -0.1288737815209879),
+    (0.03298365393238847, 0.9292868615863434, 0.03614466635064236),
+    (0.04817718935962421, 0.2642395317527308, 0.6335478284694309),
+)
+LMS_TO_XYZ = (
+    (1.226879875845924, -0.5578149944602171, 0.2813910456659647),
+    (-0.04057574521480083, 1.112286803280317, -0.07171105806551635),
+    (-0.07637293667466008, -0.42149333240224324, 1.5869240198367818),
+)
+LMS3_TO_OKLAB = (
+    (0.21045426830931396, 0.7936177747023053, -0.0040720430116192585),
+    (1.9779985324311686, -2.42859224204858, 0.450593709617411),
+    (0.025904042465547734, 0.7827717124575297, -0.8086757549230774),
+)
+OKLAB_TO_LMS3 = (
+    (1.0, 0.3963377773761749, 0.21580375730991364),
+    (1.0, -0.10556134581565857, -0.0638541728258133),
+    (1.0, -0.08948417752981186, -1.2914855480194092),
+)
+
+# Below this OKLCH chroma a color is achromatic and its hue is undefined (NaN)
+ACHROMATIC_CHROMA = 1e-6
+
+# CSS Color 4 gamut mapping: the OKLab distance below which clipping is
+# invisible, and the chroma precision of the search
+GAMUT_JND = 0.02
+GAMUT_EPSILON = 0.0001
+
+# Compiled source colors kept before the cache starts over
+_CACHE_LIMIT = 4096
+_compiled: Dict[str, str] = {}
+
+
+def _transform(matrix, vector: Sequence[float]) -> Vector:
+    return [
+        row[0] * vector[0] + row[1] * vector[1] + row[2] * vector[2] for row in matrix
+    ]
+
+
+def _root(value: float, power: float) -> float:
+    if value == 0:
+        return 0.0
+    return math.copysign(abs(value) ** (power**-1), value)
+
+
+def srgb_to_linear(rgb: Sequence[float]) -> Vector:
+    """Remove the sRGB transfer curve, mirrored for negative channels"""
+    return [
+        (
+            math.copysign(((abs(c) + 0.055) / 1.055) ** 2.4, c)
+            if abs(c) > 0.04045
+            else c / 12.92
+        )
+        for c in rgb
+    ]
+
+
+def linear_to_srgb(rgb: Sequence[float]) -> Vector:
+    """Apply the sRGB transfer curve, mirrored for negative channels"""
+    return [
+        (
+            math.copysign(1.055 * _root(abs(c), 2.4) - 0.055, c)
+            if abs(c) > 0.0031308
+            else 12.92 * c
+        )
+        for c in rgb
+    ]
+
+
+def srgb_to_oklab(rgb: Sequence[float]) -> Vector:
+    """Convert sRGB channels in 0-1 to OKLab"""
+    xyz = _transform(SRGB_LINEAR_TO_XYZ, srgb_to_linear(rgb))
+    lms = _transform(XYZ_TO_LMS, xyz)
+    return _transform(LMS3_TO_OKLAB, [_root(c, 3) for c in lms])
+
+
+def oklab_to_srgb(lab: Sequence[float]) -> Vector:
+    """Convert OKLab to sRGB channels, which may fall outside 0-1"""
+    lms = [c**3 for c in _transform(OKLAB_TO_LMS3, lab)]
+    xyz = _transform(LMS_TO_XYZ, lms)
+    return linear_to_srgb(_transform(XYZ_TO_SRGB_LINEAR, xyz))
+
+
+def oklab_to_oklch(lab: Sequence[float]) -> Vector:
+    """Convert OKLab to OKLCH; achromatic colors get a NaN hue"""
+    lightness, a, b = lab
+    chroma = math.sqrt(a**2 + b**2)
+    if abs(chroma) < ACHROMATIC_CHROMA:
+        return [lightness, chroma, math.nan]
+    return [lightness, chroma, math.degrees(math.atan2(b, a)) % 360]
+
+
+def oklch_to_oklab(lch: Sequence[float]) -> Vector:
+    """Convert OKLCH to OKLab, treating an undefined hue as 0"""
+    lightness, chroma, hue = (0.0 if math.isnan(c) else c for c in lch)
+    return [
+        lightness,
+        chroma * math.cos(math.radians(hue)),
+        chroma * math.sin(math.radians(hue)),
+    ]
+
+
+def srgb_to_oklch(rgb: Sequence[float]) -> Vector:
+    """Convert sRGB channels in 0-1 to OKLCH"""
+    return oklab_to_oklch(srgb_to_oklab(rgb))
+
+
+def oklch_to_srgb(lch: Sequence[float]) -> Vector:
+    """Convert OKLCH to sRGB channels, which may fall outside 0-1"""
+    return oklab_to_srgb(oklch_to_oklab(lch))
+
+
+def parse_hex(color: str) -> Tuple[Vector, float]:
+    """Parse a #rgb, #rrggbb or Qt-style #aarrggbb color to sRGB channels and alpha"""
+    digits = color.strip().lstrip("#")
+    if len(digits) == 3:
+        digits = "".join(digit * 2 for digit in digits)
+    if len(digits) not in (6, 8):
+        raise ValueError(f"Invalid hex color: {color}")
+    values = [int(digits[i : i + 2], 16) / 255 for i in range(0, len(digits), 2)]
+    if len(values) == 4:
+        return values[1:], values[0]
+    return values, 1.0
+
+
+def parse_oklch(color: str) -> Tuple[Vector, float]:
+    """Parse an ``oklch(L C H)`` or ``oklch(L C H / A)`` string to OKLCH and alpha"""
+    color = color.strip()
+    if not (color.startswith("oklch(") and color.endswith(")")):
+        raise ValueError(f"Invalid OKLCH color: {color}")
+    coords, _, alpha = color[6:-1].partition("/")
+    values = [float(value) for value in coords.split()]
+    if len(values) != 3:
+        raise ValueError(f"Invalid OKLCH color: {color}")
+    alpha = alpha.strip()
+    if not alpha:
+        return values, 1.0
+    if alpha.endswith("%"):
+        return values, float(alpha[:-1]) / 100
+    return values, float(alpha)
+
+
+def to_rgba(rgb: Sequence[float], alpha: float = 1.0) -> Tuple[int, int, int, int]:
+    """Round sRGB channels and alpha to clamped 0-255 integers"""
+    r, g, b = (max(0, min(255, round(c * 255))) for c in rgb)
+    return r, g, b, max(0, min(255, round(alpha * 255)))
+
+
+def to_hex(rgb: Sequence[float], alpha: float = 1.0) -> str:
+    """Round sRGB channels to #rrggbb, or to Qt's #aarrggbb if translucent"""
+    r, g, b, a = to_rgba(rgb, alpha)
+    if a < 255:
+        return f"#{a:02x}{r:02x}{g:02x}{b:02x}"
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def in_srgb_gamut(rgb: Sequence[float]) -> bool:
+    """Check if sRGB channels are all within 0-1"""
+    return all(0.0 <= c <= 1.0 for c in rgb)
+
+
+def _clip(rgb: Sequence[float]) -> Vector:
+    return [min(1.0, max(0.0, c)) for c in rgb]
+
+
+def _delta_eok(lab: Sequence[float], rgb: Sequence[float]) -> float:
+    other = srgb_to_oklab(rgb)
+    return math.sqrt(sum((a - b) ** 2 for a, b in zip(lab, other)))
+
+
+def gamut_map(lch: Sequence[float]) -> Vector:
+    """Map OKLCH into sRGB by reducing chroma, per CSS Color 4
+
+    Lightness and hue are kept. Chroma is bisected down to the most
+    saturated color whose clipped form is within a just noticeable
+    difference of it, and that clipped form is returned.
+    """
+    lightness, chroma, hue = lch
+    if lightness >= 1.0:
+        return [1.0, 1.0, 1.0]
+    if lightness <= 0.0:
+        return [0.0, 0.0, 0.0]
+    rgb = oklch_to_srgb(lch)
+    if in_srgb_gamut(rgb):
+        return rgb
+
+    clipped = _clip(rgb)
+    if _delta_eok(oklch_to_oklab(lch), clipped) < GAMUT_JND:
+        return clipped
+
+    low, high, low_in_gamut = 0.0, chroma, True
+    while high - low > GAMUT_EPSILON:
+        current = [lightness, (low + high) / 2, hue]
+        rgb = oklch_to_srgb(current)
+        if low_in_gamut and in_srgb_gamut(rgb):
+            low = current[1]
+            continue
+        clipped = _clip(rgb)
+        delta = _delta_eok(oklch_to_oklab(current), clipped)
+        if delta < GAMUT_JND:
+            if GAMUT_JND - delta < GAMUT_EPSILON:
+                return clipped
+            low_in_gamut = False
+            low = current[1]
+        else:
+            high = current[1]
+    return clipped
+
+
+def compile_colors(colors: Iterable[str]) -> List[str]:
+    """Convert source colors to the hex form Qt reads
+
+    ``oklch(...)`` colors are gamut mapped and rounded, translucent ones
+    keep their alpha as #aarrggbb, and other values pass through. Results
+    are cached per source string, so only colors never seen before are
+    converted.
+    """
+    colors = list(colors)
+    missing = [color for color in dict.fromkeys(colors) if color not in _compiled]
+    if len(_compiled) + len(missing) > _CACHE_LIMIT:
+        _compiled.clear()
+        missing = list(dict.fromkeys(colors))
+    for color in missing:
+        if not color.startswith("oklch("):
+            _compiled[color] = color
+            continue
+        try:
+            lch, alpha = parse_oklch(color)
+        except ValueError as e:
+            print(f"Error converting OKLCH color {color}: {e}")
+            _compiled[color] = "#000000"
+        else:
+            _compiled[color] = to_hex(gamut_map(lch), alpha)
+    return [_compiled[color] for color in colors]
+
+
+def mix(
+    start: Tuple[Sequence[float], float],
+    end: Tuple[Sequence[float], float],
+    amount: float,
+) -> Tuple[Vector, float]:
+    """Interpolate two (sRGB, alpha) colors in OKLCH along the shorter hue arc
+
+    Channels are premultiplied by alpha, and an undefined hue takes the hue
+    of the other color, as in CSS color mixing.
+    """
+    (l1, c1, h1), a1 = srgb_to_oklch(start[0]), start[1]
+    (l2, c2, h2), a2 = srgb_to_oklch(end[0]), end[1]
+
+    if math.isnan(h1):
+        h1 = h2
+    elif math.isnan(h2):
+        h2 = h1
+    if not math.isnan(h1):
+        h1 %= 360
+        h2 %= 360
+        if h2 - h1 > 180:
+            h1 += 360
+        elif h2 - h1 < -180:
+            h2 += 360
+
+    if a1 != 1.0:
+        l1, c1 = l1 * a1, c1 * a1
+    if a2 != 1.0:
+        l2, c2 = l2 * a2, c2 * a2
+
+    lightness = l1 + (l2 - l1) * amount
+    chroma = c1 + (c2 - c1) * amount
+    hue = h1 + (h2 - h1) * amount
+    alpha = a1 + (a2 - a1) * amount
+    if alpha not in (0.0, 1.0):
+        lightness, chroma = lightness / alpha, chroma / alpha
+    return oklch_to_srgb([lightness, chroma, hue]), alpha
@@ -0,0 +1,268 @@
+"""
+Generate complete light and dark themes from seed colors
+
+Palettes follow the structure of the shipped accent themes: a tinted
+neutral scale for surfaces and text, the seed as primary and ring, and
+fixed destructive and chart colors. Curves are evaluated with NumPy for
+whole batches of seeds at once.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from themes import color
+from themes.base import ShadcnTheme
+from themes.oklab import hex_to_oklch
+
+Seed = Union[str, Tuple[float, float, float]]
+Palettes = Dict[bool, Dict[str, str]]
+
+# Bump when the curves change so cached palettes are regenerated
+GENERATOR_VERSION = 1
+
+# Seeds processed per worker task; smaller batches are generated in-process
+CHUNK_SIZE = 2048
+
+# Neutral tokens as (lightness, chroma) at full tint, per mode
+_NEUTRALS: Dict[bool, Dict[str, Tuple[float, float]]] = {
+    False: {
+        "background": (0.984, 0.003),
+        "foreground": (0.208, 0.042),
+        "card": (0.984, 0.003),
+        "card-foreground": (0.208, 0.042),
+        "popover": (0.984, 0.003),
+        "popover-foreground": (0.208, 0.042),
+        "secondary": (0.968, 0.007),
+        "secondary-foreground": (0.208, 0.042),
+        "muted": (0.968, 0.007),
+        "muted-foreground": (0.551, 0.027),
+        "accent": (0.968, 0.007),
+        "accent-foreground": (0.208, 0.042),
+        "destructive-foreground": (0.984, 0.003),
+        "border": (0.928, 0.006),
+        "input": (0.928, 0.006),
+        "sidebar": (0.208, 0.042),
+        "sidebar-foreground": (0.984, 0.003),
+        "sidebar-accent": (0.279, 0.041),
+        "sidebar-accent-foreground": (0.984, 0.003),
+        "sidebar-border": (0.928, 0.006),
+    },
+    True: {
+        "background": (0.208, 0.042),
+        "foreground": (0.984, 0.003),
+        "card": (0.223, 0.042),
+        "card-foreground": (0.984, 0.003),
+        "popover": (0.223, 0.042),
+        "popover-foreground": (0.984, 0.003),
+        "secondary": (0.279, 0.041),
+        "secondary-foreground": (0.984, 0.003),
+        "muted": (0.279, 0.041),
+        "muted-foreground": (0.707, 0.022),
+        "accent": (0.279, 0.041),
+        "accent-foreground": (0.984, 0.003),
+        "destructive-foreground": (0.984, 0.003),
+        "sidebar": (0.21, 0.034),
+        "sidebar-foreground": (0.985, 0.002),
+        "sidebar-accent": (0.278, 0.033),
+        "sidebar-accent-foreground": (0.985, 0.002),
+    },
+}
+
+# Tokens that take the seed color, and those drawn on top of it
+_SEED_TOKENS = ("primary", "ring", "sidebar-primary", "sidebar-ring")
+_ON_SEED_TOKENS = ("primary-foreground", "sidebar-primary-foreground")
+
+# Lightness range the seed is clamped to, per mode, to stay usable as a fill
+_SEED_LIGHTNESS = {False: (0.35, 0.75), True: (0.45, 0.85)}
+
+# Primaries lighter than this get dark text instead of light text
+_ON_SEED_THRESHOLD = 0.7
+
+# Seed chroma at which neutrals reach their full tint
+_FULL_TINT_CHROMA = 0.1
+
+# Tokens shared by every generated theme, as in the shipped themes
+_FIXED: Dict[bool, Dict[str, str]] = {
+    False: {
+        "destructive": "oklch(0.704 0.191 22.216)",
+        "chart-1": "oklch(0.488 0.243 264.376)",
+        "chart-2": "oklch(0.696 0.17 162.48)",
+        "chart-3": "oklch(0.769 0.188 70.08)",
+        "chart-4": "oklch(0.627 0.265 303.9)",
+        "chart-5": "oklch(0.645 0.246 16.439)",
+    },
+    True: {
+        "destructive": "oklch(0.704 0.191 22.216)",
+        "border": "oklch(1 0 0 / 10%)",
+        "input": "oklch(1 0 0 / 15%)",
+        "chart-1": "oklch(0.488 0.243 264.376)",
+        "chart-2": "oklch(0.696 0.17 162.48)",
+        "chart-3": "oklch(0.769 0.188 70.08)",
+        "chart-4": "oklch(0.627 0.265 303.9)",
+        "chart-5": "oklch(0.645 0.246 16.439)",
+        "sidebar-border": "oklch(1 0 0 / 10%)",
+    },
+}
+
+# Generated palettes kept before the cache starts over
+_CACHE_LIMIT = 4096
+_cache: Dict[str, Palettes] = {}
+
+
+class GeneratedTheme(ShadcnTheme):
+    """Theme with palettes generated from a seed color"""
+
+    def __init__(self, name: str, palettes: Palettes, seed: Seed = ""):
+        super().__init__()
+        self._name = name
+        self.seed = seed
+        self._light_colors = dict(palettes[False])
+        self._dark_colors = dict(palettes[True])
+
+    @property
+    def name(self) -> str:
+        """Get the name of the theme"""
+        return self._name
+
+
+def parse_seeds(seeds: Sequence[Seed]) -> np.ndarray:
+    """Convert hex, ``oklch(...)`` or (l, c, h) seeds to an (n, 3) OKLCH array"""
+    result = np.zeros((len(seeds), 3))
+    hex_indices = []
+    for index, seed in enumerate(seeds):
+        if isinstance(seed, str) and seed.strip().startswith("#"):
+            hex_indices.append(index)
+        elif isinstance(seed, str) and seed.strip().startswith("oklch("):
+            values = seed.strip()[6:-1].split("/")[0].split()
+            result[index] = [float(value) for value in values[:3]]
+        elif isinstance(seed, str):
+            raise ValueError(f"Unsupported seed color: {seed}")
+        else:
+            result[index] = seed
+    if hex_indices:
+        result[hex_indices] = hex_to_oklch([seeds[index] for index in hex_indices])
+    return result
+
+
+def _format(
+    lightness_column: np.ndarray, chroma_column: np.ndarray, hue_column: np.ndarray
+) -> List[str]:
+    """Format columns of OKLCH values as CSS color strings"""
+    return [
+        f"oklch({lightness:.3f} {chroma:.3f} {hue:.3f})"
+        for lightness, chroma, hue in zip(
+            lightness_column.tolist(), chroma_column.tolist(), hue_column.tolist()
+        )
+    ]
+
+
+def generate_palette_batch(seeds: np.ndarray) -> List[Palettes]:
+    """Generate light and dark palettes for an (n, 3) array of OKLCH seeds"""
+    seeds = np.asarray(seeds, dtype=np.float64).reshape(-1, 3)
+    count = len(seeds)
+    seed_lightness, seed_chroma, seed_hue = seeds[:, 0], seeds[:, 1], seeds[:, 2]
+    # Gray seeds have no hue, with the same threshold as themes.color
+    seed_hue = np.where(seed_chroma >= color.ACHROMATIC_CHROMA, seed_hue % 360.0, 0.0)
+    tint = np.clip(seed_chroma / _FULL_TINT_CHROMA, 0.0, 1.0)
+
+    palettes: List[Palettes] = [{False: {}, True: {}} for _ in range(count)]
+    for mode in (False, True):
+        columns: Dict[str, List[str]] = {}
+        for token, (lightness, chroma) in _NEUTRALS[mode].items():
+            columns[token] = _format(np.full(count, lightness), chroma * tint, seed_hue)
+
+        low, high = _SEED_LIGHTNESS[mode]
+        primary_lightness = np.clip(seed_lightness, low, high)
+        primary = _format(primary_lightness, seed_chroma, seed_hue)
+        for token in _SEED_TOKENS:
+            columns[token] = primary
+
+        dark_text = primary_lightness > _ON_SEED_THRESHOLD
+        on_seed = _format(
+            np.where(dark_text, 0.208, 0.984),
+            np.where(dark_text, 0.042, 0.003) * tint,
+            seed_hue,
+        )
+        for token in _ON_SEED_TOKENS:
+            columns[token] = on_seed
+
+        for index, palette in enumerate(palettes):
+            colors = palette[mode]
+            for token, column in columns.items():
+                colors[token] = column[index]
+            colors.update(_FIXED[mode])
+    return palettes
+
+
+def _cache_key(seed: np.ndarray) -> str:
+    return f"{GENERATOR_VERSION}:{seed[0]:.4f}:{seed[1]:.4f}:{seed[2]:.3f}"
+
+
+def generate_palettes(
+    seeds: Sequence[Seed], workers: Optional[int] = None
+) -> List[Palettes]:
+    """Generate palettes for many seeds, reusing cached results
+
+    Uncached seeds are split into chunks of ``CHUNK_SIZE`` and generated in
+    a process pool when there is more than one chunk; ``workers=0`` keeps
+    everything in this process. Every call returns its own copies, so
+    editing a palette does not change later results.
+    """
+    parsed = parse_seeds(seeds)
+    keys = [_cache_key(seed) for seed in parsed]
+    found = {key: _cache[key] for key in keys if key in _cache}
+    missing: Dict[str, int] = {}
+    for index, key in enumerate(keys):
+        if key not in found and key not in missing:
+            missing[key] = index
+
+    if missing:
+        batch = parsed[list(missing.values())]
+        chunks = [
+            batch[start : start + CHUNK_SIZE]
+            for start in range(0, len(batch), CHUNK_SIZE)
+        ]
+        if len(chunks) == 1 or workers == 0:
+            results = [generate_palette_batch(chunk) for chunk in chunks]
+        else:
+            max_workers = min(len(chunks), workers or os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                results = list(pool.map(generate_palette_batch, chunks))
+        generated = [palettes for chunk in results for palettes in chunk]
+        fresh = dict(zip(missing.keys(), generated))
+        found.update(fresh)
+        if len(_cache) + len(fresh) > _CACHE_LIMIT:
+            _cache.clear()
+        if len(fresh) <= _CACHE_LIMIT:
+            _cache.update(fresh)
+
+    return [{mode: dict(colors) for mode, colors in found[key].items()} for key in keys]
+
+
+def generate_theme(seed: Seed, name: Optional[str] = None) -> GeneratedTheme:
+    """Generate a light and dark theme from one seed color"""
+    return generate_themes([seed], [name] if name else None)[0]
+
+
+def generate_themes(
+    seeds: Sequence[Seed],
+    names: Optional[Sequence[str]] = None,
+    workers: Optional[int] = None,
+) -> List[GeneratedTheme]:
+    """Generate themes for a list of seed colors, e.g. tenant brand colors"""
+    palettes = generate_palettes(seeds, workers)
+    if names is None:
+        names = [
+            seed if isinstance(seed, str) else "oklch({} {} {})".format(*seed)
+            for seed in seeds
+        ]
+    return [
+        GeneratedTheme(name, theme_palettes, seed)
+        for name, theme_palettes, seed in zip(names, palettes, seeds)
+    ]
+
+
+def clear_cache():
+    """Forget every generated palette"""
+    _cache.clear()
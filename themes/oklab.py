@@ -0,0 +1,245 @@
+"""
+Vectorized OKLab/OKLCH and sRGB conversions for batches of colors
+
+The NumPy counterparts of ``themes.color``, built from its matrices and
+achromatic threshold so audits and generated themes agree with compiled
+palettes.
+"""
+
+from typing import Optional, Sequence, Tuple
+import numpy as np
+from themes import color
+
+# The matrices of themes.color, so batch results match it
+_SRGB_LINEAR_TO_XYZ = np.array(color.SRGB_LINEAR_TO_XYZ)
+_XYZ_TO_SRGB_LINEAR = np.array(color.XYZ_TO_SRGB_LINEAR)
+_XYZ_TO_LMS = np.array(color.XYZ_TO_LMS)
+_LMS_TO_XYZ = np.array(color.LMS_TO_XYZ)
+_LMS3_TO_OKLAB = np.array(color.LMS3_TO_OKLAB)
+_OKLAB_TO_LMS3 = np.array(color.OKLAB_TO_LMS3)
+
+
+def _parse_hex(colors: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Parse hex colors to (n, 3) sRGB channels and (n,) alphas
+
+    Uses ``themes.color.parse_hex``, so translucent palette colors in Qt's
+    #aarrggbb form are read as such.
+    """
+    parsed = [color.parse_hex(value) for value in colors]
+    srgb = np.array([channels for channels, _ in parsed], dtype=np.float64)
+    alpha = np.array([alpha for _, alpha in parsed], dtype=np.float64)
+    return srgb.reshape(-1, 3), alpha
+
+
+def hex_to_srgb(colors: Sequence[str]) -> np.ndarray:
+    """Convert #rgb, #rrggbb or #aarrggbb colors to (n, 3) sRGB in 0-1"""
+    return _parse_hex(colors)[0]
+
+
+def srgb_to_linear(srgb: np.ndarray) -> np.ndarray:
+    """Remove the sRGB transfer curve, mirrored for negative channels"""
+    magnitude = np.abs(srgb)
+    return np.where(
+        magnitude > 0.04045,
+        np.sign(srgb) * ((magnitude + 0.055) / 1.055) ** 2.4,
+        srgb / 12.92,
+    )
+
+
+def linear_to_srgb(linear: np.ndarray) -> np.ndarray:
+    """Apply the sRGB transfer curve"""
+    linear = np.clip(linear, 0.0, None)
+    return np.where(
+        linear <= 0.0031308, linear * 12.92, 1.055 * linear ** (1 / 2.4) - 0.055
+    )
+
+
+def _linear_to_oklab(linear: np.ndarray) -> np.ndarray:
+    lms = linear @ _SRGB_LINEAR_TO_XYZ.T @ _XYZ_TO_LMS.T
+    return np.cbrt(lms) @ _LMS3_TO_OKLAB.T
+
+
+def linear_srgb_to_oklch(linear: np.ndarray) -> np.ndarray:
+    """Convert (n, 3) linear sRGB to OKLCH lightness, chroma, hue in degrees
+
+    Like ``themes.color.oklab_to_oklch``, achromatic colors get a NaN hue.
+    """
+    lab = _linear_to_oklab(linear)
+    chroma = np.hypot(lab[:, 1], lab[:, 2])
+    hue = np.degrees(np.arctan2(lab[:, 2], lab[:, 1])) % 360.0
+    hue[chroma < color.ACHROMATIC_CHROMA] = np.nan
+    return np.column_stack((lab[:, 0], chroma, hue))
+
+
+def oklch_to_linear_srgb(oklch: np.ndarray) -> np.ndarray:
+    """Convert (n, 3) OKLCH to linear sRGB, which may fall outside 0-1"""
+    lms = (_oklch_to_oklab(oklch) @ _OKLAB_TO_LMS3.T) ** 3
+    return lms @ _LMS_TO_XYZ.T @ _XYZ_TO_SRGB_LINEAR.T
+
+
+def _srgb_to_oklab(srgb: np.ndarray) -> np.ndarray:
+    return _linear_to_oklab(srgb_to_linear(srgb))
+
+
+def _oklch_to_oklab(oklch: np.ndarray) -> np.ndarray:
+    """Convert OKLCH to OKLab, treating an undefined hue as 0"""
+    hue = np.radians(np.nan_to_num(oklch[:, 2]))
+    return np.column_stack(
+        (oklch[:, 0], oklch[:, 1] * np.cos(hue), oklch[:, 1] * np.sin(hue))
+    )
+
+
+def _to_srgb(oklch: np.ndarray) -> np.ndarray:
+    """Convert OKLCH to sRGB without clipping, mirroring the curve below 0"""
+    linear = oklch_to_linear_srgb(oklch)
+    return np.sign(linear) * linear_to_srgb(np.abs(linear))
+
+
+def gamut_map(
+    oklch: np.ndarray,
+    jnd: float = color.GAMUT_JND,
+    epsilon: float = color.GAMUT_EPSILON,
+) -> np.ndarray:
+    """Map (n, 3) OKLCH into sRGB by reducing chroma, per CSS Color 4
+
+    The same search as ``themes.color.gamut_map``, run for every color at
+    once; returns (n, 3) sRGB channels in 0-1.
+    """
+    oklch = np.asarray(oklch, dtype=np.float64).reshape(-1, 3)
+    lightness = oklch[:, 0]
+    srgb = _to_srgb(oklch)
+    result = np.clip(srgb, 0.0, 1.0)
+    result[lightness >= 1.0] = 1.0
+    result[lightness <= 0.0] = 0.0
+
+    # In gamut, or close enough that clipping is invisible
+    done = (srgb >= 0.0).all(axis=1) & (srgb <= 1.0).all(axis=1)
+    done |= (lightness >= 1.0) | (lightness <= 0.0)
+    outside = np.nonzero(~done)[0]
+    delta = np.linalg.norm(
+        _oklch_to_oklab(oklch[outside]) - _srgb_to_oklab(result[outside]), axis=1
+    )
+    done[outside[delta < jnd]] = True
+
+    low = np.zeros(len(oklch))
+    high = oklch[:, 1].copy()
+    low_in_gamut = np.ones(len(oklch), dtype=bool)
+    active = ~done & (high - low > epsilon)
+    while active.any():
+        rows = np.nonzero(active)[0]
+        chroma = (low[rows] + high[rows]) / 2
+        current = oklch[rows].copy()
+        current[:, 1] = chroma
+        srgb = _to_srgb(current)
+        in_gamut = (srgb >= 0.0).all(axis=1) & (srgb <= 1.0).all(axis=1)
+
+        raise_low = low_in_gamut[rows] & in_gamut
+        clipped = np.clip(srgb, 0.0, 1.0)
+        delta = np.linalg.norm(
+            _oklch_to_oklab(current) - _srgb_to_oklab(clipped), axis=1
+        )
+        close = ~raise_low & (delta < jnd)
+        finished = close & (jnd - delta < epsilon)
+        clip_rows = ~raise_low
+
+        result[rows[clip_rows]] = clipped[clip_rows]
+        low_in_gamut[rows[close & ~finished]] = False
+        low[rows[raise_low | (close & ~finished)]] = chroma[
+            raise_low | (close & ~finished)
+        ]
+        high[rows[~raise_low & ~close]] = chroma[~raise_low & ~close]
+        done[rows[finished]] = True
+        active = ~done & (high - low > epsilon)
+    return result
+
+
+def oklch_ramp(stops: np.ndarray, size: int = 256) -> np.ndarray:
+    """Interpolate evenly spaced (n, 4) sRGB and alpha stops in OKLCH
+
+    Each segment blends like ``themes.color.mix``: premultiplied by alpha,
+    along the shorter hue arc, with a gray stop taking the hue of the other
+    end. Returns (size, 4) gamut mapped sRGB and alpha.
+    """
+    stops = np.asarray(stops, dtype=np.float64).reshape(-1, 4)
+    if len(stops) < 2:
+        raise ValueError("A ramp needs at least two stops")
+    oklch = linear_srgb_to_oklch(srgb_to_linear(stops[:, :3]))
+    alpha = stops[:, 3]
+    hue = oklch[:, 2]
+
+    position = np.linspace(0.0, len(stops) - 1, size)
+    first = np.minimum(position.astype(np.intp), len(stops) - 2)
+    second = first + 1
+    t = position - first
+    h1, h2 = hue[first], hue[second]
+    h1, h2 = np.where(np.isnan(h1), h2, h1), np.where(np.isnan(h2), h1, h2)
+    h1, h2 = np.nan_to_num(h1), np.nan_to_num(h2)
+    arc = (h2 - h1 + 180.0) % 360.0 - 180.0
+
+    a1, a2 = alpha[first], alpha[second]
+    mixed_alpha = a1 + (a2 - a1) * t
+    premultiplied = oklch[:, :2] * alpha[:, None]
+    lightness_chroma = (
+        premultiplied[first]
+        + (premultiplied[second] - premultiplied[first]) * t[:, None]
+    )
+    with np.errstate(invalid="ignore", divide="ignore"):
+        lightness_chroma = np.where(
+            mixed_alpha[:, None] > 0, lightness_chroma / mixed_alpha[:, None], 0.0
+        )
+    mixed = np.column_stack((lightness_chroma, (h1 + arc * t) % 360.0))
+    return np.column_stack((gamut_map(mixed), mixed_alpha))
+
+
+def hex_to_oklch(colors: Sequence[str]) -> np.ndarray:
+    """Convert hex colors to an (n, 3) array of OKLCH lightness, chroma, hue"""
+    return linear_srgb_to_oklch(srgb_to_linear(hex_to_srgb(colors)))
+
+
+def parse_colors(colors: Sequence[Optional[str]]) -> np.ndarray:
+    """Parse ``oklch(...)`` and hex strings to an (n, 4) OKLCH and alpha array
+
+    ``None`` entries, e.g. tokens a palette lacks, become rows of NaN.
+    """
+    values, indices = parse_unique_colors(colors)
+    return values[indices]
+
+
+def parse_unique_colors(
+    colors: Sequence[Optional[str]],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Parse each distinct color once, since palettes repeat most values
+
+    Returns the OKLCH and alpha rows of the distinct colors, and the row of
+    each input color.
+    """
+    unique = list(dict.fromkeys(colors))
+    positions = {color: position for position, color in enumerate(unique)}
+    indices = np.fromiter(
+        map(positions.__getitem__, colors), dtype=np.intp, count=len(colors)
+    )
+
+    values = np.ones((len(unique), 4))
+    hex_rows = []
+    for row, color in enumerate(unique):
+        if color is None:
+            values[row] = np.nan
+            continue
+        color = color.strip()
+        if color.startswith("oklch(") and color.endswith(")"):
+            parts = color[6:-1].replace("/", " ").split()
+            values[row, :3] = [float(part) for part in parts[:3]]
+            if len(parts) > 3:
+                alpha = parts[3]
+                values[row, 3] = (
+                    float(alpha[:-1]) / 100 if alpha.endswith("%") else float(alpha)
+                )
+        elif color.startswith("#"):
+            hex_rows.append(row)
+        else:
+            raise ValueError(f"Unsupported color: {color}")
+    if hex_rows:
+        srgb, alpha = _parse_hex([unique[row] for row in hex_rows])
+        values[hex_rows, :3] = linear_srgb_to_oklch(srgb_to_linear(srgb))
+        values[hex_rows, 3] = alpha
+    return values, indices
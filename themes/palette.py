@@ -0,0 +1,195 @@
+"""
+Compiled color palettes packed into an array indexed by token id
+"""
+
+from array import array
+from enum import IntEnum
+from functools import lru_cache
+from typing import Dict, Iterator, Mapping, Optional, Set, Union
+
+
+class ColorToken(IntEnum):
+    """Ids of the color tokens every compiled palette can hold"""
+
+    BACKGROUND = 0
+    FOREGROUND = 1
+    CARD = 2
+    CARD_FOREGROUND = 3
+    POPOVER = 4
+    POPOVER_FOREGROUND = 5
+    PRIMARY = 6
+    PRIMARY_FOREGROUND = 7
+    SECONDARY = 8
+    SECONDARY_FOREGROUND = 9
+    MUTED = 10
+    MUTED_FOREGROUND = 11
+    ACCENT = 12
+    ACCENT_FOREGROUND = 13
+    DESTRUCTIVE = 14
+    DESTRUCTIVE_FOREGROUND = 15
+    BORDER = 16
+    INPUT = 17
+    RING = 18
+    CHART_1 = 19
+    CHART_2 = 20
+    CHART_3 = 21
+    CHART_4 = 22
+    CHART_5 = 23
+    SIDEBAR = 24
+    SIDEBAR_FOREGROUND = 25
+    SIDEBAR_PRIMARY = 26
+    SIDEBAR_PRIMARY_FOREGROUND = 27
+    SIDEBAR_ACCENT = 28
+    SIDEBAR_ACCENT_FOREGROUND = 29
+    SIDEBAR_BORDER = 30
+    SIDEBAR_RING = 31
+    BACKGROUND_HOVER = 32
+    BACKGROUND_PRESSED = 33
+    BACKGROUND_DISABLED = 34
+    PRIMARY_HOVER = 35
+    PRIMARY_PRESSED = 36
+    PRIMARY_DISABLED = 37
+    SECONDARY_HOVER = 38
+    SECONDARY_PRESSED = 39
+    SECONDARY_DISABLED = 40
+    ACCENT_HOVER = 41
+    ACCENT_PRESSED = 42
+    ACCENT_DISABLED = 43
+    MUTED_HOVER = 44
+    MUTED_PRESSED = 45
+    MUTED_DISABLED = 46
+    DESTRUCTIVE_HOVER = 47
+    DESTRUCTIVE_PRESSED = 48
+    DESTRUCTIVE_DISABLED = 49
+    FOCUS_RING = 50
+
+    @property
+    def token(self) -> str:
+        """Get the token name, e.g. ``sidebar-primary-foreground``"""
+        return TOKEN_NAMES[self]
+
+
+TOKEN_NAMES = tuple(member.name.lower().replace("_", "-") for member in ColorToken)
+TOKEN_IDS: Dict[str, int] = {name: index for index, name in enumerate(TOKEN_NAMES)}
+
+
+@lru_cache(maxsize=1024)
+def format_rgba(value: int) -> str:
+    """Format a packed 0xAARRGGBB color as #rrggbb, or #aarrggbb if translucent"""
+    if value >> 24 == 0xFF:
+        return f"#{value & 0xFFFFFF:06x}"
+    return f"#{value:08x}"
+
+
+def pack_color(color: str) -> Optional[int]:
+    """Pack a compiled hex color to 0xAARRGGBB, the QRgb layout
+
+    Returns None unless the color is in the exact form ``format_rgba``
+    writes, so unpacking always gives back the same string.
+    """
+    if len(color) not in (7, 9) or color[0] != "#":
+        return None
+    try:
+        value = int(color[1:], 16)
+    except ValueError:
+        return None
+    if len(color) == 7:
+        value |= 0xFF000000
+    return value if format_rgba(value) == color else None
+
+
+class Palette(Mapping[str, str]):
+    """A compiled palette read like a dictionary of hex colors
+
+    Colors of ``ColorToken`` tokens are packed as 0xAARRGGBB integers in
+    one ``array('I')`` indexed by token id; any other token, or a value
+    that is not plain hex, is kept as a string. ``rgba`` reads a packed
+    color directly, e.g. for ``QColor.fromRgba``.
+    """
+
+    __slots__ = ("_rgba", "_mask", "_extra")
+
+    def __init__(self, colors: Optional[Mapping[str, str]] = None):
+        self._rgba = array("I", bytes(4 * len(TOKEN_NAMES)))
+        # Bit n is set when token id n has a packed color
+        self._mask = 0
+        self._extra: Dict[str, str] = {}
+        for name, value in (colors or {}).items():
+            self.set(name, value)
+
+    def set(self, name: str, value: Optional[str]):
+        """Set or remove (with None) the color of a token"""
+        index = TOKEN_IDS.get(name)
+        packed = None if index is None or value is None else pack_color(value)
+        if index is not None:
+            if packed is None:
+                self._mask &= ~(1 << index)
+                self._rgba[index] = 0
+            else:
+                self._mask |= 1 << index
+                self._rgba[index] = packed
+        if value is None or packed is not None:
+            self._extra.pop(name, None)
+        else:
+            self._extra[name] = value
+
+    def rgba(self, token: Union[str, int]) -> Optional[int]:
+        """Get the packed 0xAARRGGBB color of a token, if it is packed"""
+        index = TOKEN_IDS.get(token) if isinstance(token, str) else token
+        if index is None or not self._mask >> index & 1:
+            return None
+        return self._rgba[index]
+
+    def get(self, name: str, default=None):
+        index = TOKEN_IDS.get(name)
+        if index is not None and self._mask >> index & 1:
+            return format_rgba(self._rgba[index])
+        return self._extra.get(name, default)
+
+    def __getitem__(self, name: str) -> str:
+        value = self.get(name)
+        if value is None:
+            raise KeyError(name)
+        return value
+
+    def __contains__(self, name: object) -> bool:
+        index = TOKEN_IDS.get(name) if isinstance(name, str) else None
+        if index is not None and self._mask >> index & 1:
+            return True
+        return name in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        for index, name in enumerate(TOKEN_NAMES):
+            if self._mask >> index & 1:
+                yield name
+        yield from self._extra
+
+    def __len__(self) -> int:
+        return bin(self._mask).count("1") + len(self._extra)
+
+    def __repr__(self) -> str:
+        return f"Palette({dict(self)!r})"
+
+    def diff(self, other: "Palette") -> Set[str]:
+        """Get the tokens whose colors differ between two palettes
+
+        Packed colors are compared as one vectorized array comparison.
+        """
+        import numpy as np
+
+        changed: Set[str] = set()
+        if self._rgba != other._rgba:
+            first = np.frombuffer(self._rgba, dtype=np.uint32)
+            second = np.frombuffer(other._rgba, dtype=np.uint32)
+            for index in np.flatnonzero(first != second).tolist():
+                changed.add(TOKEN_NAMES[index])
+        # Absent tokens are stored as 0, so presence changes need the masks
+        presence = self._mask ^ other._mask
+        while presence:
+            bit = presence & -presence
+            changed.add(TOKEN_NAMES[bit.bit_length() - 1])
+            presence ^= bit
+        for name in self._extra.keys() | other._extra.keys():
+            if self._extra.get(name) != other._extra.get(name):
+                changed.add(name)
+        return changed
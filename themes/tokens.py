@@ -0,0 +1,189 @@
+"""
+Design tokens with declared dependencies between base and derived tokens
+"""
+
+from typing import Callable, Dict, List, Mapping, Optional, Set, Tuple, Union
+
+TokenValue = Union[str, int, float]
+
+
+class DerivedToken:
+    """A token computed from other tokens
+
+    ``compute`` receives the values of ``inputs`` in order. The token is
+    only defined while all of its inputs are.
+    """
+
+    def __init__(self, inputs: Tuple[str, ...], compute: Callable[..., TokenValue]):
+        self.inputs = inputs
+        self.compute = compute
+
+
+class TokenGraph:
+    """Base token values plus the derived tokens that depend on them
+
+    Derived tokens are evaluated in declaration order, so a derived token
+    may use base tokens and derived tokens declared before it. Changing a
+    base token re-evaluates only the derived tokens downstream of it.
+    ``evaluated`` supplies the derived values up front instead.
+    """
+
+    def __init__(
+        self,
+        base: Mapping[str, TokenValue],
+        derived: Dict[str, DerivedToken],
+        evaluated: Optional[Mapping[str, TokenValue]] = None,
+    ):
+        self._derived = derived
+        self._order = {name: index for index, name in enumerate(derived)}
+        self._dependents: Dict[str, List[str]] = {}
+        for name, token in derived.items():
+            for token_input in token.inputs:
+                self._dependents.setdefault(token_input, []).append(name)
+
+        self.values: Dict[str, TokenValue] = {
+            name: value for name, value in base.items() if name not in derived
+        }
+        if evaluated is not None:
+            # Derived values computed earlier, e.g. a compiled palette
+            for name in derived:
+                if name in evaluated:
+                    self.values[name] = evaluated[name]
+            return
+        for name in derived:
+            self._evaluate(name)
+
+    def _evaluate(self, name: str):
+        token = self._derived[name]
+        if all(token_input in self.values for token_input in token.inputs):
+            self.values[name] = token.compute(
+                *(self.values[token_input] for token_input in token.inputs)
+            )
+        else:
+            self.values.pop(name, None)
+
+    def is_derived(self, name: str) -> bool:
+        """Check if a token is computed from other tokens"""
+        return name in self._derived
+
+    def dependents(self, name: str) -> Set[str]:
+        """Get every token that directly or indirectly depends on a token"""
+        found: Set[str] = set()
+        stack = list(self._dependents.get(name, ()))
+        while stack:
+            dependent = stack.pop()
+            if dependent not in found:
+                found.add(dependent)
+                stack.extend(self._dependents.get(dependent, ()))
+        return found
+
+    def set(self, name: str, value: Optional[TokenValue]) -> Set[str]:
+        """Set or remove a base token, returning every token whose value changed"""
+        if name in self._derived:
+            inputs = ", ".join(self._derived[name].inputs)
+            raise ValueError(f"Token {name} is derived from {inputs}")
+
+        previous = self.values.get(name)
+        if value is None:
+            self.values.pop(name, None)
+        else:
+            self.values[name] = value
+        if self.values.get(name) == previous:
+            return set()
+
+        changed = {name}
+        for dependent in sorted(self.dependents(name), key=self._order.__getitem__):
+            if changed.intersection(self._derived[dependent].inputs):
+                old_value = self.values.get(dependent)
+                self._evaluate(dependent)
+                if self.values.get(dependent) != old_value:
+                    changed.add(dependent)
+        return changed
+
+
+# Base metric tokens in pixels; density scales spacing and control heights
+METRIC_TOKENS: Dict[str, TokenValue] = {
+    "radius": 8,
+    "spacing": 4,
+    "font-size": 14,
+    "control-height": 36,
+    "density": 1.0,
+    # Width of the focus ring band reserved around painted indicators
+    "ring-width": 2,
+}
+
+# Density factors selectable with StyleManager.set_density
+DENSITY_MODES: Dict[str, float] = {
+    "comfortable": 1.0,
+    "compact": 0.875,
+    "dense": 0.75,
+}
+
+
+def _space(steps: float) -> DerivedToken:
+    return DerivedToken(
+        ("spacing", "density"),
+        lambda spacing, density: max(1, round(steps * spacing * density)),
+    )
+
+
+def _text(size: int) -> DerivedToken:
+    return DerivedToken(("font-size",), lambda font_size: round(font_size * size / 14))
+
+
+def _control(size: int) -> DerivedToken:
+    """A control part sized with the control height and density"""
+    return DerivedToken(
+        ("control-height", "density"),
+        lambda height, density: max(2, round(size * height * density / 36)),
+    )
+
+
+def _half(token: str) -> DerivedToken:
+    """The radius that rounds a side of a token's size fully"""
+    return DerivedToken((token,), lambda size: size // 2)
+
+
+def _with_ring(token: str) -> DerivedToken:
+    """A painted part's size with the focus ring band on both sides"""
+    return DerivedToken((token, "ring-width"), lambda size, ring: size + 2 * ring)
+
+
+METRIC_DERIVATIONS: Dict[str, DerivedToken] = {
+    "radius-lg": DerivedToken(("radius",), lambda radius: radius),
+    "radius-md": DerivedToken(("radius",), lambda radius: max(0, radius - 2)),
+    "radius-sm": DerivedToken(("radius",), lambda radius: max(0, radius - 4)),
+    "radius-xs": DerivedToken(("radius",), lambda radius: max(0, radius - 5)),
+    "space-1": _space(1),
+    "space-1.5": _space(1.5),
+    "space-2": _space(2),
+    "space-3": _space(3),
+    "space-4": _space(4),
+    "button-height": DerivedToken(
+        ("control-height", "density"),
+        lambda height, density: round(height * density),
+    ),
+    "input-height": DerivedToken(
+        ("control-height", "density"),
+        lambda height, density: round((height + 4) * density),
+    ),
+    "indicator-size": _control(22),
+    "indicator-box": _with_ring("indicator-size"),
+    "indicator-size-sm": _control(16),
+    "indicator-radius-sm": _half("indicator-size-sm"),
+    "slider-handle-size": _control(20),
+    "slider-handle-box": _with_ring("slider-handle-size"),
+    "slider-groove-height": _control(6),
+    "slider-groove-radius": _half("slider-groove-height"),
+    # Negative margin centering the handle box on the groove
+    "slider-handle-margin": DerivedToken(
+        ("slider-handle-box", "slider-groove-height"),
+        lambda handle, groove: -((handle - groove) // 2),
+    ),
+    "scrollbar-width": _control(12),
+    "scrollbar-radius": _half("scrollbar-width"),
+    "text-sm": _text(14),
+    "text-base": _text(16),
+    "text-lg": _text(18),
+    "text-2xl": _text(24),
+}
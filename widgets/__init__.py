@@ -8,9 +8,23 @@ from .buttons import (
     SecondaryButton,
     OutlineButton,
     GhostButton,
+    ShadcnPaintedButton,
+    ShadcnIconButton,
 )
+from .icons import ShadcnIcon, available_icons
 from .cards import ShadcnCard, ShadcnLabel, HeadingLabel, SubheadingLabel
-from .progress import ShadcnProgressBar
+from .progress import ShadcnProgressBar, ShadcnSpinner, ShadcnSkeleton
+from .theme_picker import ShadcnThemePicker
+from .charts import (
+    ShadcnChart,
+    ShadcnStreamingChart,
+    ShadcnSparkline,
+    ShadcnSparklineDelegate,
+    SparklineData,
+    ShadcnBarChart,
+    ShadcnHistogram,
+)
+from .heatmap import ShadcnHeatmap
 from .inputs import (
     ShadcnInput,
     ShadcnTextArea,
@@ -27,11 +41,17 @@ __all__ = [
     "SecondaryButton",
     "OutlineButton",
     "GhostButton",
+    "ShadcnPaintedButton",
+    "ShadcnIconButton",
+    "ShadcnIcon",
+    "available_icons",
     "ShadcnCard",
     "ShadcnLabel",
     "HeadingLabel",
     "SubheadingLabel",
     "ShadcnProgressBar",
+    "ShadcnSpinner",
+    "ShadcnSkeleton",
     "ShadcnInput",
     "ShadcnTextArea",
     "ShadcnSelect",
@@ -39,4 +59,13 @@ __all__ = [
     "ShadcnRadioButton",
     "ShadcnSlider",
     "ShadcnFormField",
+    "ShadcnThemePicker",
+    "ShadcnChart",
+    "ShadcnStreamingChart",
+    "ShadcnSparkline",
+    "ShadcnSparklineDelegate",
+    "SparklineData",
+    "ShadcnHeatmap",
+    "ShadcnBarChart",
+    "ShadcnHistogram",
 ]
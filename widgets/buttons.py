@@ -2,18 +2,118 @@
 Custom button widgets with Shadcn styling
 """
 
-from PyQt6.QtWidgets import QPushButton
-from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QAbstractButton, QPushButton
+from PyQt6.QtCore import Qt, QEvent, QRectF, QSize, QPointF
+from PyQt6.QtGui import QPainter, QPainterPath, QPen, QStaticText, QColor, QFont
+from styles import style_manager
+from styles.animation import animation_clock
+from themes.base import BUTTON_STATE_TOKENS, RAMP_STEPS
+from .icons import ShadcnIcon
+
+# Border and text tokens per variant for custom-painted buttons; backgrounds
+# come from the theme's precomputed state ramps
+_VARIANT_TOKENS = {
+    "default": ("border", "foreground"),
+    "primary": (None, "primary-foreground"),
+    "secondary": ("border", "secondary-foreground"),
+    "outline": ("border", "foreground"),
+    "ghost": (None, "foreground"),
+}
+
+# Metric tokens of the QPushButton QSS rule box, besides its 1px border
+_METRIC_TOKENS = ("radius-md", "space-2", "space-4", "button-height")
+_BORDER = 1
+_FOCUS_RING = 2
+
+# Duration of hover, press and focus transitions in milliseconds
+_TRANSITION_MS = 150
+_PRESS_MS = 80
+
+# Shared caches for custom-painted buttons, each cleared when it fills up
+_CACHE_LIMIT = 2048
+_path_cache = {}
+_text_cache = {}
+_color_cache = {}
+
+
+def _rounded_path(width: int, height: int, radius: int) -> QPainterPath:
+    """Get the cached rounded-rect outline for a button size and radius"""
+    key = (width, height, radius)
+    path = _path_cache.get(key)
+    if path is None:
+        if len(_path_cache) >= _CACHE_LIMIT:
+            _path_cache.clear()
+        path = QPainterPath()
+        inset = _BORDER / 2
+        path.addRoundedRect(
+            QRectF(inset, inset, width - _BORDER, height - _BORDER), radius, radius
+        )
+        _path_cache[key] = path
+    return path
+
+
+def _static_text(text: str, font: QFont) -> QStaticText:
+    """Get the cached prepared text layout for a label and font"""
+    key = (text, font.key())
+    static_text = _text_cache.get(key)
+    if static_text is None:
+        if len(_text_cache) >= _CACHE_LIMIT:
+            _text_cache.clear()
+        static_text = QStaticText(text)
+        static_text.setTextFormat(Qt.TextFormat.PlainText)
+        static_text.setPerformanceHint(QStaticText.PerformanceHint.AggressiveCaching)
+        static_text.prepare(font=font)
+        _text_cache[key] = static_text
+    return static_text
+
+
+def _variant_colors(variant: str):
+    """Get the cached QColors for a variant in the current theme"""
+    version = style_manager.palette_version
+    if _color_cache.get("version") != version:
+        _color_cache.clear()
+        _color_cache["version"] = version
+    colors = _color_cache.get(variant)
+    if colors is None:
+        border, foreground = _VARIANT_TOKENS.get(variant, _VARIANT_TOKENS["default"])
+        base = BUTTON_STATE_TOKENS.get(variant, BUTTON_STATE_TOKENS["default"])[0]
+        tokens = (
+            border,
+            foreground,
+            f"{base}-disabled" if base else None,
+            "muted-foreground",
+            "focus-ring",
+        )
+        colors = tuple(
+            (
+                style_manager.get_qcolor(token)
+                if token
+                else QColor(Qt.GlobalColor.transparent)
+            )
+            for token in tokens
+        )
+        _color_cache[variant] = colors
+    return colors
 
 
 class ShadcnButton(QPushButton):
-    """Custom button with Shadcn styling variants"""
+    """Custom button with Shadcn styling variants
+
+    Styled by the theme stylesheet; ``ShadcnPaintedButton`` draws the same
+    variants itself for dense grids of buttons.
+    """
 
     def __init__(self, text, variant="default", parent=None):
         super().__init__(text, parent)
+        self._variant = variant
         self.setObjectName(variant)
         self.setCursor(Qt.CursorShape.PointingHandCursor)
 
+    @property
+    def variant(self) -> str:
+        """Get the button variant"""
+        return self._variant
+
 
 class PrimaryButton(ShadcnButton):
     """Primary action button"""
@@ -41,3 +141,173 @@ class GhostButton(ShadcnButton):
 
     def __init__(self, text, parent=None):
         super().__init__(text, "ghost", parent)
+
+
+class ShadcnPaintedButton(QAbstractButton):
+    """Button of a Shadcn variant that paints itself
+
+    It draws from cached theme colors, paths and text layouts instead of
+    going through the stylesheet engine, which keeps dense grids of buttons
+    cheap to paint. It is not a QPushButton, so none of the stylesheet's
+    button rules match it.
+    """
+
+    def __init__(self, text, variant="default", parent=None):
+        super().__init__(parent)
+        self.setText(text)
+        self._variant = variant
+        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, False)
+        self._font = QFont(self.font())
+        self._font.setWeight(QFont.Weight.Medium)
+        self._hover = 0.0
+        self._press = 0.0
+        self._focus = 0.0
+        self._animations = {}
+        self.pressed.connect(self._on_pressed)
+        self.released.connect(self._on_released)
+        self.setCursor(Qt.CursorShape.PointingHandCursor)
+        style_manager.bind_metrics(
+            self, _METRIC_TOKENS, ShadcnPaintedButton.updateGeometry
+        )
+
+    @property
+    def variant(self) -> str:
+        """Get the button variant"""
+        return self._variant
+
+    def sizeHint(self) -> QSize:
+        metric = style_manager.get_metric
+        size = _static_text(self.text(), self._font).size()
+        width = int(size.width()) + 2 * (metric("space-4", 16) + _BORDER)
+        height = max(metric("button-height", 36), int(size.height())) + 2 * (
+            metric("space-2", 8) + _BORDER
+        )
+        return QSize(width, height)
+
+    def minimumSizeHint(self) -> QSize:
+        return self.sizeHint()
+
+    def paintEvent(self, e):
+        border, foreground, disabled, disabled_foreground, focus_ring = _variant_colors(
+            self._variant
+        )
+        ramp = style_manager.get_ramp(self._variant)
+        if self.isDown():
+            # A key press has no hover to add to, but is still pressed
+            fill = ramp[-1]
+        else:
+            state = self._hover + self._press
+            fill = ramp[min(len(ramp) - 1, round(state * RAMP_STEPS))]
+
+        if not self.isEnabled():
+            fill, foreground = disabled, disabled_foreground
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        path = _rounded_path(
+            self.width(), self.height(), style_manager.get_metric("radius-md", 6)
+        )
+        if fill.alpha():
+            painter.fillPath(path, fill)
+        if border.alpha():
+            painter.setPen(border)
+            painter.drawPath(path)
+        if self._focus > 0.0:
+            painter.setOpacity(self._focus)
+            painter.setPen(QPen(focus_ring, _FOCUS_RING))
+            painter.drawPath(path)
+            painter.setOpacity(1.0)
+
+        static_text = _static_text(self.text(), self._font)
+        size = static_text.size()
+        painter.setFont(self._font)
+        painter.setPen(foreground)
+        painter.drawStaticText(
+            QPointF(
+                (self.width() - size.width()) / 2, (self.height() - size.height()) / 2
+            ),
+            static_text,
+        )
+
+    def changeEvent(self, e):
+        super().changeEvent(e)
+        if e and e.type() == QEvent.Type.FontChange:
+            self._font = QFont(self.font())
+            self._font.setWeight(QFont.Weight.Medium)
+            self.updateGeometry()
+
+    def _transition(self, name: str, target: float, duration: int = _TRANSITION_MS):
+        """Animate a hover, press or focus amount on the shared clock"""
+        clock = animation_clock()
+        clock.stop(self._animations.get(name))
+        self._animations[name] = clock.animate(
+            self,
+            getattr(self, f"_{name}"),
+            target,
+            duration,
+            kind=name,
+            on_step=lambda value: setattr(self, f"_{name}", value),
+        )
+
+    def enterEvent(self, event):
+        super().enterEvent(event)
+        self._transition("hover", 1.0)
+
+    def leaveEvent(self, a0):
+        super().leaveEvent(a0)
+        self._transition("hover", 0.0)
+
+    def _on_pressed(self):
+        self._transition("press", 1.0, _PRESS_MS)
+
+    def _on_released(self):
+        self._transition("press", 0.0, _PRESS_MS)
+
+    def focusInEvent(self, e):
+        super().focusInEvent(e)
+        self._transition("focus", 1.0)
+
+    def focusOutEvent(self, e):
+        super().focusOutEvent(e)
+        self._transition("focus", 0.0)
+
+
+class ShadcnIconButton(QPushButton):
+    """Icon-only button that tints a bundled icon from the theme"""
+
+    def __init__(
+        self,
+        icon_name,
+        parent=None,
+        token="muted-foreground",
+        hover_token="foreground",
+        icon_size=16,
+    ):
+        super().__init__(parent)
+        self._icon = ShadcnIcon(icon_name, icon_size)
+        self._token = token
+        self._hover_token = hover_token
+        self.setCursor(Qt.CursorShape.PointingHandCursor)
+
+    def set_icon_name(self, icon_name):
+        """Change the displayed icon"""
+        self._icon = ShadcnIcon(icon_name, self._icon.size)
+        self.update()
+
+    def prepare_assets(self, dpr: float):
+        """Pre-render the icon in both states for a device pixel ratio"""
+        for token in (self._token, self._hover_token):
+            self._icon.pixmap(dpr, style_manager.get_qcolor(token))
+
+    def paintEvent(self, e):
+        super().paintEvent(e)
+        token = self._hover_token if self.underMouse() else self._token
+        size = self._icon.size
+        painter = QPainter(self)
+        self._icon.paint(
+            painter,
+            (self.width() - size) // 2,
+            (self.height() - size) // 2,
+            style_manager.get_qcolor(token),
+        )
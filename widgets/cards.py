@@ -3,6 +3,9 @@ Card widget with Shadcn styling
 """
 
 from PyQt6.QtWidgets import QFrame, QVBoxLayout, QLabel
+from PyQt6.QtCore import Qt, QEvent, QPointF, QSize
+from PyQt6.QtGui import QPainter, QPalette, QStaticText
+from styles import style_manager
 
 
 class ShadcnCard(QFrame):
@@ -13,36 +16,144 @@ class ShadcnCard(QFrame):
         self.setObjectName("card")
         self.setFrameStyle(QFrame.Shape.NoFrame)
         self._layout = QVBoxLayout(self)
-        self._layout.setContentsMargins(16, 16, 16, 16)
-        self._layout.setSpacing(8)
+        self._spacing = None
+        style_manager.bind_metrics(
+            self, ("space-2", "space-4"), ShadcnCard._apply_metrics
+        )
+
+    def _apply_metrics(self):
+        padding = style_manager.get_metric("space-4", 16)
+        self._layout.setContentsMargins(padding, padding, padding, padding)
+        if self._spacing is None:
+            self._layout.setSpacing(style_manager.get_metric("space-2", 8))
 
     def add_widget(self, widget):
         """Add a widget to the card"""
         self._layout.addWidget(widget)
 
     def set_spacing(self, spacing):
-        """Set spacing between card elements"""
+        """Set spacing between card elements, instead of the theme spacing"""
+        self._spacing = spacing
         self._layout.setSpacing(spacing)
 
 
 class ShadcnLabel(QLabel):
-    """Label with Shadcn styling variants"""
+    """Label with Shadcn styling variants
+
+    With ``cached=True`` plain text is painted from a prepared QStaticText and
+    elided to the available width, with both cached for the current text and
+    width until they, the font or the style change. Rich text, pixmaps and
+    word-wrapped labels fall back to the regular QLabel painting.
+    """
 
-    def __init__(self, text, variant="default", parent=None):
+    def __init__(self, text, variant="default", parent=None, cached=False):
         super().__init__(text, parent)
         if variant != "default":
             self.setObjectName(variant)
+        self._cached = cached
+        # (width, text, elided text) of the last elision
+        self._elided = None
+        self._static_text = None
+        self._static_key = None
+
+    @property
+    def is_cached(self) -> bool:
+        """Check if the label uses static-text caching"""
+        return self._cached
+
+    def _invalidate_text_cache(self):
+        """Drop the cached elided string and prepared text"""
+        self._elided = None
+        self._static_text = None
+        self._static_key = None
+
+    def _can_use_cache(self) -> bool:
+        """Check if the current content can be painted from the cache"""
+        if not self._cached or self.wordWrap() or not self.text():
+            return False
+        text_format = self.textFormat()
+        if text_format == Qt.TextFormat.RichText:
+            return False
+        if text_format == Qt.TextFormat.AutoText and Qt.mightBeRichText(self.text()):
+            return False
+        return True
+
+    def _elided_text(self, width: int) -> str:
+        """Get the text elided to a width, cached for the last text and width"""
+        text = self.text()
+        if self._elided is None or self._elided[:2] != (width, text):
+            elided = self.fontMetrics().elidedText(
+                text, Qt.TextElideMode.ElideRight, width
+            )
+            self._elided = (width, text, elided)
+        return self._elided[2]
+
+    def minimumSizeHint(self) -> QSize:
+        if not self._can_use_cache():
+            return super().minimumSizeHint()
+        # Cached labels elide instead of forcing their full text width
+        hint = super().minimumSizeHint()
+        margins = self.contentsMargins()
+        width = self.fontMetrics().horizontalAdvance("\u2026")
+        return QSize(width + margins.left() + margins.right(), hint.height())
+
+    def paintEvent(self, arg__1):
+        if not self._can_use_cache():
+            super().paintEvent(arg__1)
+            return
+
+        rect = self.contentsRect()
+        # Keyed on text() rather than setText, which setNum, clear and C++
+        # callers bypass
+        key = (rect.width(), self.text())
+        if self._static_text is None or self._static_key != key:
+            self._static_text = QStaticText(self._elided_text(rect.width()))
+            self._static_text.setTextFormat(Qt.TextFormat.PlainText)
+            self._static_text.prepare(font=self.font())
+            self._static_key = key
+
+        painter = QPainter(self)
+        self.drawFrame(painter)
+        painter.setFont(self.font())
+        painter.setPen(self.palette().color(QPalette.ColorRole.WindowText))
+
+        size = self._static_text.size()
+        alignment = self.alignment()
+        x = float(rect.left())
+        if alignment & Qt.AlignmentFlag.AlignRight:
+            x = rect.right() + 1 - size.width()
+        elif alignment & Qt.AlignmentFlag.AlignHCenter:
+            x = rect.left() + (rect.width() - size.width()) / 2
+        y = float(rect.top())
+        if alignment & Qt.AlignmentFlag.AlignBottom:
+            y = rect.bottom() + 1 - size.height()
+        elif alignment & Qt.AlignmentFlag.AlignVCenter:
+            y = rect.top() + (rect.height() - size.height()) / 2
+        painter.drawStaticText(QPointF(x, y), self._static_text)
+
+    def changeEvent(self, a0):
+        super().changeEvent(a0)
+        if (
+            self._cached
+            and a0
+            and a0.type()
+            in (
+                QEvent.Type.FontChange,
+                QEvent.Type.StyleChange,
+            )
+        ):
+            self._invalidate_text_cache()
 
 
 class HeadingLabel(ShadcnLabel):
     """Heading label"""
 
-    def __init__(self, text, parent=None):
-        super().__init__(text, "heading", parent)
+    def __init__(self, text, parent=None, cached=False):
+        super().__init__(text, "heading", parent, cached)
 
 
 class SubheadingLabel(ShadcnLabel):
     """Subheading label"""
 
-    def __init__(self, text, parent=None):
-        super().__init__(text, "subheading", parent)
+    def __init__(self, text, parent=None, cached=False):
+        super().__init__(text, "subheading", parent, cached)
@@ -0,0 +1,1324 @@
+"""
+Line and area charts for large NumPy series, painted from theme tokens
+
+Series are reduced to a min/max envelope per pixel column before painting,
+so the cost of a frame depends on the width of the chart rather than the
+number of samples. Sparklines are rendered once per data version, size
+and color into the shared pixmap cache, so item views can paint thousands.
+Histograms keep their samples sorted, so any bin count is counted from
+one binary search per bin edge.
+"""
+
+import itertools
+import math
+import threading
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from PyQt6.QtCore import QPointF, QRectF, QSize, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QPainter, QPainterPath, QPen, QPixmap, QPolygonF
+from PyQt6.QtWidgets import (
+    QApplication,
+    QSizePolicy,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionViewItem,
+    QWidget,
+)
+from styles import style_manager
+from styles.animation import Animation, animation_clock
+
+# Each pyramid level holds the min and max of this many samples of the last
+_PYRAMID_FACTOR = 8
+# Levels stop once they are this short
+_PYRAMID_MIN = 4096
+# Pyramid blocks must be this many times narrower than a column to be used
+_PYRAMID_OVERSAMPLE = 4
+
+# Share of the view kept per wheel notch when zooming in
+_ZOOM_STEP = 0.8
+# Narrowest view, in samples
+_MIN_VIEW_SAMPLES = 4
+
+# Plot margins for the axis labels, in pixels
+_LEFT_MARGIN = 44
+_BOTTOM_MARGIN = 8
+_TOP_MARGIN = 8
+_RIGHT_MARGIN = 8
+_Y_TICKS = 5
+_AREA_ALPHA = 0.25
+# Gap between bars as a fraction of their width, and its largest size
+_BAR_GAP = 0.2
+_MAX_BAR_GAP = 2.0
+
+# Series colors cycle through these tokens
+CHART_TOKENS = ("chart-1", "chart-2", "chart-3", "chart-4", "chart-5")
+
+# Item data role the sparkline delegate reads SparklineData from
+SPARKLINE_ROLE = Qt.ItemDataRole.UserRole + 1
+# Padding around sparklines drawn in item views
+_SPARKLINE_PADDING = 4
+
+Envelope = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def minmax_envelope(
+    mins: np.ndarray, maxs: np.ndarray, edges: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduce samples to the min and max of each bin between index edges
+
+    ``edges`` are ascending indices, one more than there are bins. Empty
+    bins are NaN, and NaN samples are ignored.
+    """
+    count = len(edges) - 1
+    low = np.full(count, np.nan)
+    high = np.full(count, np.nan)
+    valid = edges[1:] > edges[:-1]
+    if valid.any():
+        # Empty bins have no width, so each segment ends where the next starts
+        starts = edges[:-1][valid]
+        end = edges[-1]
+        low[valid] = np.fmin.reduceat(mins[:end], starts)
+        high[valid] = np.fmax.reduceat(maxs[:end], starts)
+    return low, high
+
+
+def _build_pyramid(y: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Get successively coarser (mins, maxs) levels, starting with y itself"""
+    levels = [(y, y)]
+    mins = maxs = y
+    while len(mins) > _PYRAMID_MIN:
+        starts = np.arange(0, len(mins), _PYRAMID_FACTOR)
+        mins = np.fmin.reduceat(mins, starts)
+        maxs = np.fmax.reduceat(maxs, starts)
+        levels.append((mins, maxs))
+    return levels
+
+
+def _nice_ticks(low: float, high: float, count: int = _Y_TICKS) -> List[float]:
+    """Get round tick values covering a range"""
+    span = high - low
+    if not span > 0 or not math.isfinite(span):
+        return [low]
+    raw = span / count
+    magnitude = 10 ** math.floor(math.log10(raw))
+    step = next(
+        factor * magnitude for factor in (1, 2, 5, 10) if factor * magnitude >= raw
+    )
+    first = math.ceil(low / step) * step
+    return [first + index * step for index in range(int((high - first) / step) + 1)]
+
+
+def _paint_grid(painter: QPainter, plot: QRectF, y0: float, y1: float, font):
+    """Draw horizontal grid lines with their values left of the plot"""
+    grid = QColor(style_manager.get_qcolor("border"))
+    painter.setFont(font)
+    metrics = painter.fontMetrics()
+    for tick in _nice_ticks(y0, y1):
+        y = plot.bottom() - (tick - y0) / (y1 - y0) * plot.height()
+        painter.setPen(QPen(grid, 1))
+        painter.drawLine(QPointF(plot.left(), y), QPointF(plot.right(), y))
+        painter.setPen(style_manager.get_qcolor("muted-foreground"))
+        painter.drawText(
+            QRectF(0, y - metrics.height() / 2, _LEFT_MARGIN - 6, metrics.height()),
+            Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+            f"{tick:.6g}",
+        )
+
+
+def _polygon(x: np.ndarray, y: np.ndarray) -> QPolygonF:
+    """Build a polygon by writing coordinates straight into its point buffer"""
+    polygon = QPolygonF()
+    polygon.resize(len(x))
+    if len(x):
+        buffer = polygon.data()
+        buffer.setsize(len(x) * 16)
+        points = np.frombuffer(buffer, dtype=np.float64).reshape(-1, 2)
+        points[:, 0] = x
+        points[:, 1] = y
+    return polygon
+
+
+def _runs(valid: np.ndarray) -> List[Tuple[int, int]]:
+    """Get the (start, stop) ranges of consecutive True values"""
+    changes = np.flatnonzero(np.diff(valid.astype(np.int8)))
+    bounds = np.concatenate(([0], changes + 1, [len(valid)]))
+    return [
+        (int(start), int(stop))
+        for start, stop in zip(bounds[:-1], bounds[1:])
+        if valid[start]
+    ]
+
+
+class ChartSeries:
+    """A line or area series and its decimation pyramid
+
+    ``x`` must be ascending; without it samples are placed at their index.
+    """
+
+    def __init__(
+        self,
+        y: Sequence[float],
+        x: Optional[Sequence[float]] = None,
+        kind: str = "line",
+        token: Optional[str] = None,
+        name: str = "",
+    ):
+        if kind not in ("line", "area"):
+            raise ValueError(f"Unknown series kind: {kind}")
+        self.y = np.ascontiguousarray(y, dtype=np.float64).ravel()
+        self.x = None
+        if x is not None:
+            self.x = np.ascontiguousarray(x, dtype=np.float64).ravel()
+            if len(self.x) != len(self.y):
+                raise ValueError("x and y must have the same length")
+        self.kind = kind
+        self.token = token
+        self.name = name
+        self.levels = _build_pyramid(self.y)
+
+    def __len__(self) -> int:
+        return len(self.y)
+
+    def x_range(self) -> Tuple[float, float]:
+        """Get the first and last x position"""
+        if not len(self.y):
+            return 0.0, 0.0
+        if self.x is None:
+            return 0.0, float(len(self.y) - 1)
+        return float(self.x[0]), float(self.x[-1])
+
+    def _indices(self, positions: np.ndarray) -> np.ndarray:
+        """Get the first sample index at or after each x position"""
+        if self.x is None:
+            return np.clip(np.ceil(positions), 0, len(self.y)).astype(np.intp)
+        return np.searchsorted(self.x, positions)
+
+    def envelope(self, x0: float, x1: float, columns: int) -> Envelope:
+        """Get column x positions and the min/max of the samples in each
+
+        Returns the raw samples instead when there are fewer than two per
+        column, so zoomed-in views draw every point.
+        """
+        start, stop = self._indices(np.array([x0, x1])).tolist()
+        # Include the neighbours just outside the view so lines reach the edge
+        start, stop = max(0, start - 1), min(len(self.y), stop + 1)
+        if stop - start <= 2 * columns:
+            y = self.y[start:stop]
+            if self.x is None:
+                return np.arange(start, stop, dtype=np.float64), y, y
+            return self.x[start:stop], y, y
+
+        edges = self._indices(np.linspace(x0, x1, columns + 1))
+        samples = (edges[-1] - edges[0]) / columns
+        level = 0
+        while (
+            level + 1 < len(self.levels)
+            and _PYRAMID_FACTOR ** (level + 1) * _PYRAMID_OVERSAMPLE <= samples
+        ):
+            level += 1
+        block = _PYRAMID_FACTOR**level
+        mins, maxs = self.levels[level]
+        level_edges = np.minimum((edges + block - 1) // block, len(mins))
+        low, high = minmax_envelope(mins, maxs, level_edges)
+        centers = x0 + (np.arange(columns) + 0.5) * ((x1 - x0) / columns)
+        return centers, low, high
+
+
+class ShadcnChart(QWidget):
+    """Line and area chart for large NumPy series
+
+    Each frame reduces the visible samples of every series to a min/max
+    envelope per pixel column, taken from a pyramid of precomputed block
+    minima and maxima, so 10M-sample series zoom and pan at frame rate.
+    The plot is rendered into a cached pixmap that is reused until the
+    data, view, size or theme changes. Wheel zooms around the cursor,
+    dragging pans, and double-clicking shows all data again.
+    """
+
+    view_changed = pyqtSignal(float, float)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._series: List[ChartSeries] = []
+        self._view: Optional[Tuple[float, float]] = None
+        self._y_range: Optional[Tuple[float, float]] = None
+        self._data_version = 0
+        self._layer: Optional[QPixmap] = None
+        self._layer_key = None
+        self._drag: Optional[Tuple[float, Tuple[float, float]]] = None
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+
+    def sizeHint(self) -> QSize:
+        return QSize(480, 240)
+
+    def add_series(
+        self,
+        y: Sequence[float],
+        x: Optional[Sequence[float]] = None,
+        kind: str = "line",
+        token: Optional[str] = None,
+        name: str = "",
+    ) -> int:
+        """Add a line or area series, returning its index
+
+        Series take the ``chart-1`` to ``chart-5`` colors in turn unless a
+        token is given.
+        """
+        self._series.append(ChartSeries(y, x, kind, token, name))
+        self._data_changed()
+        return len(self._series) - 1
+
+    def set_series(
+        self, index: int, y: Sequence[float], x: Optional[Sequence[float]] = None
+    ):
+        """Replace the samples of a series"""
+        series = self._series[index]
+        self._series[index] = ChartSeries(y, x, series.kind, series.token, series.name)
+        self._data_changed()
+
+    def clear(self):
+        """Remove every series"""
+        self._series.clear()
+        self._view = None
+        self._data_changed()
+
+    def series(self) -> List[ChartSeries]:
+        """Get the series of the chart"""
+        return list(self._series)
+
+    def _data_changed(self):
+        self._data_version += 1
+        self.update()
+
+    def data_range(self) -> Tuple[float, float]:
+        """Get the x range covered by all series"""
+        ranges = [series.x_range() for series in self._series if len(series)]
+        if not ranges:
+            return 0.0, 1.0
+        return min(low for low, _ in ranges), max(high for _, high in ranges)
+
+    def view(self) -> Tuple[float, float]:
+        """Get the visible x range"""
+        return self._view if self._view is not None else self.data_range()
+
+    def set_view(self, x0: float, x1: float):
+        """Show an x range, kept within the data"""
+        low, high = self.data_range()
+        span = high - low
+        width = min(max(x1 - x0, self._min_view_width()), span or 1.0)
+        x0 = min(max(x0, low), high - width) if span else low
+        view = (x0, x0 + width)
+        if view != self.view():
+            self._view = view
+            self.update()
+            self.view_changed.emit(*view)
+
+    def reset_view(self):
+        """Show all data"""
+        self._view = None
+        self.update()
+        self.view_changed.emit(*self.view())
+
+    def _min_view_width(self) -> float:
+        widths = []
+        for series in self._series:
+            if len(series) > 1:
+                low, high = series.x_range()
+                widths.append((high - low) / (len(series) - 1) * _MIN_VIEW_SAMPLES)
+        return min(widths) if widths else 0.0
+
+    def set_y_range(self, y_range: Optional[Tuple[float, float]]):
+        """Fix the y range, or fit it to the visible data with None"""
+        self._y_range = y_range
+        self.update()
+
+    def plot_rect(self) -> QRectF:
+        """Get the area the series are drawn in"""
+        return QRectF(self.rect()).adjusted(
+            _LEFT_MARGIN, _TOP_MARGIN, -_RIGHT_MARGIN, -_BOTTOM_MARGIN
+        )
+
+    def paintEvent(self, a0):
+        dpr = self.devicePixelRatioF()
+        key = (
+            self._data_version,
+            self.view(),
+            self._y_range,
+            self.width(),
+            self.height(),
+            dpr,
+            style_manager.palette_version,
+        )
+        if self._layer is None or self._layer_key != key:
+            self._layer = self._render_layer(dpr)
+            self._layer_key = key
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._layer)
+
+    def _render_layer(self, dpr: float) -> QPixmap:
+        """Render the grid, labels and series into a pixmap"""
+        pixmap = QPixmap(
+            max(1, math.ceil(self.width() * dpr)),
+            max(1, math.ceil(self.height() * dpr)),
+        )
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        plot = self.plot_rect()
+        if plot.width() < 2 or plot.height() < 2:
+            return pixmap
+
+        x0, x1 = self.view()
+        columns = max(1, int(plot.width() * dpr))
+        envelopes = [series.envelope(x0, x1, columns) for series in self._series]
+        y0, y1 = self._fit_y(envelopes)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        _paint_grid(painter, plot, y0, y1, self.font())
+        painter.setClipRect(plot)
+        for index, (series, envelope) in enumerate(zip(self._series, envelopes)):
+            self._paint_series(painter, plot, index, series, envelope, (x0, x1, y0, y1))
+        painter.end()
+        return pixmap
+
+    def _fit_y(self, envelopes: List[Envelope]) -> Tuple[float, float]:
+        """Get the y range, padded around the visible data unless fixed"""
+        if self._y_range is not None:
+            return self._y_range
+        lows = [np.nanmin(low) for _, low, _ in envelopes if np.isfinite(low).any()]
+        highs = [np.nanmax(high) for _, _, high in envelopes if np.isfinite(high).any()]
+        if not lows:
+            return 0.0, 1.0
+        low, high = float(min(lows)), float(max(highs))
+        if any(series.kind == "area" for series in self._series):
+            low, high = min(low, 0.0), max(high, 0.0)
+        padding = (high - low) * 0.05 or abs(high) * 0.05 or 1.0
+        return low - padding, high + padding
+
+    def _paint_series(
+        self,
+        painter: QPainter,
+        plot: QRectF,
+        index: int,
+        series: ChartSeries,
+        envelope: Envelope,
+        bounds: Tuple[float, float, float, float],
+    ):
+        x0, x1, y0, y1 = bounds
+        centers, low, high = envelope
+        if not len(centers):
+            return
+        token = series.token or CHART_TOKENS[index % len(CHART_TOKENS)]
+        color = style_manager.get_qcolor(token)
+        scale_x = plot.width() / ((x1 - x0) or 1.0)
+        scale_y = plot.height() / ((y1 - y0) or 1.0)
+        px = plot.left() + (centers - x0) * scale_x
+        top = plot.bottom() - (high - y0) * scale_y
+        bottom = plot.bottom() - (low - y0) * scale_y
+        decimated = low is not high
+
+        for start, stop in _runs(np.isfinite(top) & np.isfinite(bottom)):
+            if series.kind == "area":
+                baseline = plot.bottom() - (min(max(0.0, y0), y1) - y0) * scale_y
+                path = QPainterPath()
+                path.addPolygon(
+                    _polygon(
+                        np.concatenate(([px[start]], px[start:stop], [px[stop - 1]])),
+                        np.concatenate(([baseline], top[start:stop], [baseline])),
+                    )
+                )
+                fill = QColor(color)
+                fill.setAlphaF(_AREA_ALPHA)
+                painter.fillPath(path, fill)
+            painter.setPen(QPen(color, 1.5 if not decimated else 1.0))
+            if decimated:
+                # Alternate each column's min and max so the line covers both
+                xs = np.repeat(px[start:stop], 2)
+                ys = np.empty(len(xs))
+                ys[0::2] = bottom[start:stop]
+                ys[1::2] = top[start:stop]
+                painter.drawPolyline(_polygon(xs, ys))
+            else:
+                painter.drawPolyline(_polygon(px[start:stop], top[start:stop]))
+
+    def wheelEvent(self, a0):
+        notches = a0.angleDelta().y() / 120
+        if not notches or not self._series:
+            return
+        plot = self.plot_rect()
+        x0, x1 = self.view()
+        fraction = min(max((a0.position().x() - plot.left()) / plot.width(), 0.0), 1.0)
+        anchor = x0 + fraction * (x1 - x0)
+        width = (x1 - x0) * _ZOOM_STEP**notches
+        self.set_view(anchor - fraction * width, anchor + (1 - fraction) * width)
+        a0.accept()
+
+    def mousePressEvent(self, a0):
+        if a0.button() == Qt.MouseButton.LeftButton:
+            self._drag = (a0.position().x(), self.view())
+        super().mousePressEvent(a0)
+
+    def mouseMoveEvent(self, a0):
+        if self._drag is not None:
+            start, (x0, x1) = self._drag
+            shift = (a0.position().x() - start) / self.plot_rect().width() * (x1 - x0)
+            self.set_view(x0 - shift, x1 - shift)
+        super().mouseMoveEvent(a0)
+
+    def mouseReleaseEvent(self, a0):
+        self._drag = None
+        super().mouseReleaseEvent(a0)
+
+    def mouseDoubleClickEvent(self, a0):
+        self.reset_view()
+        super().mouseDoubleClickEvent(a0)
+
+
+class RingBuffer:
+    """The latest samples of several series in fixed, preallocated memory
+
+    Producers on any thread append blocks of samples; readers ask for a
+    range of absolute sample indices, of which the last ``capacity`` are
+    kept. A lock guards every copy in and out.
+    """
+
+    def __init__(self, series: int, capacity: int):
+        if series < 1 or capacity < 1:
+            raise ValueError("A ring buffer needs at least one series and sample")
+        self._data = np.full((series, capacity), np.nan)
+        self._lock = threading.Lock()
+        # Samples appended since creation; the next sample goes to count % capacity
+        self.count = 0
+
+    @property
+    def series(self) -> int:
+        return self._data.shape[0]
+
+    @property
+    def capacity(self) -> int:
+        return self._data.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    def append(self, samples):
+        """Append a (series, n) block, or one sample per series
+
+        With a single series a 1-D array is a run of its samples.
+        """
+        block = np.asarray(samples, dtype=np.float64)
+        if block.ndim == 1:
+            block = block[None, :] if self.series == 1 else block[:, None]
+        if block.shape[0] != self.series:
+            raise ValueError(f"Expected samples for {self.series} series")
+        count = block.shape[1]
+        if count > self.capacity:
+            block = block[:, -self.capacity :]
+        with self._lock:
+            position = (self.count + count - block.shape[1]) % self.capacity
+            first = min(block.shape[1], self.capacity - position)
+            self._data[:, position : position + first] = block[:, :first]
+            self._data[:, : block.shape[1] - first] = block[:, first:]
+            self.count += count
+
+    def read(self, start: int, stop: int) -> Tuple[int, np.ndarray]:
+        """Copy out samples from ``start`` to ``stop`` that are still held
+
+        Returns the index of the first sample returned and a (series, n)
+        array.
+        """
+        with self._lock:
+            stop = min(stop, self.count)
+            start = max(start, self.count - self.capacity, 0)
+            if stop <= start:
+                return start, np.empty((self.series, 0))
+            first, last = start % self.capacity, (stop - 1) % self.capacity + 1
+            if first < last:
+                return start, self._data[:, first:last].copy()
+            return start, np.concatenate(
+                (self._data[:, first:], self._data[:, :last]), axis=1
+            )
+
+    def clear(self):
+        """Forget every sample"""
+        with self._lock:
+            self._data.fill(np.nan)
+            self.count = 0
+
+
+class ShadcnStreamingChart(QWidget):
+    """Line chart of live series that scrolls as samples arrive
+
+    Samples go into a ``RingBuffer`` from any thread with ``append``.
+    While samples are waiting to be drawn the chart runs on the shared
+    animation clock, repainting at most once per frame; each repaint
+    scrolls the cached plot image by the columns the new samples fill and
+    draws only those, so the cost of a frame depends on the new samples,
+    not the window. An idle chart schedules no frames. The window shows
+    the last ``window`` samples; memory stays fixed however long the
+    stream runs.
+    """
+
+    # Queued to the GUI thread when samples arrive from another thread
+    _samples_added = pyqtSignal()
+
+    def __init__(
+        self,
+        series: int = 1,
+        capacity: int = 100_000,
+        window: Optional[int] = None,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.buffer = RingBuffer(series, capacity)
+        self._window = min(window or capacity, capacity)
+        self._tokens: List[Optional[str]] = [None] * series
+        self._fixed_y: Optional[Tuple[float, float]] = None
+        self._y_range: Optional[Tuple[float, float]] = None
+        self._layer: Optional[QPixmap] = None
+        self._layer_key = None
+        self._grid: Optional[QPixmap] = None
+        self._grid_key = None
+        # Samples drawn into the layer, and the newest column it shows
+        self._drawn = 0
+        self._head = 0
+        self.full_renders = 0
+        # Clock subscription while samples are waiting to be drawn
+        self._frame: Optional[Animation] = None
+        self._frame_requested = False
+        self._samples_added.connect(self._request_frames)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+
+    def sizeHint(self) -> QSize:
+        return QSize(480, 240)
+
+    def append(self, samples):
+        """Append samples from any thread; see ``RingBuffer.append``"""
+        self.buffer.append(samples)
+        if not self._frame_requested:
+            self._frame_requested = True
+            self._samples_added.emit()
+
+    def clear(self):
+        """Forget every sample"""
+        self.buffer.clear()
+        self._layer = None
+        self.update()
+
+    def set_series_token(self, index: int, token: Optional[str]):
+        """Set the color token of a series, or cycle chart colors with None"""
+        self._tokens[index] = token
+        self._layer = None
+        self.update()
+
+    def set_y_range(self, y_range: Optional[Tuple[float, float]]):
+        """Fix the y range, or grow it to fit the samples with None"""
+        self._fixed_y = y_range
+        self._layer = None
+        self.update()
+
+    def plot_rect(self) -> QRectF:
+        """Get the area the series are drawn in"""
+        return QRectF(self.rect()).adjusted(
+            _LEFT_MARGIN, _TOP_MARGIN, -_RIGHT_MARGIN, -_BOTTOM_MARGIN
+        )
+
+    def hideEvent(self, a0):
+        super().hideEvent(a0)
+        self._stop_frames()
+
+    def _request_frames(self):
+        """Repaint on the shared clock until the new samples are drawn"""
+        # Cleared first, so samples appended from now on request again
+        self._frame_requested = False
+        if self._frame is None and self.isVisible():
+            clock = animation_clock()
+            self._frame = clock.start(
+                Animation(
+                    self,
+                    clock.frame_interval(),
+                    kind="stream",
+                    loop=True,
+                    on_step=self._on_frame,
+                )
+            )
+
+    def _on_frame(self, value: float):
+        if self.buffer.count == self._drawn:
+            self._stop_frames()
+
+    def _stop_frames(self):
+        animation_clock().stop(self._frame)
+        self._frame = None
+
+    def paintEvent(self, a0):
+        plot = self.plot_rect()
+        dpr = self.devicePixelRatioF()
+        columns = int(plot.width() * dpr)
+        rows = int(plot.height() * dpr)
+        if columns < 2 or rows < 2:
+            return
+        key = (columns, rows, dpr, style_manager.palette_version, tuple(self._tokens))
+        count = self.buffer.count
+        if self._layer is None or self._layer_key != key:
+            self._render_layer(columns, rows, count)
+            self._layer_key = key
+        elif count != self._drawn:
+            self._extend_layer(columns, rows, count)
+
+        y0, y1 = self._y_range
+        grid_key = (key, self._y_range, self.width(), self.height())
+        if self._grid is None or self._grid_key != grid_key:
+            self._grid = QPixmap(
+                max(1, math.ceil(self.width() * dpr)),
+                max(1, math.ceil(self.height() * dpr)),
+            )
+            self._grid.setDevicePixelRatio(dpr)
+            self._grid.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(self._grid)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            _paint_grid(painter, plot, y0, y1, self.font())
+            painter.end()
+            self._grid_key = grid_key
+
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._grid)
+        painter.drawPixmap(plot, self._layer, QRectF(self._layer.rect()))
+
+    def _samples_per_column(self, columns: int) -> float:
+        return self._window / columns
+
+    def _column(self, sample: int, columns: int) -> int:
+        """Get the absolute column a sample falls in"""
+        return int(sample // self._samples_per_column(columns))
+
+    def _column_start(self, column: int, columns: int) -> int:
+        """Get the first sample of an absolute column"""
+        return math.ceil(column * self._samples_per_column(columns))
+
+    def _fit_y(self, samples: np.ndarray) -> bool:
+        """Grow the automatic y range to fit samples, returning if it changed"""
+        if self._fixed_y is not None:
+            changed = self._y_range != self._fixed_y
+            self._y_range = self._fixed_y
+            return changed
+        finite = samples[np.isfinite(samples)]
+        if not len(finite):
+            if self._y_range is None:
+                self._y_range = (0.0, 1.0)
+                return True
+            return False
+        low, high = float(finite.min()), float(finite.max())
+        if self._y_range is not None and (
+            self._y_range[0] <= low and high <= self._y_range[1]
+        ):
+            return False
+        if self._y_range is not None:
+            low, high = min(low, self._y_range[0]), max(high, self._y_range[1])
+        padding = (high - low) * 0.1 or abs(high) * 0.1 or 1.0
+        self._y_range = (low - padding, high + padding)
+        return True
+
+    def _render_layer(self, columns: int, rows: int, count: int):
+        """Draw every visible column into a new layer"""
+        self.full_renders += 1
+        self._layer = QPixmap(columns, rows)
+        self._layer.fill(Qt.GlobalColor.transparent)
+        self._y_range = None
+        head = self._column(max(0, count - 1), columns)
+        first = head - columns + 1
+        start, samples = self.buffer.read(self._column_start(first, columns), count)
+        self._fit_y(samples)
+        self._draw_columns(samples, start, first, head, columns, rows)
+        self._drawn, self._head = count, head
+
+    def _extend_layer(self, columns: int, rows: int, count: int):
+        """Scroll the layer by the columns new samples fill and draw them"""
+        head = self._column(count - 1, columns)
+        shift = head - self._head
+        if shift >= columns:
+            self._render_layer(columns, rows, count)
+            return
+        # Redraw from the column of the newest drawn sample, which may have
+        # been partial, reading one sample before it to join the line
+        first = self._column(max(0, self._drawn - 1), columns)
+        start, samples = self.buffer.read(self._column_start(first, columns) - 1, count)
+        if self._fit_y(samples):
+            self._render_layer(columns, rows, count)
+            return
+        if shift:
+            self._layer.scroll(-shift, 0, self._layer.rect())
+        painter = QPainter(self._layer)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+        left = columns - 1 - (head - first)
+        painter.fillRect(left, 0, columns - left, rows, Qt.GlobalColor.transparent)
+        painter.end()
+        self._draw_columns(samples, start, first, head, columns, rows)
+        self._drawn, self._head = count, head
+
+    def _draw_columns(
+        self,
+        samples: np.ndarray,
+        start: int,
+        first: int,
+        head: int,
+        columns: int,
+        rows: int,
+    ):
+        """Draw the min/max envelope of columns ``first`` to ``head``"""
+        if not samples.shape[1]:
+            return
+        bounds = np.arange(first, head + 2) * self._samples_per_column(columns)
+        edges = np.clip(np.ceil(bounds).astype(np.intp) - start, 0, samples.shape[1])
+        x = columns - 1 - (head - np.arange(first, head + 1)) + 0.5
+        y0, y1 = self._y_range
+        scale = rows / ((y1 - y0) or 1.0)
+
+        painter = QPainter(self._layer)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setClipRect(int(x[0] - 1), 0, columns, rows)
+        for index, values in enumerate(samples):
+            low, high = minmax_envelope(values, values, edges)
+            valid = np.isfinite(low)
+            # A sample before the first column joins the line to what is drawn
+            joined = edges[0] > 0 and np.isfinite(values[edges[0] - 1])
+            xs = np.repeat(x[valid], 2)
+            ys = np.empty(len(xs))
+            ys[0::2] = low[valid]
+            ys[1::2] = high[valid]
+            if joined:
+                xs = np.concatenate(([x[0] - 1], xs))
+                ys = np.concatenate(([values[edges[0] - 1]], ys))
+            if len(xs) < 2:
+                continue
+            token = self._tokens[index] or CHART_TOKENS[index % len(CHART_TOKENS)]
+            painter.setPen(QPen(style_manager.get_qcolor(token), 1.0))
+            painter.drawPolyline(_polygon(xs, rows - (ys - y0) * scale))
+        painter.end()
+
+
+class SparklineData:
+    """Values of a sparkline and a key that changes whenever they do
+
+    The key identifies cached renders, so replace the values through
+    ``set_values`` rather than modifying the array in place.
+    """
+
+    _keys = itertools.count()
+
+    def __init__(self, values=()):
+        self.set_values(values)
+
+    def set_values(self, values):
+        """Replace the values"""
+        self.values = np.asarray(values, dtype=np.float64).ravel()
+        self.key = next(SparklineData._keys)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+@lru_cache(maxsize=256)
+def _sparkline_columns(count: int, columns: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the bin edges and column centers decimating count samples
+
+    Sparklines of the same length and width share these read-only arrays.
+    """
+    edges = np.ceil(np.linspace(0, count, columns + 1)).astype(np.intp)
+    centers = np.arange(columns) + 0.5
+    edges.flags.writeable = centers.flags.writeable = False
+    return edges, centers
+
+
+def render_sparkline(
+    values: np.ndarray,
+    width: int,
+    height: int,
+    dpr: float,
+    color: QColor,
+    fill: bool = True,
+) -> QPixmap:
+    """Render values as a line, decimated to a min/max pair per pixel column"""
+    pixmap = QPixmap(max(1, math.ceil(width * dpr)), max(1, math.ceil(height * dpr)))
+    pixmap.setDevicePixelRatio(dpr)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    finite = np.isfinite(values)
+    if np.count_nonzero(finite) < 2 or width < 2 or height < 2:
+        return pixmap
+
+    columns = pixmap.width()
+    if len(values) > 2 * columns:
+        edges, centers = _sparkline_columns(len(values), columns)
+        low, high = minmax_envelope(values, values, edges)
+        xs = np.repeat(centers / dpr, 2)
+        ys = np.empty(len(xs))
+        ys[0::2] = low
+        ys[1::2] = high
+    else:
+        xs = np.linspace(0.5, width - 0.5, len(values))
+        ys = values
+    y0, y1 = float(np.nanmin(ys)), float(np.nanmax(ys))
+    inset = 1.5
+    scale = (height - 2 * inset) / ((y1 - y0) or 1.0)
+    offset = 0.0 if y1 > y0 else (height - 2 * inset) / 2
+    ys = height - inset - offset - (ys - y0) * scale
+
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setPen(QPen(color, 1.25))
+    for start, stop in _runs(np.isfinite(ys)):
+        if fill and stop - start > 1:
+            area = QColor(color)
+            area.setAlphaF(_AREA_ALPHA)
+            path = QPainterPath()
+            path.addPolygon(
+                _polygon(
+                    np.concatenate(([xs[start]], xs[start:stop], [xs[stop - 1]])),
+                    np.concatenate(([height], ys[start:stop], [height])),
+                )
+            )
+            painter.fillPath(path, area)
+        painter.drawPolyline(_polygon(xs[start:stop], ys[start:stop]))
+    painter.end()
+    return pixmap
+
+
+def sparkline_pixmap(
+    data: SparklineData,
+    width: int,
+    height: int,
+    dpr: float,
+    token: str = "chart-1",
+    fill: bool = True,
+) -> QPixmap:
+    """Get the cached render of a sparkline
+
+    Renders are keyed by the data key, size and the token's current color,
+    so a theme change only renders again what is painted afterwards.
+    """
+    color = style_manager.get_qcolor(token)
+    return style_manager.assets.get(
+        "sparkline",
+        (data.key, width, height, color.rgba(), fill),
+        dpr,
+        lambda ratio: render_sparkline(data.values, width, height, ratio, color, fill),
+    )
+
+
+class ShadcnSparkline(QWidget):
+    """A small chart of recent values without axes
+
+    For many sparklines, e.g. one per table row, paint them with
+    ``ShadcnSparklineDelegate`` instead of creating a widget for each.
+    """
+
+    def __init__(
+        self, values=(), token: str = "chart-1", fill: bool = True, parent=None
+    ):
+        super().__init__(parent)
+        self.data = SparklineData(values)
+        self.token = token
+        self.fill = fill
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+
+    def sizeHint(self) -> QSize:
+        return QSize(120, 32)
+
+    def set_values(self, values):
+        """Replace the values and repaint"""
+        self.data.set_values(values)
+        self.update()
+
+    def paintEvent(self, a0):
+        rect = self.contentsRect()
+        pixmap = sparkline_pixmap(
+            self.data,
+            rect.width(),
+            rect.height(),
+            self.devicePixelRatioF(),
+            self.token,
+            self.fill,
+        )
+        painter = QPainter(self)
+        painter.drawPixmap(rect.topLeft(), pixmap)
+
+
+class ShadcnSparklineDelegate(QStyledItemDelegate):
+    """Paints the SparklineData of items as sparklines
+
+    Items without SparklineData in ``role`` are painted as usual.
+    """
+
+    def __init__(
+        self,
+        parent=None,
+        role: int = SPARKLINE_ROLE,
+        token: str = "chart-1",
+        fill: bool = True,
+    ):
+        super().__init__(parent)
+        self.role = role
+        self.token = token
+        self.fill = fill
+
+    def paint(self, painter, option, index):
+        data = index.data(self.role)
+        if not isinstance(data, SparklineData):
+            super().paint(painter, option, index)
+            return
+        widget = option.widget
+        style = widget.style() if widget is not None else QApplication.style()
+        panel = QStyleOptionViewItem(option)
+        self.initStyleOption(panel, index)
+        style.drawPrimitive(
+            QStyle.PrimitiveElement.PE_PanelItemViewItem, panel, painter, widget
+        )
+        rect = option.rect.adjusted(
+            _SPARKLINE_PADDING,
+            _SPARKLINE_PADDING,
+            -_SPARKLINE_PADDING,
+            -_SPARKLINE_PADDING,
+        )
+        if rect.width() < 2 or rect.height() < 2:
+            return
+        dpr = painter.device().devicePixelRatioF()
+        pixmap = sparkline_pixmap(
+            data, rect.width(), rect.height(), dpr, self.token, self.fill
+        )
+        painter.drawPixmap(rect.topLeft(), pixmap)
+
+    def sizeHint(self, option, index):
+        if isinstance(index.data(self.role), SparklineData):
+            return QSize(120, 32)
+        return super().sizeHint(option, index)
+
+
+class Histogram:
+    """Counts of samples in equal-width bins, kept as samples arrive
+
+    Appended samples are counted into the current bins directly when they
+    fall within the range. All samples are also kept sorted, merged in
+    lazily, so changing the bin count or range only takes one binary
+    search per bin edge.
+    """
+
+    def __init__(
+        self,
+        samples=(),
+        bins: int = 50,
+        value_range: Optional[Tuple[float, float]] = None,
+    ):
+        self._sorted = np.zeros(0)
+        self._pending: List[np.ndarray] = []
+        self._bins = bins
+        self._fixed_range = value_range
+        self._low = math.inf
+        self._high = -math.inf
+        self._edges: Optional[np.ndarray] = None
+        self._counts: Optional[np.ndarray] = None
+        self.version = 0
+        self.append(samples)
+
+    def __len__(self) -> int:
+        return len(self._sorted) + sum(len(chunk) for chunk in self._pending)
+
+    @property
+    def bins(self) -> int:
+        """The number of bins"""
+        return self._bins
+
+    def set_bins(self, bins: int):
+        """Change the number of bins"""
+        bins = max(1, int(bins))
+        if bins != self._bins:
+            self._bins = bins
+            self._invalidate()
+
+    def value_range(self) -> Tuple[float, float]:
+        """Get the range the bins cover, by default that of the samples"""
+        if self._fixed_range is not None:
+            return self._fixed_range
+        if self._low > self._high:
+            return 0.0, 1.0
+        if self._low == self._high:
+            return self._low - 0.5, self._high + 0.5
+        return self._low, self._high
+
+    def set_value_range(self, value_range: Optional[Tuple[float, float]]):
+        """Fix the range the bins cover, or fit it to the samples with None"""
+        self._fixed_range = value_range
+        self._invalidate()
+
+    def append(self, samples):
+        """Add samples, ignoring NaN and infinities"""
+        samples = np.asarray(samples, dtype=np.float64).ravel()
+        samples = samples[np.isfinite(samples)]
+        if not len(samples):
+            return
+        self._pending.append(samples)
+        low, high = float(samples.min()), float(samples.max())
+        # Track the extent even while the range is fixed, for when it is fitted
+        grown = low < self._low or high > self._high
+        self._low, self._high = min(low, self._low), max(high, self._high)
+        if grown and self._fixed_range is None:
+            # The fitted range grows, which moves every edge
+            self._invalidate()
+            return
+        if self._counts is not None:
+            edges = self._edges
+            index = np.searchsorted(edges, samples, side="right") - 1
+            # The last bin includes its right edge
+            index[samples == edges[-1]] = self._bins - 1
+            inside = (index >= 0) & (index < self._bins)
+            self._counts += np.bincount(index[inside], minlength=self._bins)
+        self.version += 1
+
+    def clear(self):
+        """Remove every sample"""
+        self._sorted = np.zeros(0)
+        self._pending.clear()
+        self._low, self._high = math.inf, -math.inf
+        self._invalidate()
+
+    def _invalidate(self):
+        self._edges = self._counts = None
+        self.version += 1
+
+    @property
+    def edges(self) -> np.ndarray:
+        """The bin edges, one more than there are bins"""
+        if self._edges is None:
+            self._edges = np.linspace(*self.value_range(), self._bins + 1)
+        return self._edges
+
+    @property
+    def counts(self) -> np.ndarray:
+        """The number of samples in each bin"""
+        if self._counts is None:
+            edges = self.edges
+            samples = self.samples()
+            positions = np.searchsorted(samples, edges)
+            positions[-1] = np.searchsorted(samples, edges[-1], side="right")
+            self._counts = np.diff(positions)
+        return self._counts
+
+    def samples(self) -> np.ndarray:
+        """Get every sample, sorted"""
+        if self._pending:
+            chunk = np.sort(np.concatenate(self._pending))
+            self._pending.clear()
+            # Merge the sorted runs in linear time rather than sorting again
+            self._sorted = np.insert(
+                self._sorted, np.searchsorted(self._sorted, chunk), chunk
+            )
+        return self._sorted
+
+
+class ShadcnBarChart(QWidget):
+    """Bar chart of one or more series of heights
+
+    Bars span the intervals between ``edges``, one per category by default,
+    and the bars of several series stand side by side in each interval,
+    colored ``chart-1`` to ``chart-5`` in turn. Bar polygons are built with
+    vectorized NumPy and cached until the data, size or y range changes; a
+    theme change only repaints them in the new colors.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._series: List[np.ndarray] = []
+        self._tokens: List[Optional[str]] = []
+        self._edges = np.zeros(1)
+        self._y_range: Optional[Tuple[float, float]] = None
+        self._data_version = 0
+        self._geometry: Optional[Tuple[Tuple[float, float], List[QPolygonF]]] = None
+        self._geometry_key = None
+        self.geometry_builds = 0
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+
+    def sizeHint(self) -> QSize:
+        return QSize(480, 240)
+
+    def set_bars(
+        self,
+        heights: Sequence[float],
+        edges: Optional[Sequence[float]] = None,
+        token: Optional[str] = None,
+    ):
+        """Show a single series of bars"""
+        self.set_series([heights], edges, [token])
+
+    def set_series(
+        self,
+        series: Sequence[Sequence[float]],
+        edges: Optional[Sequence[float]] = None,
+        tokens: Optional[Sequence[Optional[str]]] = None,
+    ):
+        """Show series of bar heights sharing the same intervals"""
+        self._assign_series(series, edges, tokens)
+        self.update()
+
+    def _assign_series(
+        self,
+        series: Sequence[Sequence[float]],
+        edges: Optional[Sequence[float]],
+        tokens: Optional[Sequence[Optional[str]]],
+    ):
+        arrays = [np.asarray(heights, dtype=np.float64).ravel() for heights in series]
+        count = len(arrays[0]) if arrays else 0
+        if any(len(heights) != count for heights in arrays):
+            raise ValueError("Bar series must have the same length")
+        self._series = arrays
+        self._tokens = list(tokens) if tokens is not None else [None] * len(arrays)
+        if edges is None:
+            self._edges = np.arange(count + 1, dtype=np.float64)
+        else:
+            self._edges = np.asarray(edges, dtype=np.float64)
+            if len(self._edges) != count + 1:
+                raise ValueError("Bar edges must be one more than the bars")
+        self._data_version += 1
+
+    def set_y_range(self, y_range: Optional[Tuple[float, float]]):
+        """Fix the y range, or fit it to the bars with None"""
+        self._y_range = y_range
+        self.update()
+
+    def plot_rect(self) -> QRectF:
+        """Get the area the bars are drawn in"""
+        return QRectF(self.rect()).adjusted(
+            _LEFT_MARGIN, _TOP_MARGIN, -_RIGHT_MARGIN, -_BOTTOM_MARGIN
+        )
+
+    def _fit_y(self) -> Tuple[float, float]:
+        if self._y_range is not None:
+            return self._y_range
+        heights = [series for series in self._series if len(series)]
+        low = min([0.0] + [float(np.nanmin(series)) for series in heights])
+        high = max([0.0] + [float(np.nanmax(series)) for series in heights])
+        if low == high:
+            return 0.0, 1.0
+        padding = (high - low) * 0.05
+        return low - padding if low < 0 else low, high + padding
+
+    def _build_geometry(
+        self, plot: QRectF, dpr: float
+    ) -> Tuple[Tuple[float, float], List[QPolygonF]]:
+        """Trace every bar of each series as one polygon along the baseline"""
+        y0, y1 = self._fit_y()
+        edges = self._edges
+        polygons: List[QPolygonF] = []
+        if len(edges) < 2 or not self._series:
+            return (y0, y1), polygons
+        scale_x = plot.width() / ((edges[-1] - edges[0]) or 1.0)
+        scale_y = plot.height() / ((y1 - y0) or 1.0)
+        left = plot.left() + (edges[:-1] - edges[0]) * scale_x
+        width = np.diff(edges) * scale_x
+        series = self._series
+        columns = max(1, int(plot.width() * dpr))
+        if len(left) > columns:
+            # Bars under a device pixel wide are reduced to the extreme bar of
+            # each pixel column; the series then overlap in every column
+            bounds = plot.left() + np.arange(columns + 1) * (plot.width() / columns)
+            column_edges = np.searchsorted(left, bounds)
+            column_edges[-1] = len(left)
+            series = []
+            for heights in self._series:
+                low, high = minmax_envelope(heights, heights, column_edges)
+                series.append(np.where(np.abs(low) > np.abs(high), low, high))
+            left, width = bounds[:-1], np.diff(bounds)
+            group = width
+            gap = np.zeros(columns)
+            offsets = [0.0] * len(series)
+        else:
+            gap = np.minimum(width * _BAR_GAP, _MAX_BAR_GAP)
+            # Bars a few pixels wide keep no gap, so they don't fade into the grid
+            gap[width < 3] = 0.0
+            group = (width - gap) / len(series)
+            offsets = [index * group for index in range(len(series))]
+        baseline = plot.bottom() - (min(max(0.0, y0), y1) - y0) * scale_y
+        for heights, offset in zip(series, offsets):
+            x0 = left + gap / 2 + offset
+            # Snap to device pixels so adjacent bars don't blur together
+            x0 = np.round(x0 * dpr) / dpr
+            x1 = np.round((x0 + group) * dpr) / dpr
+            top = plot.bottom() - (np.nan_to_num(heights) - y0) * scale_y
+            top = np.clip(top, plot.top(), plot.bottom())
+            xs = np.stack((x0, x0, x1, x1), axis=1).ravel()
+            ys = np.empty(len(xs))
+            ys[0::4] = ys[3::4] = baseline
+            ys[1::4] = ys[2::4] = top
+            polygons.append(_polygon(xs, ys))
+        return (y0, y1), polygons
+
+    def paintEvent(self, a0):
+        plot = self.plot_rect()
+        if plot.width() < 2 or plot.height() < 2:
+            return
+        dpr = self.devicePixelRatioF()
+        key = (self._data_version, self.width(), self.height(), dpr, self._y_range)
+        if self._geometry is None or self._geometry_key != key:
+            self._geometry = self._build_geometry(plot, dpr)
+            self._geometry_key = key
+            self.geometry_builds += 1
+        (y0, y1), polygons = self._geometry
+
+        painter = QPainter(self)
+        _paint_grid(painter, plot, y0, y1, self.font())
+        painter.setClipRect(plot)
+        painter.setPen(Qt.PenStyle.NoPen)
+        for index, polygon in enumerate(polygons):
+            token = self._tokens[index] or CHART_TOKENS[index % len(CHART_TOKENS)]
+            painter.setBrush(style_manager.get_qcolor(token))
+            painter.drawPolygon(polygon)
+
+
+class ShadcnHistogram(ShadcnBarChart):
+    """Histogram of samples that can be appended and re-binned live
+
+    Counting is done by ``histogram``, a ``Histogram``; the bars follow it
+    when the chart is next painted, so a bin slider can be connected
+    straight to ``set_bins``.
+    """
+
+    def __init__(
+        self,
+        samples=(),
+        bins: int = 50,
+        value_range: Optional[Tuple[float, float]] = None,
+        token: Optional[str] = None,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.histogram = Histogram(samples, bins, value_range)
+        self._token = token
+        self._histogram_version = None
+
+    def append(self, samples):
+        """Add samples and repaint"""
+        self.histogram.append(samples)
+        self.update()
+
+    def set_bins(self, bins: int):
+        """Change the number of bins and repaint"""
+        self.histogram.set_bins(bins)
+        self.update()
+
+    def set_value_range(self, value_range: Optional[Tuple[float, float]]):
+        """Fix the binned range, or fit it to the samples with None"""
+        self.histogram.set_value_range(value_range)
+        self.update()
+
+    def clear(self):
+        """Remove every sample"""
+        self.histogram.clear()
+        self.update()
+
+    def paintEvent(self, a0):
+        if self._histogram_version != self.histogram.version:
+            self._histogram_version = self.histogram.version
+            self._assign_series(
+                [self.histogram.counts], self.histogram.edges, [self._token]
+            )
+        super().paintEvent(a0)
@@ -0,0 +1,234 @@
+"""
+Heatmap of a 2D NumPy array colored through a ramp between theme tokens
+
+Values are mapped to colors by indexing a lookup table straight into a
+uint32 buffer that a QImage wraps without copying. A matrix larger than the
+widget is sampled at one cell per device pixel first, so updates cost as
+much as the widget's pixels rather than the matrix's cells.
+"""
+
+import math
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple
+import numpy as np
+from PyQt6.QtCore import QPointF, QRectF, QSize
+from PyQt6.QtGui import QImage, QPainter
+from PyQt6.QtWidgets import QSizePolicy, QWidget
+from styles import style_manager
+from themes.oklab import oklch_ramp
+
+# Colors in a lookup table; with the entry for NaN, indices fit in a uint8
+LUT_SIZE = 255
+
+
+@lru_cache(maxsize=32)
+def colormap_lut(stops: Tuple[int, ...], size: int = LUT_SIZE) -> np.ndarray:
+    """Get a premultiplied ARGB32 lookup table ramping through packed colors
+
+    ``stops`` are 0xAARRGGBB colors, e.g. from ``Palette.rgba``. The table
+    has ``size`` colors followed by a transparent entry for NaN, and is
+    shared, so it is read-only.
+    """
+    packed = np.array(stops, dtype=np.uint32)
+    channels = np.column_stack(
+        (packed >> 16 & 0xFF, packed >> 8 & 0xFF, packed & 0xFF, packed >> 24)
+    )
+    ramp = oklch_ramp(channels / 255.0, size)
+    alpha = ramp[:, 3:]
+    rgb = np.round(ramp[:, :3] * alpha * 255.0).astype(np.uint32)
+    lut = np.zeros(size + 1, dtype=np.uint32)
+    lut[:size] = (
+        np.round(alpha[:, 0] * 255.0).astype(np.uint32) << 24
+        | rgb[:, 0] << 16
+        | rgb[:, 1] << 8
+        | rgb[:, 2]
+    )
+    lut.flags.writeable = False
+    return lut
+
+
+def map_colors(
+    values: np.ndarray,
+    lut: np.ndarray,
+    value_range: Tuple[float, float],
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Look up the color of every value, writing into ``out`` if given
+
+    The range is split into equal bins, one per color of the table; values
+    outside it take the end colors and NaN takes the last entry.
+    """
+    size = len(lut) - 1
+    low, high = value_range
+    scaled = np.subtract(values, low, dtype=np.float32)
+    scaled *= size / ((high - low) or 1.0)
+    np.clip(scaled, 0, size - 1, out=scaled)
+    np.copyto(scaled, size, where=np.isnan(scaled))
+    index = scaled.astype(np.uint8 if len(lut) <= 256 else np.uint16)
+    return np.take(lut, index, out=out, mode="clip")
+
+
+@lru_cache(maxsize=16)
+def _sample_indices(cells: int, pixels: int) -> np.ndarray:
+    """Get the cell under the center of each device pixel along one axis"""
+    if pixels >= cells:
+        return np.arange(cells)
+    return ((np.arange(pixels) + 0.5) * (cells / pixels)).astype(np.intp)
+
+
+class ShadcnHeatmap(QWidget):
+    """A 2D array drawn as cells colored from theme tokens
+
+    The colors ramp in OKLCH through ``tokens``, from the lowest value to
+    the highest. The array is kept by reference, so change it through
+    ``update_region``, which colors again only the cells it covers.
+    """
+
+    def __init__(
+        self,
+        data=None,
+        tokens: Sequence[str] = ("muted", "chart-1"),
+        parent=None,
+    ):
+        super().__init__(parent)
+        self._data = np.zeros((0, 0))
+        self._tokens = tuple(tokens)
+        self._fixed_range: Optional[Tuple[float, float]] = None
+        self._range = (0.0, 1.0)
+        self._rows = self._columns = np.zeros(0, dtype=np.intp)
+        self._buffer = np.zeros((0, 0), dtype=np.uint32)
+        self._image: Optional[QImage] = None
+        self._image_key = None
+        self.full_renders = 0
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        if data is not None:
+            self.set_data(data)
+
+    def sizeHint(self) -> QSize:
+        return QSize(320, 240)
+
+    @property
+    def data(self) -> np.ndarray:
+        """The array shown"""
+        return self._data
+
+    def set_data(self, data, value_range: Optional[Tuple[float, float]] = None):
+        """Show a new 2D array, colored over a fixed or fitted range"""
+        data = np.asarray(data)
+        if data.ndim != 2:
+            raise ValueError("Heatmap data must be 2D")
+        self._data = data
+        self._fixed_range = value_range
+        self._image_key = None
+        self.update()
+
+    def set_value_range(self, value_range: Optional[Tuple[float, float]]):
+        """Fix the values mapped to the first and last colors, or fit them"""
+        self._fixed_range = value_range
+        self._image_key = None
+        self.update()
+
+    def value_range(self) -> Tuple[float, float]:
+        """Get the values mapped to the first and last colors"""
+        return self._range
+
+    def set_tokens(self, tokens: Sequence[str]):
+        """Change the tokens the colors ramp through"""
+        self._tokens = tuple(tokens)
+        self._image_key = None
+        self.update()
+
+    def update_region(self, row: int, column: int, values):
+        """Write a block of values and color again only the cells it covers"""
+        values = np.asarray(values)
+        stop_row, stop_column = row + values.shape[0], column + values.shape[1]
+        self._data[row:stop_row, column:stop_column] = values
+        if self._image_key is None:
+            return
+        # Only pixels sampling a cell of the block change
+        first_row, last_row = np.searchsorted(self._rows, (row, stop_row))
+        first, last = np.searchsorted(self._columns, (column, stop_column))
+        if first_row == last_row or first == last:
+            return
+        block = self._data[
+            np.ix_(self._rows[first_row:last_row], self._columns[first:last])
+        ]
+        if self._fixed_range is None:
+            low, high = np.nanmin(block), np.nanmax(block)
+            if low < self._range[0] or high > self._range[1]:
+                self._image_key = None
+                self.update()
+                return
+        map_colors(
+            block,
+            self._lut(),
+            self._range,
+            self._buffer[first_row:last_row, first:last],
+        )
+        self.update()
+
+    def cell_at(self, position: QPointF) -> Optional[Tuple[int, int]]:
+        """Get the (row, column) of the cell under a point, if any"""
+        rows, columns = self._data.shape
+        if not rows or not columns or self.width() < 1 or self.height() < 1:
+            return None
+        row = int(position.y() / self.height() * rows)
+        column = int(position.x() / self.width() * columns)
+        if 0 <= row < rows and 0 <= column < columns:
+            return row, column
+        return None
+
+    def _lut(self) -> np.ndarray:
+        return colormap_lut(
+            tuple(style_manager.get_qcolor(token).rgba() for token in self._tokens)
+        )
+
+    def _render(self, pixel_rows: int, pixel_columns: int):
+        """Sample the array to the pixel grid and color every sampled cell"""
+        rows, columns = self._data.shape
+        self._rows = _sample_indices(rows, pixel_rows)
+        self._columns = _sample_indices(columns, pixel_columns)
+        if len(self._rows) == rows and len(self._columns) == columns:
+            sampled = self._data
+        else:
+            sampled = self._data[np.ix_(self._rows, self._columns)]
+        if self._fixed_range is not None:
+            self._range = self._fixed_range
+        elif sampled.size:
+            low, high = float(np.nanmin(sampled)), float(np.nanmax(sampled))
+            self._range = (low, high) if math.isfinite(low) else (0.0, 1.0)
+        self._buffer = np.empty(sampled.shape, dtype=np.uint32)
+        map_colors(sampled, self._lut(), self._range, self._buffer)
+        height, width = self._buffer.shape
+        # The image reads the buffer in place, so region updates show directly
+        self._image = QImage(
+            self._buffer.data,
+            width,
+            height,
+            self._buffer.strides[0],
+            QImage.Format.Format_ARGB32_Premultiplied,
+        )
+        self.full_renders += 1
+
+    def paintEvent(self, a0):
+        rows, columns = self._data.shape
+        if not rows or not columns:
+            return
+        dpr = self.devicePixelRatioF()
+        pixel_rows = max(1, math.ceil(self.height() * dpr))
+        pixel_columns = max(1, math.ceil(self.width() * dpr))
+        key = (
+            self._data.shape,
+            min(rows, pixel_rows),
+            min(columns, pixel_columns),
+            style_manager.palette_version,
+            self._tokens,
+            self._fixed_range,
+        )
+        if self._image_key != key:
+            self._render(pixel_rows, pixel_columns)
+            self._image_key = key
+        painter = QPainter(self)
+        # Cells stay crisp when the array is smaller than the widget
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, False)
+        painter.drawImage(QRectF(self.rect()), self._image)
@@ -0,0 +1,133 @@
+"""
+Themed SVG icons with a per-size and per-color raster cache
+
+Icon paths follow the Lucide icon set (ISC license).
+"""
+
+from typing import Dict, List, Optional
+from PyQt6.QtCore import QByteArray, QRectF, Qt
+from PyQt6.QtGui import QColor, QPainter, QPixmap
+from PyQt6.QtSvg import QSvgRenderer
+from styles import style_manager
+
+_SVG_TEMPLATE = (
+    '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24" fill="none" '
+    'stroke="#000" stroke-width="2" stroke-linecap="round" '
+    'stroke-linejoin="round">{}</svg>'
+)
+
+ICONS: Dict[str, str] = {
+    "check": '<path d="M20 6 9 17l-5-5"/>',
+    "x": '<path d="M18 6 6 18"/><path d="m6 6 12 12"/>',
+    "minus": '<path d="M5 12h14"/>',
+    "plus": '<path d="M5 12h14"/><path d="M12 5v14"/>',
+    "square": '<rect width="18" height="18" x="3" y="3" rx="2"/>',
+    "restore": (
+        '<rect width="14" height="14" x="8" y="8" rx="2"/>'
+        '<path d="M4 16c-1.1 0-2-.9-2-2V4c0-1.1.9-2 2-2h10c1.1 0 2 .9 2 2"/>'
+    ),
+    "chevron-down": '<path d="m6 9 6 6 6-6"/>',
+    "chevron-up": '<path d="m18 15-6-6-6 6"/>',
+    "chevron-left": '<path d="m15 18-6-6 6-6"/>',
+    "chevron-right": '<path d="m9 18 6-6-6-6"/>',
+    "search": '<circle cx="11" cy="11" r="8"/><path d="m21 21-4.3-4.3"/>',
+    "info": (
+        '<circle cx="12" cy="12" r="10"/><path d="M12 16v-4"/><path d="M12 8h.01"/>'
+    ),
+    "sun": (
+        '<circle cx="12" cy="12" r="4"/><path d="M12 2v2"/><path d="M12 20v2"/>'
+        '<path d="m4.93 4.93 1.41 1.41"/><path d="m17.66 17.66 1.41 1.41"/>'
+        '<path d="M2 12h2"/><path d="M20 12h2"/><path d="m6.34 17.66-1.41 1.41"/>'
+        '<path d="m19.07 4.93-1.41 1.41"/>'
+    ),
+    "moon": '<path d="M12 3a6 6 0 0 0 9 9 9 9 0 1 1-9-9Z"/>',
+}
+
+_renderers: Dict[str, QSvgRenderer] = {}
+
+
+def available_icons() -> List[str]:
+    """Get the names of the bundled icons"""
+    return list(ICONS.keys())
+
+
+def _renderer(name: str) -> QSvgRenderer:
+    """Get the parsed SVG renderer for an icon, parsing it only once"""
+    renderer = _renderers.get(name)
+    if renderer is None:
+        if name not in ICONS:
+            raise KeyError(f"Unknown icon: {name}")
+        svg = _SVG_TEMPLATE.format(ICONS[name])
+        renderer = QSvgRenderer(QByteArray(svg.encode("utf-8")))
+        _renderers[name] = renderer
+    return renderer
+
+
+def _render_mask(name: str, size: int, dpr: float) -> QPixmap:
+    """Rasterize the icon outline in opaque black at a pixel ratio"""
+    pixels = round(size * dpr)
+    mask = QPixmap(pixels, pixels)
+    mask.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(mask)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    _renderer(name).render(painter, QRectF(0, 0, pixels, pixels))
+    painter.end()
+    mask.setDevicePixelRatio(dpr)
+    return mask
+
+
+def _render_tinted(name: str, size: int, color: QColor, dpr: float) -> QPixmap:
+    """Tint the cached mask of an icon; the SVG itself is not parsed again"""
+    pixmap = style_manager.assets.get(
+        "icon-mask", (name, size), dpr, lambda ratio: _render_mask(name, size, ratio)
+    ).copy()
+    painter = QPainter(pixmap)
+    painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceIn)
+    painter.fillRect(pixmap.rect(), color)
+    painter.end()
+    pixmap.setDevicePixelRatio(dpr)
+    return pixmap
+
+
+def icon_pixmap(name: str, size: int, color: QColor, dpr: float = 1.0) -> QPixmap:
+    """Get an icon rendered at a size in a color, from the cache when possible"""
+    return style_manager.assets.get(
+        "icon",
+        (name, size, color.rgba()),
+        dpr,
+        lambda ratio: _render_tinted(name, size, color, ratio),
+    )
+
+
+def clear_icon_cache():
+    """Drop all rasterized icons, keeping the parsed SVGs"""
+    style_manager.assets.invalidate("icon-mask")
+    style_manager.assets.invalidate("icon")
+
+
+class ShadcnIcon:
+    """A bundled icon drawn in a theme color token
+
+    The color is resolved from the current theme on every call, so icons
+    follow theme switches by picking a differently tinted cache entry.
+    """
+
+    def __init__(self, name: str, size: int = 16, token: str = "foreground"):
+        _renderer(name)
+        self.name = name
+        self.size = size
+        self.token = token
+
+    def color(self) -> QColor:
+        """Get the current theme color of the icon"""
+        return style_manager.get_qcolor(self.token)
+
+    def pixmap(self, dpr: float = 1.0, color: Optional[QColor] = None) -> QPixmap:
+        """Get the icon pixmap for a device pixel ratio"""
+        return icon_pixmap(self.name, self.size, color or self.color(), dpr)
+
+    def paint(self, painter: QPainter, x: int, y: int, color: Optional[QColor] = None):
+        """Paint the icon with its top-left corner at a position"""
+        painter.drawPixmap(
+            x, y, self.pixmap(painter.device().devicePixelRatioF(), color)
+        )
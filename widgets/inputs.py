@@ -12,9 +12,76 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
     QWidget,
     QLabel,
+    QStyle,
+    QStyleOptionButton,
+    QStyleOptionSlider,
+    QStylePainter,
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QFont
+from styles import style_manager
+from styles.indicators import CHECKBOX, FOCUS, RADIO, SLIDER_HANDLE
+
+
+def _apply_input_height(widget):
+    """Size a single-line input to the theme's input height"""
+    widget.setMinimumHeight(style_manager.get_metric("input-height", 40))
+
+
+def _toggle_state(button) -> str:
+    """Get the indicator state name for a checkbox or radio button"""
+    if (
+        isinstance(button, QCheckBox)
+        and button.checkState() == Qt.CheckState.PartiallyChecked
+    ):
+        state = "partial"
+    elif button.isChecked():
+        state = "checked"
+    else:
+        state = "unchecked"
+    if not button.isEnabled():
+        return state + "-disabled"
+    if button.isDown():
+        state += "-pressed"
+    elif button.underMouse():
+        state += "-hover"
+    return state + FOCUS if button.hasFocus() else state
+
+
+def _prepare_toggle(button, kind: str, dpr: float):
+    """Render the indicator pixmaps a checkbox or radio button may show"""
+    option = QStyleOptionButton()
+    button.initStyleOption(option)
+    size = (
+        button.style()
+        .subElementRect(QStyle.SubElement.SE_CheckBoxIndicator, option, button)
+        .size()
+    )
+    for state in ("checked", "unchecked", "checked-hover", "unchecked-hover"):
+        style_manager.indicators.pixmap(kind, state, size, dpr)
+
+
+def _paint_toggle(button, kind: str):
+    """Paint a checkbox or radio button with a cached indicator pixmap"""
+    painter = QStylePainter(button)
+    option = QStyleOptionButton()
+    button.initStyleOption(option)
+    style = button.style()
+
+    indicator = style.subElementRect(
+        QStyle.SubElement.SE_CheckBoxIndicator, option, button
+    )
+    painter.drawPixmap(
+        indicator.topLeft(),
+        style_manager.indicators.pixmap(
+            kind, _toggle_state(button), indicator.size(), button.devicePixelRatioF()
+        ),
+    )
+
+    option.rect = style.subElementRect(
+        QStyle.SubElement.SE_CheckBoxContents, option, button
+    )
+    painter.drawControl(QStyle.ControlElement.CE_CheckBoxLabel, option)
 
 
 class ShadcnInput(QLineEdit):
@@ -24,7 +91,7 @@ class ShadcnInput(QLineEdit):
         super().__init__(parent)
         self.setPlaceholderText(placeholder)
         self.setObjectName("shadcn_input")
-        self.setMinimumHeight(40)
+        style_manager.bind_metrics(self, ("input-height",), _apply_input_height)
         self.setFont(QFont("Segoe UI", 10))
 
 
@@ -35,21 +102,71 @@ class ShadcnTextArea(QTextEdit):
         super().__init__(parent)
         self.setPlaceholderText(placeholder)
         self.setObjectName("shadcn_textarea")
-        self.setMinimumHeight(80)
+        style_manager.bind_metrics(
+            self,
+            ("input-height",),
+            lambda area: area.setMinimumHeight(
+                2 * style_manager.get_metric("input-height", 40)
+            ),
+        )
         self.setMaximumHeight(120)
         self.setFont(QFont("Segoe UI", 10))
 
 
 class ShadcnSelect(QComboBox):
-    """Shadcn-inspired select dropdown"""
+    """Shadcn-inspired select dropdown
+
+    ``selection_settled`` fires once the current text has stopped changing
+    for ``debounce`` milliseconds, so stepping through items with the arrow
+    keys or the mouse wheel only reports the item the user stops on.
+    """
 
-    def __init__(self, items=None, parent=None):
+    selection_settled = pyqtSignal(str)
+
+    def __init__(self, items=None, parent=None, debounce=0):
         super().__init__(parent)
         self.setObjectName("shadcn_select")
-        self.setMinimumHeight(40)
+        style_manager.bind_metrics(self, ("input-height",), _apply_input_height)
         self.setFont(QFont("Segoe UI", 10))
+        self._settle_timer = QTimer(self)
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.timeout.connect(self._settle)
+        self.set_debounce(debounce)
         if items:
             self.addItems(items)
+        self.currentTextChanged.connect(self._on_text_changed)
+
+    def set_debounce(self, delay: int):
+        """Set how long the selection must rest before it settles, in ms"""
+        self._settle_timer.setInterval(max(0, delay))
+
+    def _on_text_changed(self, text):
+        if self._settle_timer.interval():
+            self._settle_timer.start()
+        else:
+            self.selection_settled.emit(text)
+
+    def _settle(self):
+        self.selection_settled.emit(self.currentText())
+
+    def is_settling(self) -> bool:
+        """Check if a selection change is waiting to settle"""
+        return self._settle_timer.isActive()
+
+    def flush_selection(self):
+        """Settle a pending selection change right away"""
+        if self._settle_timer.isActive():
+            self._settle_timer.stop()
+            self._settle()
+
+    def cancel_selection(self):
+        """Drop a pending selection change without settling it"""
+        self._settle_timer.stop()
+
+    def hidePopup(self):
+        super().hidePopup()
+        # Picking from the popup is a deliberate choice, not browsing
+        self.flush_selection()
 
 
 class ShadcnCheckbox(QCheckBox):
@@ -59,6 +176,14 @@ class ShadcnCheckbox(QCheckBox):
         super().__init__(text, parent)
         self.setObjectName("shadcn_checkbox")
         self.setFont(QFont("Segoe UI", 10))
+        self.setAttribute(Qt.WidgetAttribute.WA_Hover)
+
+    def prepare_assets(self, dpr: float):
+        """Pre-render indicator pixmaps for a device pixel ratio"""
+        _prepare_toggle(self, CHECKBOX, dpr)
+
+    def paintEvent(self, e):
+        _paint_toggle(self, CHECKBOX)
 
 
 class ShadcnRadioButton(QRadioButton):
@@ -68,6 +193,14 @@ class ShadcnRadioButton(QRadioButton):
         super().__init__(text, parent)
         self.setObjectName("shadcn_radio")
         self.setFont(QFont("Segoe UI", 10))
+        self.setAttribute(Qt.WidgetAttribute.WA_Hover)
+
+    def prepare_assets(self, dpr: float):
+        """Pre-render indicator pixmaps for a device pixel ratio"""
+        _prepare_toggle(self, RADIO, dpr)
+
+    def paintEvent(self, e):
+        _paint_toggle(self, RADIO)
 
 
 class ShadcnSlider(QSlider):
@@ -81,6 +214,52 @@ class ShadcnSlider(QSlider):
             if orientation == Qt.Orientation.Horizontal
             else self.setMinimumWidth(20)
         )
+        self.setAttribute(Qt.WidgetAttribute.WA_Hover)
+
+    def _handle_rect(self, option: QStyleOptionSlider):
+        return self.style().subControlRect(
+            QStyle.ComplexControl.CC_Slider,
+            option,
+            QStyle.SubControl.SC_SliderHandle,
+            self,
+        )
+
+    def prepare_assets(self, dpr: float):
+        """Pre-render handle pixmaps for a device pixel ratio"""
+        option = QStyleOptionSlider()
+        self.initStyleOption(option)
+        size = self._handle_rect(option).size()
+        for state in ("normal", "hover", "pressed"):
+            style_manager.indicators.pixmap(SLIDER_HANDLE, state, size, dpr)
+
+    def paintEvent(self, ev):
+        painter = QStylePainter(self)
+        option = QStyleOptionSlider()
+        self.initStyleOption(option)
+        handle = self._handle_rect(option)
+
+        # Let the style draw the groove and ticks, then blit the cached handle
+        option.subControls = QStyle.SubControl.SC_SliderGroove
+        if self.tickPosition() != QSlider.TickPosition.NoTicks:
+            option.subControls |= QStyle.SubControl.SC_SliderTickmarks
+        painter.drawComplexControl(QStyle.ComplexControl.CC_Slider, option)
+
+        if not self.isEnabled():
+            state = "disabled"
+        elif self.isSliderDown():
+            state = "pressed"
+        elif option.activeSubControls & QStyle.SubControl.SC_SliderHandle:
+            state = "hover"
+        else:
+            state = "normal"
+        if self.hasFocus():
+            state += FOCUS
+        painter.drawPixmap(
+            handle.topLeft(),
+            style_manager.indicators.pixmap(
+                SLIDER_HANDLE, state, handle.size(), self.devicePixelRatioF()
+            ),
+        )
 
 
 class ShadcnFormField(QWidget):
@@ -92,7 +271,13 @@ class ShadcnFormField(QWidget):
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(6)
+        style_manager.bind_metrics(
+            self,
+            ("space-1.5",),
+            lambda field: field.layout().setSpacing(
+                style_manager.get_metric("space-1.5", 6)
+            ),
+        )
 
         if label_text:
             self.label = QLabel(label_text)
@@ -1,12 +1,20 @@
 """
-Progress bar widget with Shadcn styling
+Progress bar and loading indicator widgets with Shadcn styling
 """
 
-from PyQt6.QtWidgets import QProgressBar
+from PyQt6.QtWidgets import QProgressBar, QWidget, QSizePolicy
+from PyQt6.QtCore import Qt, QRectF, QSize
+from PyQt6.QtGui import QColor, QLinearGradient, QPainter, QPen
+from styles import style_manager
+from styles.animation import animation_clock
 
 
 class ShadcnProgressBar(QProgressBar):
-    """Progress bar with Shadcn styling"""
+    """Progress bar with Shadcn styling
+
+    In indeterminate mode a chunk sweeps across the track, driven by the
+    shared animation clock while the bar is visible.
+    """
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -16,3 +24,141 @@ class ShadcnProgressBar(QProgressBar):
         # Ensure text is visible
         self.setTextVisible(True)
         self.setFormat("%p%")  # Show percentage
+        self._indeterminate = False
+        self._animation = None
+
+    def set_indeterminate(self, indeterminate: bool):
+        """Switch between showing a value and an ongoing activity sweep"""
+        self._indeterminate = indeterminate
+        if indeterminate and self.isVisible():
+            self._start_animation()
+        elif not indeterminate:
+            self._stop_animation()
+        self.update()
+
+    def is_indeterminate(self) -> bool:
+        """Check if the progress bar is in indeterminate mode"""
+        return self._indeterminate
+
+    def _start_animation(self):
+        if self._animation is None:
+            self._animation = animation_clock().loop(self, 1500, kind="progress")
+
+    def _stop_animation(self):
+        animation_clock().stop(self._animation)
+        self._animation = None
+
+    def showEvent(self, a0):
+        super().showEvent(a0)
+        if self._indeterminate:
+            self._start_animation()
+
+    def hideEvent(self, a0):
+        super().hideEvent(a0)
+        self._stop_animation()
+
+    def paintEvent(self, a0):
+        if not self._indeterminate:
+            super().paintEvent(a0)
+            return
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        track = QRectF(self.rect()).adjusted(0.5, 0.5, -0.5, -0.5)
+        painter.setPen(style_manager.get_qcolor("border"))
+        painter.setBrush(style_manager.get_qcolor("background"))
+        radius = style_manager.get_metric("radius-sm", 4)
+        painter.drawRoundedRect(track, radius, radius)
+
+        phase = self._animation.value if self._animation else 0.0
+        chunk_width = track.width() / 3
+        chunk = QRectF(
+            track.left() - chunk_width + phase * (track.width() + chunk_width),
+            track.top() + 1,
+            chunk_width,
+            track.height() - 2,
+        ).intersected(track.adjusted(1, 1, -1, -1))
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(style_manager.get_qcolor("primary"))
+        radius = style_manager.get_metric("radius-xs", 3)
+        painter.drawRoundedRect(chunk, radius, radius)
+
+
+class ShadcnSpinner(QWidget):
+    """Rotating loading spinner driven by the shared animation clock"""
+
+    def __init__(self, size=16, parent=None):
+        super().__init__(parent)
+        self._size = size
+        self._animation = None
+        self.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
+
+    def sizeHint(self) -> QSize:
+        return QSize(self._size, self._size)
+
+    def showEvent(self, a0):
+        super().showEvent(a0)
+        if self._animation is None:
+            self._animation = animation_clock().loop(self, 800, kind="spinner")
+
+    def hideEvent(self, a0):
+        super().hideEvent(a0)
+        animation_clock().stop(self._animation)
+        self._animation = None
+
+    def paintEvent(self, a0):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        width = max(2.0, self._size / 8)
+        side = min(self.width(), self.height()) - width
+        rect = QRectF((self.width() - side) / 2, (self.height() - side) / 2, side, side)
+
+        painter.setPen(QPen(style_manager.get_qcolor("muted"), width))
+        painter.drawEllipse(rect)
+
+        pen = QPen(style_manager.get_qcolor("primary"), width)
+        pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+        painter.setPen(pen)
+        phase = self._animation.value if self._animation else 0.0
+        painter.drawArc(rect, int(-phase * 360 * 16), 90 * 16)
+
+
+class ShadcnSkeleton(QWidget):
+    """Placeholder block with a shimmer, shown while content loads"""
+
+    def __init__(self, width=0, height=16, parent=None):
+        super().__init__(parent)
+        self._animation = None
+        if width:
+            self.setFixedWidth(width)
+        self.setFixedHeight(height)
+
+    def showEvent(self, a0):
+        super().showEvent(a0)
+        if self._animation is None:
+            self._animation = animation_clock().loop(self, 1500, kind="shimmer")
+
+    def hideEvent(self, a0):
+        super().hideEvent(a0)
+        animation_clock().stop(self._animation)
+        self._animation = None
+
+    def paintEvent(self, a0):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        base = style_manager.get_qcolor("muted")
+        highlight = QColor(style_manager.get_qcolor("background"))
+        highlight.setAlphaF(0.6)
+
+        phase = self._animation.value if self._animation else 0.0
+        band = self.width() / 2
+        center = -band + phase * (self.width() + 2 * band)
+        gradient = QLinearGradient(center - band, 0, center + band, 0)
+        gradient.setColorAt(0.0, base)
+        gradient.setColorAt(0.5, highlight)
+        gradient.setColorAt(1.0, base)
+
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(gradient)
+        radius = style_manager.get_metric("radius-md", 6)
+        painter.drawRoundedRect(QRectF(self.rect()), radius, radius)
@@ -0,0 +1,168 @@
+"""
+Theme picker with live preview thumbnails rendered in the background
+"""
+
+import os
+from typing import Dict, List, Optional, Tuple
+from PyQt6.QtWidgets import QListView, QListWidget, QListWidgetItem
+from PyQt6.QtCore import QRectF, QSize, QStandardPaths, QTimer, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QIcon, QImage, QPainter, QPixmap
+from styles import style_manager
+
+THUMBNAIL_SIZE = QSize(160, 100)
+
+# Bump when the thumbnail drawing changes so stale disk entries are ignored
+_THUMBNAIL_VERSION = 2
+
+# Thumbnails loaded or rendered per idle tick
+_RENDER_BATCH = 4
+
+
+def thumbnail_cache_dir() -> str:
+    """Get the directory thumbnails are cached in between runs"""
+    base = QStandardPaths.writableLocation(
+        QStandardPaths.StandardLocation.CacheLocation
+    )
+    return os.path.join(base or os.path.expanduser("~/.cache"), "theme-thumbnails")
+
+
+def render_theme_thumbnail(
+    colors: Dict[str, str], size: QSize = THUMBNAIL_SIZE, dpr: float = 1.0
+) -> QImage:
+    """Draw a miniature card, input and buttons in a theme's colors"""
+
+    def color(token: str) -> QColor:
+        return QColor(colors.get(token, "#000000"))
+
+    image = QImage(
+        round(size.width() * dpr),
+        round(size.height() * dpr),
+        QImage.Format.Format_ARGB32_Premultiplied,
+    )
+    image.setDevicePixelRatio(dpr)
+    image.fill(color("background"))
+
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    width, height = size.width(), size.height()
+
+    card = QRectF(8.5, 8.5, width - 17, height - 17)
+    painter.setPen(color("border"))
+    painter.setBrush(color("card"))
+    painter.drawRoundedRect(card, 6, 6)
+
+    painter.setPen(Qt.PenStyle.NoPen)
+    painter.setBrush(color("card-foreground"))
+    painter.drawRoundedRect(QRectF(card.left() + 8, card.top() + 8, 56, 6), 3, 3)
+    painter.setBrush(color("muted-foreground"))
+    painter.drawRoundedRect(QRectF(card.left() + 8, card.top() + 18, 80, 4), 2, 2)
+
+    field = QRectF(card.left() + 8, card.top() + 30, card.width() - 16, 14)
+    painter.setPen(color("input"))
+    painter.setBrush(color("background"))
+    painter.drawRoundedRect(field, 3, 3)
+
+    painter.setPen(Qt.PenStyle.NoPen)
+    button_top = card.bottom() - 24
+    painter.setBrush(color("primary"))
+    painter.drawRoundedRect(QRectF(card.left() + 8, button_top, 44, 16), 4, 4)
+    painter.setBrush(color("secondary"))
+    painter.drawRoundedRect(QRectF(card.left() + 56, button_top, 44, 16), 4, 4)
+    painter.setBrush(color("primary-foreground"))
+    painter.drawRoundedRect(QRectF(card.left() + 18, button_top + 7, 24, 2), 1, 1)
+    painter.setBrush(color("secondary-foreground"))
+    painter.drawRoundedRect(QRectF(card.left() + 66, button_top + 7, 24, 2), 1, 1)
+
+    painter.setBrush(color("accent"))
+    painter.drawEllipse(QRectF(card.right() - 24, button_top, 16, 16))
+    painter.end()
+    return image
+
+
+class ShadcnThemePicker(QListWidget):
+    """Grid of every theme in light and dark mode with preview thumbnails
+
+    The grid opens immediately with placeholders. Thumbnails are then
+    loaded from the disk cache, or rendered offscreen and saved there, a
+    few per idle tick. Cache files are named by a hash of the theme's
+    source colors, so editing a theme invalidates only its own previews.
+    """
+
+    theme_selected = pyqtSignal(str, bool)
+
+    def __init__(self, parent=None, cache_dir: Optional[str] = None):
+        super().__init__(parent)
+        self.setObjectName("theme_picker")
+        self.setViewMode(QListView.ViewMode.IconMode)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setMovement(QListView.Movement.Static)
+        self.setUniformItemSizes(True)
+        self.setSpacing(8)
+        self.setIconSize(THUMBNAIL_SIZE)
+        self._cache_dir = cache_dir or thumbnail_cache_dir()
+        self._pending: List[Tuple[QListWidgetItem, str, bool]] = []
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._render_batch)
+
+        placeholder = QPixmap(THUMBNAIL_SIZE)
+        placeholder.fill(style_manager.get_qcolor("muted"))
+        placeholder_icon = QIcon(placeholder)
+        for name in style_manager.get_available_themes():
+            for dark in (False, True):
+                label = f"{name.capitalize()} {'dark' if dark else 'light'}"
+                item = QListWidgetItem(placeholder_icon, label)
+                item.setData(Qt.ItemDataRole.UserRole, (name, dark))
+                self.addItem(item)
+                self._pending.append((item, name, dark))
+
+        self.itemClicked.connect(self._on_clicked)
+
+    def showEvent(self, e):
+        super().showEvent(e)
+        if self._pending:
+            self._timer.start()
+
+    def hideEvent(self, e):
+        super().hideEvent(e)
+        self._timer.stop()
+
+    def _render_batch(self):
+        dpr = self.devicePixelRatioF()
+        batch = self._pending[:_RENDER_BATCH]
+        del self._pending[:_RENDER_BATCH]
+        for item, name, dark in batch:
+            item.setIcon(QIcon(QPixmap.fromImage(self.thumbnail(name, dark, dpr))))
+        if not self._pending:
+            self._timer.stop()
+
+    def thumbnail(self, name: str, dark: bool, dpr: float = 1.0) -> QImage:
+        """Get a theme preview from the disk cache, rendering it on a miss"""
+        theme = style_manager.theme_manager.themes[name]
+        path = os.path.join(
+            self._cache_dir,
+            f"{theme.fingerprint(dark)}-v{_THUMBNAIL_VERSION}@{dpr:g}.png",
+        )
+        image = QImage(path)
+        if not image.isNull():
+            image.setDevicePixelRatio(dpr)
+            return image
+
+        image = render_theme_thumbnail(
+            theme.get_colors_for_mode(dark), THUMBNAIL_SIZE, dpr
+        )
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+        except OSError:
+            return image
+        image.save(path)
+        return image
+
+    @property
+    def pending(self) -> int:
+        """Number of thumbnails not shown yet"""
+        return len(self._pending)
+
+    def _on_clicked(self, item: QListWidgetItem):
+        name, dark = item.data(Qt.ItemDataRole.UserRole)
+        self.theme_selected.emit(name, dark)